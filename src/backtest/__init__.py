@@ -1 +1,6 @@
 from .engine import BacktestEngine
+from .execution import CloseExecution, ExecutionModel, FeeSchedule, SimulatedExecution
+from .monte_carlo import MonteCarloSimulator
+from .portfolio import PortfolioBacktest
+from .sweep import ParameterSweep
+from .walk_forward import WalkForwardOptimizer
@@ -3,30 +3,47 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 
+import numpy as np
 import pandas as pd
 
 from src.core.config import Settings, load_settings
-from src.core.enums import MarketRegime, OrderSide, RiskProfile, TimeFrame
-from src.core.models import MarketContext, PortfolioState, TradeResult
+from src.core.enums import REGIME_CODES, MarketRegime, OrderSide, RiskProfile, TimeFrame
+from src.core.models import (
+    MarketContext, MarketContextSeries, PortfolioState, TradeResult,
+)
 from src.decision.engine import DecisionEngine
 from src.indicators.engine import IndicatorEngine
 from src.market.regime_detector import MarketRegimeDetector
 from src.portfolio.manager import PortfolioManager
 
+from .execution import CloseExecution, ExecutionModel, Exit
+from .metrics import PerformanceMetrics, compute_metrics, regime_breakdown
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class BacktestResult:
-    """Summary of a backtest run."""
+    """Summary of a backtest run.
+
+    `equity` (mark-to-market value), `position` (crypto held) and `regimes`
+    (REGIME_CODES, -1 before the first analysed bar) have one entry per bar
+    of `index`, as of that bar's close.
+    """
     initial_capital: float
     final_capital: float
     total_trades: int
     winning_trades: int
     losing_trades: int
     trades: list[dict] = field(default_factory=list)
+    fees: float = 0.0
+    equity: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    position: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    regimes: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int8))
+    index: pd.Index | None = None
 
     @property
     def pnl(self) -> float:
@@ -44,8 +61,19 @@ class BacktestResult:
             return 0.0
         return self.winning_trades / self.total_trades
 
+    @property
+    def equity_curve(self) -> pd.Series:
+        return pd.Series(self.equity, index=self.index, name="equity")
+
+    def metrics(self, periods: float | None = None) -> PerformanceMetrics:
+        """Risk/return statistics (see `compute_metrics`)."""
+        return compute_metrics(self, periods)
+
+    def regime_breakdown(self) -> pd.DataFrame:
+        return regime_breakdown(self)
+
     def summary(self) -> str:
-        return (
+        text = (
             f"=== Backtest Results ===\n"
             f"Initial Capital: ${self.initial_capital:,.2f}\n"
             f"Final Capital:   ${self.final_capital:,.2f}\n"
@@ -54,20 +82,154 @@ class BacktestResult:
             f"Win Rate:        {self.win_rate:.1%}\n"
             f"Winning:         {self.winning_trades}\n"
             f"Losing:          {self.losing_trades}\n"
+            f"Fees:            ${self.fees:,.2f}\n"
+        )
+        if not len(self.equity):
+            return text
+        m = self.metrics()
+        return text + (
+            f"Sharpe:          {m.sharpe:.2f}\n"
+            f"Sortino:         {m.sortino:.2f}\n"
+            f"Max Drawdown:    {m.max_drawdown:.2%} ({m.max_drawdown_duration} bars)\n"
+            f"Exposure:        {m.exposure:.1%}\n"
+            f"Profit Factor:   {m.profit_factor:.2f}\n"
         )
 
 
+class PositionBook:
+    """Holdings, protective exit and trade log of one pair in a simulation.
+
+    Cash is not owned by the book: `step` receives the cash available and
+    returns what is left, so several books can share one balance (see
+    `PortfolioBacktest`).
+    """
+
+    def __init__(
+        self,
+        pair: str,
+        execution: ExecutionModel,
+        portfolio_manager: PortfolioManager,
+        initial_crypto: float = 0.0,
+    ):
+        self.execution = execution
+        self.portfolio_manager = portfolio_manager
+        self.portfolio = PortfolioState(
+            fiat_amount=0.0, crypto_amount=initial_crypto, pair=pair, current_price=0.0,
+        )
+        self.entry_price = 0.0
+        self.entry_fee = 0.0
+        self.pending: Exit | None = None
+        self.trades: list[dict] = []
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.fees = 0.0
+
+    @property
+    def position(self) -> float:
+        return self.portfolio.crypto_amount
+
+    def step(self, i: int, price: float, context: MarketContext, cash: float) -> float:
+        """Run bar `i` (closing at `price`) with `cash` available; return the cash left."""
+        portfolio = self.portfolio
+        portfolio.current_price = price
+        portfolio.fiat_amount = cash
+        execution = self.execution
+        regime = context.regime
+
+        # Stop-loss / take-profit touched during the bar, before its close
+        exits = []
+        pending = self.pending
+        if pending is not None and i >= pending.bar:
+            quantity = portfolio.crypto_amount
+            fee = pending.price * quantity * pending.fee_rate
+            exits.append((quantity, pending.price, fee, pending.reason))
+            self.pending = None
+        else:
+            setup = self.portfolio_manager.evaluate(context, portfolio)
+            if setup is not None and setup.side == OrderSide.BUY:
+                fill = execution.fill(OrderSide.BUY, price, setup.quantity, i)
+                cost = setup.quantity * fill.price + fill.fee
+                if cost <= portfolio.fiat_amount:
+                    portfolio.fiat_amount -= cost
+                    portfolio.crypto_amount += setup.quantity
+                    portfolio.trade_in_progress = True
+                    self.entry_price = fill.price
+                    self.entry_fee = fill.fee
+                    self.fees += fill.fee
+                    if execution.uses_stops:
+                        self.pending = execution.find_exit(
+                            i, portfolio.crypto_amount, setup.stop_loss, setup.take_profit,
+                        )
+
+                    self.trades.append({
+                        "bar": i,
+                        "side": "buy",
+                        "price": fill.price,
+                        "quantity": setup.quantity,
+                        "regime": regime.value,
+                        "fee": fill.fee,
+                    })
+            elif setup is not None and setup.side == OrderSide.SELL:
+                fill = execution.fill(OrderSide.SELL, price, setup.quantity, i)
+                exits.append((setup.quantity, fill.price, fill.fee, "signal"))
+                self.pending = None
+
+        for quantity, exit_price, fee, reason in exits:
+            portfolio.fiat_amount += quantity * exit_price - fee
+            portfolio.crypto_amount -= quantity
+            portfolio.trade_in_progress = False
+            self.fees += fee
+
+            # Entry fee charged to the trade it belongs to
+            pnl = (exit_price - self.entry_price) * quantity - fee - self.entry_fee
+            self.entry_fee = 0.0
+            self.total_trades += 1
+            if pnl > 0:
+                self.winning_trades += 1
+            else:
+                self.losing_trades += 1
+
+            self.trades.append({
+                "bar": i,
+                "side": "sell",
+                "price": exit_price,
+                "quantity": quantity,
+                "regime": regime.value,
+                "pnl": pnl,
+                "fee": fee,
+                "reason": reason,
+            })
+        return portfolio.fiat_amount
+
+
 class BacktestEngine:
     """Runs a full backtest of the v2 trading system.
 
     Iterates through historical data bar-by-bar, computing indicators,
     detecting regime, and running the decision engine + specialist strategies.
+
+    By default every indicator signal and the regime are computed for the
+    whole history in one vectorized pass and the simulation walks the
+    precomputed arrays. `vectorized=False` re-analyzes each growing window
+    instead (O(n^2), kept as the reference implementation).
+
+    Orders are filled by the `execution` model: at the close without costs
+    by default, or e.g. `SimulatedExecution()` for fees, slippage and the
+    stop-loss / take-profit of each setup.
     """
 
-    def __init__(self, settings: Settings | None = None):
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        indicator_engine: IndicatorEngine | None = None,
+        execution: ExecutionModel | None = None,
+    ):
         self.settings = settings or load_settings()
-        # Use fast indicators (no external API calls) for backtesting
-        self.indicator_engine = IndicatorEngine.fast()
+        # Use fast indicators (no external API calls) for backtesting, unless
+        # given e.g. IndicatorEngine.default(sentiment=store)
+        self.indicator_engine = indicator_engine or IndicatorEngine.fast()
+        self.execution = execution or CloseExecution()
         self.regime_detector = MarketRegimeDetector()
         self.portfolio_manager = PortfolioManager(self.settings)
 
@@ -79,93 +241,108 @@ class BacktestEngine:
         pair: str = "BTCUSDT",
         timeframe: TimeFrame = TimeFrame.DAILY,
         min_bars: int = 200,
+        vectorized: bool = True,
     ) -> BacktestResult:
         """Run the backtest on the given OHLCV DataFrame."""
-        total_trades = 0
-        winning_trades = 0
-        losing_trades = 0
-        trades = []
-
         # Compute all indicators once on full dataset
-        data = self.indicator_engine.compute_all(data)
-
-        portfolio = PortfolioState(
-            fiat_amount=initial_fiat,
-            crypto_amount=initial_crypto,
-            pair=pair,
-            current_price=data["close"].iloc[-1] if not data.empty else 0,
+        data = self.indicator_engine.compute_all(
+            data, symbol=pair, timeframe=timeframe.value,
         )
 
-        entry_price = 0.0
-
-        for i in range(min_bars, len(data)):
-            window = data.iloc[:i + 1]
-            current_price = window["close"].iloc[-1]
-            portfolio.current_price = current_price
+        if vectorized:
+            contexts = self._vectorized_contexts(data, min_bars)
+        else:
+            contexts = self._windowed_contexts(data, min_bars)
 
-            # Analyze indicators on the current window
-            results = self.indicator_engine.analyze_all(window)
+        return self.simulate(data, contexts, initial_fiat, initial_crypto, pair)
 
-            # Detect market regime
-            regime, confidence = self.regime_detector.detect(window)
+    def simulate(
+        self,
+        data: pd.DataFrame,
+        contexts: Iterable[tuple[int, MarketContext]],
+        initial_fiat: float = 10000.0,
+        initial_crypto: float = 0.0,
+        pair: str = "BTCUSDT",
+    ) -> BacktestResult:
+        """Replay the trading logic over precomputed (bar, context) pairs.
 
-            # Build market context
-            decision_engine = DecisionEngine(
-                risk_profile=list(self.settings.risk_profiles.values())[0],
-                protection=self.settings.trading.protection,
-            )
-            context = decision_engine.compute_market_context(results, regime, confidence)
+        Contexts only depend on the indicator data, so callers running many
+        configurations over the same history can build them once and reuse
+        them (see `ParameterSweep`).
+        """
+        execution = self.execution
+        execution.prepare(data)
+        book = PositionBook(pair, execution, self.portfolio_manager, initial_crypto)
+        cash = initial_fiat
+        closes = data["close"].to_numpy()
+        # Bars before the first context keep the initial holdings
+        equity = initial_fiat + initial_crypto * closes
+        position = np.full(len(closes), initial_crypto, dtype=float)
+        regimes = np.full(len(closes), -1, dtype=np.int8)
+        last = -1
 
-            # Get trade setup from portfolio manager
-            setup = self.portfolio_manager.evaluate(context, portfolio)
+        for i, context in contexts:
+            price = closes[i]
+            cash = book.step(i, price, context, cash)
+            equity[i] = cash + book.position * price
+            position[i] = book.position
+            regimes[i] = REGIME_CODES[context.regime]
+            last = i
 
-            if setup is not None:
-                # Simulate execution
-                if setup.side == OrderSide.BUY:
-                    cost = setup.quantity * current_price
-                    if cost <= portfolio.fiat_amount:
-                        portfolio.fiat_amount -= cost
-                        portfolio.crypto_amount += setup.quantity
-                        portfolio.trade_in_progress = True
-                        entry_price = current_price
-
-                        trades.append({
-                            "bar": i,
-                            "side": "buy",
-                            "price": current_price,
-                            "quantity": setup.quantity,
-                            "regime": regime.value,
-                        })
-
-                elif setup.side == OrderSide.SELL:
-                    revenue = setup.quantity * current_price
-                    portfolio.fiat_amount += revenue
-                    portfolio.crypto_amount -= setup.quantity
-                    portfolio.trade_in_progress = False
-
-                    total_trades += 1
-                    if current_price > entry_price:
-                        winning_trades += 1
-                    else:
-                        losing_trades += 1
-
-                    trades.append({
-                        "bar": i,
-                        "side": "sell",
-                        "price": current_price,
-                        "quantity": setup.quantity,
-                        "regime": regime.value,
-                        "pnl": (current_price - entry_price) * setup.quantity,
-                    })
+        if last >= 0:
+            rest = slice(last + 1, None)
+            equity[rest] = cash + book.position * closes[rest]
+            position[rest] = book.position
 
         # Final portfolio value
-        final_value = portfolio.fiat_amount + (portfolio.crypto_amount * data["close"].iloc[-1])
+        final_value = cash + book.position * data["close"].iloc[-1]
 
         return BacktestResult(
             initial_capital=initial_fiat,
             final_capital=final_value,
-            total_trades=total_trades,
-            winning_trades=winning_trades,
-            losing_trades=losing_trades,
-            trades=trades,
+            total_trades=book.total_trades,
+            winning_trades=book.winning_trades,
+            losing_trades=book.losing_trades,
+            trades=book.trades,
+            fees=book.fees,
+            equity=equity,
+            position=position,
+            regimes=regimes,
+            index=data.index,
+        )
+
+    def _decision_engine(self) -> DecisionEngine:
+        return DecisionEngine(
+            risk_profile=list(self.settings.risk_profiles.values())[0],
+            protection=self.settings.trading.protection,
+        )
+
+    def _windowed_contexts(
+        self, data: pd.DataFrame, min_bars: int,
+    ) -> Iterator[tuple[int, MarketContext]]:
+        """Re-analyze the growing window data[:i + 1] on every bar."""
+        decision_engine = self._decision_engine()
+        for i in range(min_bars, len(data)):
+            window = data.iloc[:i + 1]
+            results = self.indicator_engine.analyze_all(window)
+            regime, confidence = self.regime_detector.detect(window)
+            yield i, decision_engine.compute_market_context(results, regime, confidence)
+
+    def contexts(
+        self, data: pd.DataFrame, min_bars: int = 200,
+    ) -> MarketContextSeries:
+        """Vectorized market contexts of every bar from `min_bars` on.
+
+        `data` must already hold the indicator columns (see `compute_all`).
+        """
+        return self._vectorized_contexts(data, min_bars)
+
+    def _vectorized_contexts(
+        self, data: pd.DataFrame, min_bars: int,
+    ) -> MarketContextSeries:
+        """Analyze and score all bars at once; contexts are array-backed views."""
+        series = self.indicator_engine.analyze_series_all(data)
+        regimes, confidences = self.regime_detector.detect_series(data)
+        return self._decision_engine().compute_market_context_series(
+            series, regimes, confidences, start=min_bars,
         )
@@ -0,0 +1,164 @@
+"""Execution models - how the backtest fills orders (prices, fees, SL/TP exits)."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.core.enums import OrderSide
+
+
+@dataclass
+class FeeSchedule:
+    """Fees as a fraction of the notional (0.001 = 0.1%)."""
+    maker: float = 0.001
+    taker: float = 0.001
+
+    def fee(self, notional: float, maker: bool = False) -> float:
+        return notional * (self.maker if maker else self.taker)
+
+
+@dataclass
+class Fill:
+    price: float
+    fee: float
+
+
+@dataclass
+class Exit:
+    """Protective exit found ahead of time for an open position."""
+    bar: int
+    price: float
+    fee_rate: float
+    reason: str  # "stop_loss" | "take_profit"
+
+
+class ExecutionModel(ABC):
+    """Base class for backtest execution models.
+
+    `prepare` receives the whole history once; `fill` then prices a market
+    order at a bar and, if `uses_stops`, `find_exit` looks ahead for the
+    first bar that touches the stop-loss or take-profit of a new position.
+    """
+
+    name: str = "base"
+    uses_stops: bool = False
+
+    def prepare(self, data: pd.DataFrame) -> None:
+        """Cache the arrays of the history the model reads."""
+
+    @abstractmethod
+    def fill(self, side: OrderSide, price: float, quantity: float, bar: int) -> Fill:
+        """Price a market order of `quantity` placed at `price` on `bar`."""
+        ...
+
+    def find_exit(
+        self, bar: int, quantity: float, stop_loss: float, take_profit: float,
+    ) -> Exit | None:
+        """First SL/TP exit after `bar` of a long position (None: never hit)."""
+        return None
+
+
+class CloseExecution(ExecutionModel):
+    """Every order fills at the bar close, free of costs; SL/TP are ignored."""
+
+    name = "close"
+
+    def fill(self, side: OrderSide, price: float, quantity: float, bar: int) -> Fill:
+        return Fill(price, 0.0)
+
+
+class SimulatedExecution(ExecutionModel):
+    """Fees, slippage and intrabar stop-loss / take-profit resolution.
+
+    - market orders pay the taker fee and cross half the `spread`, plus a
+      volume impact of `impact * quantity / bar volume` (capped at
+      `max_slippage`), against the order side
+    - a take-profit is a resting limit: it fills at its price, or at the
+      open when the bar gaps through it, and pays the maker fee
+    - a stop-loss becomes a market order when the low touches it: it fills
+      at the stop, or at the open on a gap, minus the slippage
+    - when one bar touches both, the stop is assumed hit first unless the
+      open is already beyond the take-profit (`stop_first=False` flips it)
+
+    Exits are found once per position with a vectorized forward scan of
+    the high/low arrays, so the simulation loop only checks one bar index.
+    """
+
+    name = "simulated"
+    uses_stops = True
+
+    def __init__(
+        self,
+        fees: FeeSchedule | None = None,
+        spread: float = 0.0005,
+        impact: float = 0.1,
+        max_slippage: float = 0.02,
+        stop_first: bool = True,
+    ):
+        self.fees = fees or FeeSchedule()
+        self.spread = spread
+        self.impact = impact
+        self.max_slippage = max_slippage
+        self.stop_first = stop_first
+        self._open = self._high = self._low = self._volume = np.zeros(0)
+
+    def prepare(self, data: pd.DataFrame) -> None:
+        close = data["close"].to_numpy(dtype=float)
+        self._open = _column(data, "open", close)
+        self._high = _column(data, "high", close)
+        self._low = _column(data, "low", close)
+        self._volume = _column(data, "volume", np.full(len(close), np.nan))
+
+    def slippage(self, quantity: float, bar: int) -> float:
+        """Adverse price move of a market order, as a fraction of the price."""
+        volume = self._volume[bar] if bar < len(self._volume) else np.nan
+        impact = self.impact * quantity / volume if volume > 0 else 0.0
+        return min(self.spread / 2 + impact, self.max_slippage)
+
+    def fill(self, side: OrderSide, price: float, quantity: float, bar: int) -> Fill:
+        direction = 1.0 if side == OrderSide.BUY else -1.0
+        fill_price = price * (1 + direction * self.slippage(quantity, bar))
+        return Fill(fill_price, self.fees.fee(fill_price * quantity))
+
+    def find_exit(
+        self, bar: int, quantity: float, stop_loss: float, take_profit: float,
+    ) -> Exit | None:
+        low, high = self._low, self._high
+        n = len(low)
+        start, block = bar + 1, 64
+        while start < n:
+            end = min(start + block, n)
+            hit = (low[start:end] <= stop_loss) | (high[start:end] >= take_profit)
+            k = int(hit.argmax())
+            if hit[k]:
+                return self._resolve(start + k, quantity, stop_loss, take_profit)
+            start, block = end, block * 2
+        return None
+
+    def _resolve(
+        self, bar: int, quantity: float, stop_loss: float, take_profit: float,
+    ) -> Exit:
+        open_ = self._open[bar]
+        stopped = self._low[bar] <= stop_loss
+        took = self._high[bar] >= take_profit
+        if stopped and took:
+            if open_ <= stop_loss:
+                took = False
+            elif open_ >= take_profit:
+                stopped = False
+            else:
+                stopped, took = self.stop_first, not self.stop_first
+        if took:
+            return Exit(bar, max(open_, take_profit), self.fees.maker, "take_profit")
+        price = min(open_, stop_loss) * (1 - self.slippage(quantity, bar))
+        return Exit(bar, price, self.fees.taker, "stop_loss")
+
+
+def _column(data: pd.DataFrame, name: str, default: np.ndarray) -> np.ndarray:
+    if name not in data.columns:
+        return default
+    return data[name].to_numpy(dtype=float)
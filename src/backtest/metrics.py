@@ -0,0 +1,151 @@
+"""Performance metrics - risk/return statistics of a backtest equity curve."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from src.core.enums import REGIMES_BY_CODE
+
+if TYPE_CHECKING:
+    from .engine import BacktestResult
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+@dataclass
+class PerformanceMetrics:
+    """Statistics of one equity curve (returns and drawdowns as fractions)."""
+    total_return: float
+    annualized_return: float
+    volatility: float
+    sharpe: float
+    sortino: float
+    max_drawdown: float
+    max_drawdown_duration: int  # bars from a peak to its recovery (or the end)
+    exposure: float  # fraction of bars holding a position
+    profit_factor: float
+    win_rate: float
+    trades: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def periods_per_year(index: pd.Index | None, default: float = 365.0) -> float:
+    """Bars per year from the median spacing of a DatetimeIndex."""
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return default
+    spacing = np.median(np.diff(index.as_unit("ns").asi8)) / 1e9
+    return SECONDS_PER_YEAR / spacing if spacing > 0 else default
+
+
+def bar_returns(equity: np.ndarray) -> np.ndarray:
+    """Simple return of every bar (0 for the first one)."""
+    returns = np.zeros(len(equity))
+    if len(equity) > 1:
+        previous = equity[:-1]
+        np.divide(np.diff(equity), previous, out=returns[1:], where=previous != 0)
+    return returns
+
+
+def drawdowns(equity: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(drawdown from the running peak, bars since that peak) of every bar."""
+    positions = np.arange(len(equity))
+    peaks = np.maximum.accumulate(equity)
+    at_peak = equity >= peaks
+    last_peak = np.maximum.accumulate(np.where(at_peak, positions, 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        depth = np.where(peaks > 0, 1 - equity / peaks, 0.0)
+    return depth, positions - last_peak
+
+
+def trade_pnls(trades: list[dict]) -> np.ndarray:
+    return np.array([t["pnl"] for t in trades if "pnl" in t], dtype=float)
+
+
+def profit_factor(pnls: np.ndarray) -> float:
+    """Gross profit / gross loss (inf without losing trades, 0 without trades)."""
+    gains = pnls[pnls > 0].sum()
+    losses = -pnls[pnls < 0].sum()
+    if losses == 0:
+        return float("inf") if gains > 0 else 0.0
+    return float(gains / losses)
+
+
+def compute_metrics(
+    result: BacktestResult, periods: float | None = None,
+) -> PerformanceMetrics:
+    """All statistics of a backtest in a few array passes.
+
+    `periods` is the number of bars per year used to annualize (inferred
+    from the index of the result by default).
+    """
+    equity = result.equity
+    if periods is None:
+        periods = periods_per_year(result.index)
+    pnls = trade_pnls(result.trades)
+    returns = bar_returns(equity)[1:]
+
+    total_return = equity[-1] / equity[0] - 1 if len(equity) and equity[0] else 0.0
+    years = len(returns) / periods
+    annualized = 0.0
+    if years > 0 and total_return > -1:
+        annualized = (1 + total_return) ** (1 / years) - 1
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    mean = returns.mean() if len(returns) else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)) if len(returns) else 0.0
+    depth, duration = drawdowns(equity)
+
+    return PerformanceMetrics(
+        total_return=float(total_return),
+        annualized_return=float(annualized),
+        volatility=float(std * np.sqrt(periods)),
+        sharpe=float(mean / std * np.sqrt(periods)) if std > 0 else 0.0,
+        sortino=float(mean / downside * np.sqrt(periods)) if downside > 0 else 0.0,
+        max_drawdown=float(depth.max(initial=0.0)),
+        max_drawdown_duration=int(duration.max(initial=0)),
+        exposure=float(np.mean(result.position > 0)) if len(result.position) else 0.0,
+        profit_factor=profit_factor(pnls),
+        win_rate=float(np.mean(pnls > 0)) if len(pnls) else 0.0,
+        trades=len(pnls),
+    )
+
+
+def regime_breakdown(result: BacktestResult) -> pd.DataFrame:
+    """Per-regime statistics.
+
+    A bar's return is attributed to the regime detected on the previous bar
+    (when the position it carries was decided). Trades count in the regime
+    of their exit. Bars before the first analysed one are left out.
+    """
+    returns = bar_returns(result.equity)[1:]
+    codes = result.regimes[:-1].astype(np.int64)
+    held = result.position[:-1] > 0
+    known = codes >= 0
+    codes, returns, held = codes[known], returns[known], held[known]
+    n = len(REGIMES_BY_CODE)
+
+    bars = np.bincount(codes, minlength=n)
+    log_growth = np.bincount(codes, weights=np.log1p(returns), minlength=n)
+    exposed = np.bincount(codes, weights=held, minlength=n)
+
+    rows = []
+    for code, regime in enumerate(REGIMES_BY_CODE):
+        pnls = trade_pnls([
+            t for t in result.trades if t.get("regime") == regime.value
+        ])
+        rows.append({
+            "regime": regime.value,
+            "bars": int(bars[code]),
+            "exposure": exposed[code] / bars[code] if bars[code] else 0.0,
+            "return": float(np.expm1(log_growth[code])),
+            "trades": len(pnls),
+            "pnl": float(pnls.sum()),
+            "win_rate": float(np.mean(pnls > 0)) if len(pnls) else 0.0,
+            "profit_factor": profit_factor(pnls),
+        })
+    return pd.DataFrame(rows).set_index("regime")
@@ -0,0 +1,224 @@
+"""Portfolio backtest - several pairs advanced in lockstep on one cash balance."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import Settings, load_settings
+from src.core.models import MarketContextSeries
+from src.portfolio.manager import PortfolioManager
+
+from .engine import BacktestEngine, PositionBook
+from .execution import CloseExecution, ExecutionModel
+from .metrics import PerformanceMetrics, compute_metrics
+
+logger = logging.getLogger(__name__)
+
+# Indicator results the specialist strategies read from their context;
+# the other series are dropped once the contexts are scored
+STRATEGY_INDICATORS = ("bollinger", "fibonacci", "support_resistance")
+
+
+@dataclass
+class _Asset:
+    """What the simulation keeps of one pair: prices and scored contexts."""
+    pair: str
+    index: pd.DatetimeIndex
+    prices: pd.DataFrame  # close, plus open/high/low/volume for stop models
+    contexts: MarketContextSeries
+
+
+@dataclass
+class PortfolioBacktestResult:
+    """Outcome of a multi-asset backtest on the common clock `index`.
+
+    `equity` is cash plus every holding marked at its last close; `position`
+    is the market value of the holdings (0 when flat).
+    """
+    initial_capital: float
+    final_capital: float
+    index: pd.DatetimeIndex
+    equity: np.ndarray
+    cash: np.ndarray
+    position: np.ndarray
+    trades: list[dict] = field(default_factory=list)
+    per_asset: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def pnl_pct(self) -> float:
+        if self.initial_capital == 0:
+            return 0.0
+        return (self.final_capital / self.initial_capital - 1) * 100
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        return pd.Series(self.equity, index=self.index, name="equity")
+
+    def metrics(self, periods: float | None = None) -> PerformanceMetrics:
+        return compute_metrics(self, periods)
+
+    def summary(self) -> str:
+        m = self.metrics()
+        return (
+            f"=== Portfolio Backtest ({len(self.per_asset)} pairs) ===\n"
+            f"Initial Capital: ${self.initial_capital:,.2f}\n"
+            f"Final Capital:   ${self.final_capital:,.2f} ({self.pnl_pct:+.2f}%)\n"
+            f"Total Trades:    {m.trades}\n"
+            f"Sharpe:          {m.sharpe:.2f}\n"
+            f"Max Drawdown:    {m.max_drawdown:.2%} ({m.max_drawdown_duration} bars)\n"
+            f"Exposure:        {m.exposure:.1%}\n"
+        )
+
+
+class PortfolioBacktest:
+    """Backtest of several pairs competing for one cash balance.
+
+    Indicators and market contexts are computed per pair in a process pool;
+    each worker sends back only the prices and the scored contexts (with
+    the indicator series the strategies read), so the parent holds a few
+    arrays per pair rather than its indicator frame.
+
+    The pairs are then merged on the union of their timestamps and walked
+    in lockstep: at every tick, each pair with a bar there (in the order
+    given) runs its strategy with the cash left by the previous ones.
+    Holdings are marked at the last close of their pair.
+
+    Usage:
+        backtest = PortfolioBacktest(settings, max_workers=8)
+        result = backtest.run({"BTCUSDT": btc, "ETHUSDT": eth, "SOLUSDT": sol})
+        print(result.summary())
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        max_workers: int | None = None,
+        execution: ExecutionModel | None = None,
+    ):
+        self.settings = settings or load_settings()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.execution = execution or CloseExecution()
+
+    def run(
+        self,
+        datasets: dict[str, pd.DataFrame],
+        initial_fiat: float = 10000.0,
+        min_bars: int = 200,
+    ) -> PortfolioBacktestResult:
+        """Simulate every pair of `datasets` (pair -> OHLCV) on shared cash."""
+        if not datasets:
+            raise ValueError("No pair to backtest")
+        assets = self._prepare(datasets, min_bars)
+        clock = assets[0].index
+        for asset in assets[1:]:
+            clock = clock.union(asset.index)
+
+        # Every (tick, pair, bar) to run, in clock order then pair order
+        ticks, owners, bars = [], [], []
+        for k, asset in enumerate(assets):
+            bar = np.arange(asset.contexts.start, len(asset.index))
+            ticks.append(clock.get_indexer(asset.index[bar]))
+            owners.append(np.full(len(bar), k))
+            bars.append(bar)
+        ticks, owners, bars = (np.concatenate(a) for a in (ticks, owners, bars))
+        order = np.lexsort((owners, ticks))
+
+        manager = PortfolioManager(self.settings)
+        books, closes, positions = [], [], []
+        for asset in assets:
+            execution = copy.deepcopy(self.execution)
+            execution.prepare(asset.prices)
+            books.append(PositionBook(asset.pair, execution, manager))
+            closes.append(asset.prices["close"].to_numpy())
+            positions.append(np.zeros(len(asset.index)))
+
+        cash = initial_fiat
+        cash_after = np.empty(len(order))
+        for e, (k, i) in enumerate(zip(owners[order], bars[order])):
+            book = books[k]
+            cash = book.step(i, closes[k][i], assets[k].contexts.at(i), cash)
+            positions[k][i] = book.position
+            cash_after[e] = cash
+
+        return self._result(
+            assets, books, clock, ticks[order], cash_after, closes, positions, initial_fiat,
+        )
+
+    def _prepare(self, datasets: dict[str, pd.DataFrame], min_bars: int) -> list[_Asset]:
+        tasks = [
+            (pair, df, self.settings, min_bars, self.execution.uses_stops)
+            for pair, df in datasets.items()
+        ]
+        workers = min(self.max_workers, len(tasks))
+        logger.info("Computing indicators of %d pairs on %d workers", len(tasks), workers)
+        if workers <= 1:
+            return [_prepare_asset(task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_prepare_asset, tasks))
+
+    @staticmethod
+    def _result(
+        assets: list[_Asset],
+        books: list[PositionBook],
+        clock: pd.DatetimeIndex,
+        ticks: np.ndarray,
+        cash_after: np.ndarray,
+        closes: list[np.ndarray],
+        positions: list[np.ndarray],
+        initial_fiat: float,
+    ) -> PortfolioBacktestResult:
+        # Cash at each tick: as left by the last pair run at or before it
+        last_event = np.searchsorted(ticks, np.arange(len(clock)), side="right") - 1
+        cash = np.where(last_event >= 0, cash_after[np.maximum(last_event, 0)], initial_fiat)
+
+        holdings = np.zeros(len(clock))
+        trades, rows = [], []
+        for asset, book, close, position in zip(assets, books, closes, positions):
+            # Between its bars, a pair is marked at its last close
+            bar = np.searchsorted(asset.index, clock, side="right") - 1
+            value = position[np.maximum(bar, 0)] * close[np.maximum(bar, 0)]
+            holdings += np.where(bar >= 0, value, 0.0)
+            trades += [
+                {**trade, "pair": asset.pair, "timestamp": asset.index[trade["bar"]]}
+                for trade in book.trades
+            ]
+            rows.append({
+                "pair": asset.pair,
+                "trades": book.total_trades,
+                "winning_trades": book.winning_trades,
+                "losing_trades": book.losing_trades,
+                "pnl": sum(t.get("pnl", 0.0) for t in book.trades),
+                "fees": book.fees,
+                "final_position": book.position,
+            })
+
+        trades.sort(key=lambda t: t["timestamp"])
+        equity = cash + holdings
+        return PortfolioBacktestResult(
+            initial_capital=initial_fiat,
+            final_capital=float(equity[-1]),
+            index=clock,
+            equity=equity,
+            cash=cash,
+            position=holdings,
+            trades=trades,
+            per_asset=pd.DataFrame(rows).set_index("pair"),
+        )
+
+
+def _prepare_asset(task: tuple) -> _Asset:
+    pair, df, settings, min_bars, with_ohlc = task
+    engine = BacktestEngine(settings)
+    data = engine.indicator_engine.compute_all(df.copy(), symbol=pair)
+    contexts = engine.contexts(data, min_bars)
+    contexts.series = [s for s in contexts.series if s.name in STRATEGY_INDICATORS]
+    columns = ["open", "high", "low", "close", "volume"] if with_ohlc else ["close"]
+    prices = data[[c for c in columns if c in data.columns]].astype(float)
+    return _Asset(pair, pd.DatetimeIndex(data.index), prices, contexts)
@@ -0,0 +1,256 @@
+"""Parameter sweep - grid search of backtest configurations over a process pool."""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import Settings, load_settings
+from src.core.enums import MarketRegime
+from src.core.models import MarketContextSeries
+from src.indicators.cache import compute_cache
+from src.indicators.engine import IndicatorEngine
+
+from .engine import BacktestEngine, BacktestResult
+from .execution import ExecutionModel
+
+logger = logging.getLogger(__name__)
+
+# Grid key prefixes ("<section>.<attribute>") and the strategy they target
+STRATEGY_SECTIONS = {
+    "bull": MarketRegime.BULL,
+    "bear": MarketRegime.BEAR,
+    "range": MarketRegime.RANGE,
+}
+
+RESULT_METRICS = [
+    "final_capital", "pnl", "pnl_pct", "total_trades",
+    "winning_trades", "losing_trades", "win_rate",
+]
+
+
+def parameter_grid(grid: dict[str, Iterable]) -> list[dict]:
+    """Expand {"bull.sl_level": [0.02, 0.03], ...} into every combination."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def configure_engine(
+    settings: Settings, params: dict, execution: ExecutionModel | None = None,
+) -> BacktestEngine:
+    """Build a BacktestEngine with the sweep parameters applied.
+
+    Keys are "bull|bear|range.<attribute>" for the specialist strategies.
+    The backtest takes its stop-loss and take-profit from the strategies
+    (`sl_level` / `tp_level`), which only move results with an `execution`
+    model resolving them such as `SimulatedExecution`. `ProtectionConfig`
+    is only read by the live `DecisionEngine`, so "protection.*" keys are
+    rejected instead of being silently ignored.
+    """
+    engine = BacktestEngine(settings, execution=execution)
+    for key, value in params.items():
+        section, _, attr = key.partition(".")
+        if section == "protection":
+            raise ValueError(
+                f"{key} is not used by the backtest; sweep the strategies' "
+                f"sl_level / tp_level instead (e.g. bull.sl_level)"
+            )
+        regime = STRATEGY_SECTIONS.get(section)
+        strategy = engine.portfolio_manager.strategies[regime] if regime else None
+        if strategy is None or not attr or not hasattr(strategy, attr):
+            raise ValueError(f"Unknown sweep parameter: {key}")
+        setattr(strategy, attr, value)
+    return engine
+
+
+class ParameterSweep:
+    """Runs one backtest per parameter combination and ranks the results.
+
+    Indicator columns are computed once in the parent process and published
+    read-only to the workers through a shared memory block. Each worker
+    rebuilds the market contexts once, then only replays the trading logic
+    for every configuration it receives, filling orders with `execution`
+    (at the close without costs by default).
+
+    Usage:
+        sweep = ParameterSweep(settings, max_workers=8, execution=SimulatedExecution())
+        table = sweep.run(df, {"bull.sl_level": [0.02, 0.03],
+                               "bull.tp_level": [0.10, 0.15, 0.20]})
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        max_workers: int | None = None,
+        rank_by: str = "pnl_pct",
+        execution: ExecutionModel | None = None,
+    ):
+        if rank_by not in RESULT_METRICS:
+            raise ValueError(f"rank_by must be one of {RESULT_METRICS}")
+        self.settings = settings or load_settings()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rank_by = rank_by
+        self.execution = execution
+
+    def run(
+        self,
+        data: pd.DataFrame,
+        grid: dict[str, Iterable] | list[dict],
+        initial_fiat: float = 10000.0,
+        initial_crypto: float = 0.0,
+        pair: str = "BTCUSDT",
+        min_bars: int = 200,
+    ) -> pd.DataFrame:
+        """Backtest every configuration and return them ranked, best first."""
+        configs = parameter_grid(grid) if isinstance(grid, dict) else list(grid)
+        if not configs:
+            return pd.DataFrame()
+        # Fail fast on typos before spawning any process
+        configure_engine(self.settings, configs[0])
+
+        data = prepare_data(data, pair)
+        sim_args = (initial_fiat, initial_crypto, pair, min_bars)
+
+        workers = min(self.max_workers, len(configs))
+        logger.info("Sweeping %d configurations on %d workers", len(configs), workers)
+        with worker_pool(data, self.settings, sim_args, workers, self.execution) as run:
+            rows = run(_run_config, configs)
+
+        return rank_results(pd.DataFrame(rows), self.rank_by)
+
+
+def prepare_data(data: pd.DataFrame, pair: str) -> pd.DataFrame:
+    """Indicator columns of `data` as the all-float frame shared with workers."""
+    # Repeated sweeps of the same history reuse its indicator columns
+    engine = IndicatorEngine.fast(cache=compute_cache)
+    data = engine.compute_all(data.copy(), symbol=pair)
+    return data.select_dtypes(include="number").astype(float)
+
+
+def rank_results(table: pd.DataFrame, rank_by: str) -> pd.DataFrame:
+    table = table.sort_values(rank_by, ascending=False, kind="stable")
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table.reset_index(drop=True)
+
+
+@contextlib.contextmanager
+def worker_pool(
+    data: pd.DataFrame,
+    settings: Settings,
+    sim_args: tuple,
+    workers: int,
+    execution: ExecutionModel | None = None,
+) -> Iterator[Callable[[Callable, list], list]]:
+    """Yield `run(fn, tasks)`, mapping module-level `fn` over `tasks` in
+    workers that hold `data` and its market contexts (see `_init_worker`).
+
+    With several workers, `data` is published once through a shared memory
+    block; with one, tasks run inline.
+    """
+    if workers <= 1:
+        _init_worker(None, data, settings, sim_args, execution)
+        try:
+            yield lambda fn, tasks: [fn(task) for task in tasks]
+        finally:
+            _WORKER.clear()
+        return
+
+    values = data.to_numpy().T  # one contiguous row per column
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+        # attrs carry the indicator stamps, so workers do not recompute them
+        layout = (shm.name, values.shape, list(data.columns), data.index, data.attrs)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(layout, None, settings, sim_args, execution),
+        ) as pool:
+            def run(fn: Callable, tasks: list) -> list:
+                chunksize = max(1, len(tasks) // (workers * 4))
+                return list(pool.map(fn, tasks, chunksize=chunksize))
+
+            yield run
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def attach_frame(layout: tuple) -> tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """Read-only frame over the columns published by `worker_pool`."""
+    name, shape, columns, index, attrs = layout
+    shm = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    values.flags.writeable = False
+    data = pd.DataFrame(dict(zip(columns, values)), index=index, copy=False)
+    data.attrs = attrs
+    return shm, data
+
+
+# Per-process state set up once by _init_worker
+_WORKER: dict = {}
+
+
+def _init_worker(
+    layout: tuple | None,
+    data: pd.DataFrame | None,
+    settings: Settings,
+    sim_args: tuple,
+    execution: ExecutionModel | None = None,
+) -> None:
+    if layout is not None:
+        shm, data = attach_frame(layout)
+        _WORKER["shm"] = shm  # keep the mapping alive
+
+    initial_fiat, initial_crypto, pair, min_bars = sim_args
+    contexts: MarketContextSeries = BacktestEngine(settings).contexts(
+        data, min_bars,
+    )
+    _WORKER.update(
+        data=data,
+        contexts=contexts,
+        settings=settings,
+        execution=execution,
+        initial_fiat=initial_fiat,
+        initial_crypto=initial_crypto,
+        pair=pair,
+    )
+
+
+def _run_config(params: dict) -> dict:
+    return {**params, **result_metrics(_simulate(params))}
+
+
+def _simulate(params: dict, start: int = 0, end: int | None = None) -> BacktestResult:
+    """Backtest `params` on the worker history, bars [start, end) only."""
+    data: pd.DataFrame = _WORKER["data"]
+    contexts: MarketContextSeries = _WORKER["contexts"]
+    end = len(data) if end is None else end
+    engine = configure_engine(_WORKER["settings"], params, _WORKER["execution"])
+    return engine.simulate(
+        data.iloc[:end],
+        contexts.window(start, end),
+        _WORKER["initial_fiat"],
+        _WORKER["initial_crypto"],
+        _WORKER["pair"],
+    )
+
+
+def result_metrics(result: BacktestResult) -> dict:
+    return {
+        "final_capital": result.final_capital,
+        "pnl": result.pnl,
+        "pnl_pct": result.pnl_pct,
+        "total_trades": result.total_trades,
+        "winning_trades": result.winning_trades,
+        "losing_trades": result.losing_trades,
+        "win_rate": result.win_rate,
+    }
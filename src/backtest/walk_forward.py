@@ -0,0 +1,228 @@
+"""Walk-forward optimization - parameters picked in-sample, judged out-of-sample."""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import Settings, load_settings
+
+from .execution import ExecutionModel
+from .sweep import (
+    RESULT_METRICS, _simulate, configure_engine, parameter_grid,
+    prepare_data, rank_results, result_metrics, worker_pool,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Fold:
+    """Bar ranges [start, end) of one train/test split."""
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def walk_forward_folds(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    anchored: bool = False,
+    start: int = 0,
+) -> list[Fold]:
+    """Consecutive test windows of `test_bars`, each preceded by its train window.
+
+    Rolling folds train on the `train_bars` bars just before the test
+    window; anchored folds train on everything from `start` on. The last
+    test window may be shorter.
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+    folds = []
+    test_start = start + train_bars
+    while test_start < n_bars:
+        test_end = min(test_start + test_bars, n_bars)
+        train_start = start if anchored else test_start - train_bars
+        folds.append(Fold(len(folds), train_start, test_start, test_start, test_end))
+        test_start = test_end
+    return folds
+
+
+@dataclass
+class WalkForwardResult:
+    """Out-of-sample outcome of a walk-forward run.
+
+    `equity` stitches the test windows: each fold is simulated from the
+    initial capital and its returns are compounded onto the equity the
+    previous fold ended with.
+    """
+    folds: pd.DataFrame
+    equity: pd.Series
+    trades: list[dict] = field(default_factory=list)
+
+    @property
+    def initial_capital(self) -> float:
+        return float(self.folds["test_initial_equity"].iloc[0]) if len(self.folds) else 0.0
+
+    @property
+    def final_capital(self) -> float:
+        return float(self.equity.iloc[-1]) if len(self.equity) else 0.0
+
+    @property
+    def pnl_pct(self) -> float:
+        if self.initial_capital == 0:
+            return 0.0
+        return (self.final_capital / self.initial_capital - 1) * 100
+
+    @property
+    def total_trades(self) -> int:
+        return int(self.folds["test_total_trades"].sum()) if len(self.folds) else 0
+
+    def summary(self) -> str:
+        return (
+            f"=== Walk-Forward Results ===\n"
+            f"Folds:           {len(self.folds)}\n"
+            f"Initial Capital: ${self.initial_capital:,.2f}\n"
+            f"Final Capital:   ${self.final_capital:,.2f} ({self.pnl_pct:+.2f}%)\n"
+            f"Total Trades:    {self.total_trades}\n"
+        )
+
+
+class WalkForwardOptimizer:
+    """Rolling or anchored walk-forward over a parameter grid.
+
+    For every fold, each configuration is backtested on the train window;
+    the best one (by `rank_by`) is then backtested on the following test
+    window. Indicators and market contexts are computed once for the whole
+    history - they only look backwards - and every train/test simulation
+    only replays its own window, spread over a process pool like
+    `ParameterSweep` and filled by the same `execution` model.
+
+    Usage:
+        wf = WalkForwardOptimizer(settings, max_workers=8, execution=SimulatedExecution())
+        result = wf.run(df, {"bull.sl_level": [0.02, 0.03]},
+                        train_bars=24 * 365, test_bars=24 * 90)
+        print(result.summary())
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        max_workers: int | None = None,
+        rank_by: str = "pnl_pct",
+        execution: ExecutionModel | None = None,
+    ):
+        if rank_by not in RESULT_METRICS:
+            raise ValueError(f"rank_by must be one of {RESULT_METRICS}")
+        self.settings = settings or load_settings()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rank_by = rank_by
+        self.execution = execution
+
+    def run(
+        self,
+        data: pd.DataFrame,
+        grid: dict[str, Iterable] | list[dict],
+        train_bars: int,
+        test_bars: int,
+        anchored: bool = False,
+        initial_fiat: float = 10000.0,
+        initial_crypto: float = 0.0,
+        pair: str = "BTCUSDT",
+        min_bars: int = 200,
+    ) -> WalkForwardResult:
+        """Optimize on each train window and stitch the test windows."""
+        configs = parameter_grid(grid) if isinstance(grid, dict) else list(grid)
+        if not configs:
+            raise ValueError("Empty parameter grid")
+        configure_engine(self.settings, configs[0])
+        # Train windows start once the indicators are warmed up
+        folds = walk_forward_folds(len(data), train_bars, test_bars, anchored, min_bars)
+        if not folds:
+            raise ValueError(
+                f"{len(data)} bars leave no test window after {min_bars} warm-up "
+                f"and {train_bars} train bars"
+            )
+
+        data = prepare_data(data, pair)
+        sim_args = (initial_fiat, initial_crypto, pair, min_bars)
+        train_tasks = [
+            (fold.train_start, fold.train_end, k, params)
+            for fold in folds for k, params in enumerate(configs)
+        ]
+        workers = min(self.max_workers, len(train_tasks))
+        logger.info(
+            "Walk-forward: %d folds x %d configurations on %d workers",
+            len(folds), len(configs), workers,
+        )
+        with worker_pool(data, self.settings, sim_args, workers, self.execution) as run:
+            train_rows = run(_train_window, train_tasks)
+            best = []
+            for fold in folds:
+                rows = train_rows[fold.index * len(configs):(fold.index + 1) * len(configs)]
+                table = rank_results(pd.DataFrame(rows), self.rank_by)
+                best.append((configs[int(table["config"].iloc[0])], table.iloc[0]))
+            test_tasks = [
+                (fold.test_start, fold.test_end, params)
+                for fold, (params, _) in zip(folds, best)
+            ]
+            tested = run(_test_window, test_tasks)
+
+        return self._stitch(data, folds, best, tested, initial_fiat, initial_crypto)
+
+    def _stitch(
+        self,
+        data: pd.DataFrame,
+        folds: list[Fold],
+        best: list[tuple[dict, pd.Series]],
+        tested: list[tuple[dict, np.ndarray, list[dict]]],
+        initial_fiat: float,
+        initial_crypto: float,
+    ) -> WalkForwardResult:
+        closes = data["close"].to_numpy()
+        rows, curves, trades = [], [], []
+        carried = None
+        for fold, (params, train), (metrics, equity, fold_trades) in zip(folds, best, tested):
+            base = initial_fiat + initial_crypto * closes[fold.test_start]
+            if carried is None:
+                carried = base
+            rows.append({
+                "fold": fold.index,
+                "train_start": data.index[fold.train_start],
+                "train_end": data.index[fold.train_end - 1],
+                "test_start": data.index[fold.test_start],
+                "test_end": data.index[fold.test_end - 1],
+                **params,
+                f"train_{self.rank_by}": train[self.rank_by],
+                "test_initial_equity": carried,
+                **{f"test_{name}": value for name, value in metrics.items()},
+            })
+            curves.append(carried * equity / base)
+            trades += [{**trade, "fold": fold.index} for trade in fold_trades]
+            carried = curves[-1][-1]
+
+        index = data.index[folds[0].test_start:folds[-1].test_end]
+        return WalkForwardResult(
+            folds=pd.DataFrame(rows),
+            equity=pd.Series(np.concatenate(curves), index=index, name="equity"),
+            trades=trades,
+        )
+
+
+def _train_window(task: tuple[int, int, int, dict]) -> dict:
+    start, end, config, params = task
+    return {"config": config, **result_metrics(_simulate(params, start, end))}
+
+
+def _test_window(task: tuple[int, int, dict]) -> tuple[dict, np.ndarray, list[dict]]:
+    start, end, params = task
+    result = _simulate(params, start, end)
+    return result_metrics(result), result.equity[start:end], result.trades
@@ -0,0 +1,4 @@
+from .suite import (
+    BenchmarkCase, BenchmarkResult, compare_results, load_results, run_benchmarks,
+    save_results, synthetic_ohlcv,
+)
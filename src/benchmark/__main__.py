@@ -0,0 +1,60 @@
+"""Command line entry point of the benchmark suite.
+
+    python -m src.benchmark run --sizes 1000 10000 --output bench.json
+    python -m src.benchmark compare baseline.json bench.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+import pandas as pd
+
+from .suite import (
+    CASES, DEFAULT_SIZES, compare_results, load_results, run_benchmarks, save_results,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time the hot paths and save the results")
+    run.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run.add_argument("--cases", nargs="+", choices=[c.name for c in CASES])
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", default="benchmark.json")
+
+    compare = commands.add_parser("compare", help="flag regressions between two runs")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("src.benchmark").setLevel(logging.INFO)
+
+    with pd.option_context("display.width", 120, "display.max_rows", None):
+        if args.command == "run":
+            results = run_benchmarks(args.sizes, args.cases, args.repeat, args.seed)
+            save_results(results, args.output)
+            print(pd.DataFrame([vars(r) for r in results]).to_string(index=False))
+            print(f"Saved {len(results)} results to {args.output}")
+            return 0
+
+        table = compare_results(
+            load_results(args.baseline), load_results(args.current), args.threshold,
+        )
+        print(table.to_string(index=False))
+        regressions = int((table["status"] == "regression").sum())
+        if regressions:
+            print(f"{regressions} regression(s) above {args.threshold:.0%}")
+            return 1
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
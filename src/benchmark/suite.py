@@ -0,0 +1,228 @@
+"""Benchmark suite - times the indicator, regime, decision and backtest hot paths."""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import statistics
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.engine import BacktestEngine
+from src.core.config import Settings
+from src.core.enums import MarketRegime
+from src.decision.engine import DecisionEngine
+from src.indicators.engine import IndicatorEngine
+from src.market.regime_detector import MarketRegimeDetector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# A case turns the synthetic history into the zero-argument call to time.
+# The preparation (copies, precomputed columns) is not part of the timing.
+CaseSetup = Callable[[pd.DataFrame], Callable[[], object]]
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    setup: CaseSetup
+    number: int = 1  # calls per timing, for cases too fast to time alone
+
+
+@dataclass
+class BenchmarkResult:
+    case: str
+    bars: int
+    repeat: int
+    min: float  # seconds per call
+    median: float
+    mean: float
+
+
+def synthetic_ohlcv(bars: int, seed: int = 0) -> pd.DataFrame:
+    """Deterministic hourly OHLCV alternating trends and ranges."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(bars)
+    drift = np.sin(t / 500) * 0.05 + np.sin(t / 3_000) * 0.03
+    close = 100 * np.exp(np.cumsum(rng.normal(drift / 100, 0.01, bars)))
+    spread = close * rng.random(bars) * 0.01
+    return pd.DataFrame({
+        "open": close - spread * (rng.random(bars) - 0.5),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.random(bars) * 1000 + 100,
+    }, index=pd.date_range("2000-01-01", periods=bars, freq="h"))
+
+
+def _compute_all(df: pd.DataFrame) -> Callable[[], object]:
+    engine = IndicatorEngine.fast()
+    data = df.copy()
+    return lambda: engine.compute_all(data)
+
+
+def _analyze_all(df: pd.DataFrame) -> Callable[[], object]:
+    engine = IndicatorEngine.fast()
+    data = engine.compute_all(df.copy())
+    return lambda: engine.analyze_all(data)
+
+
+def _detect(df: pd.DataFrame) -> Callable[[], object]:
+    detector = MarketRegimeDetector()
+    data = df.copy()
+    return lambda: detector.detect(data)
+
+
+def _detect_multi_timeframe(df: pd.DataFrame) -> Callable[[], object]:
+    detector = MarketRegimeDetector()
+    aggregation = {
+        "open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum",
+    }
+    # Hourly bars: every frame keeps enough bars for the ADX window at 1k
+    frames = {
+        "scalping": df.copy(),
+        "intraday": df.resample("4h").agg(aggregation).dropna(),
+        "daily": df.resample("D").agg(aggregation).dropna(),
+    }
+    return lambda: detector.detect_multi_timeframe(
+        {name: frame.copy() for name, frame in frames.items()},
+    )
+
+
+def _compute_market_context(df: pd.DataFrame) -> Callable[[], object]:
+    engine = IndicatorEngine.fast()
+    results = engine.analyze_all(engine.compute_all(df.copy()))
+    decision = DecisionEngine()
+    return lambda: decision.compute_market_context(results, MarketRegime.BULL, 0.8)
+
+
+def _compute_market_context_series(df: pd.DataFrame) -> Callable[[], object]:
+    engine = IndicatorEngine.fast()
+    data = engine.compute_all(df.copy())
+    series = engine.analyze_series_all(data)
+    regimes, confidences = MarketRegimeDetector().detect_series(data)
+    decision = DecisionEngine()
+    return lambda: decision.compute_market_context_series(series, regimes, confidences)
+
+
+def _backtest_run(df: pd.DataFrame) -> Callable[[], object]:
+    engine = BacktestEngine(Settings())
+    data = df.copy()
+    return lambda: engine.run(data.copy())
+
+
+CASES = [
+    BenchmarkCase("indicators.compute_all", _compute_all),
+    BenchmarkCase("indicators.analyze_all", _analyze_all, number=10),
+    BenchmarkCase("regime.detect", _detect),
+    BenchmarkCase("regime.detect_multi_timeframe", _detect_multi_timeframe),
+    BenchmarkCase("decision.compute_market_context", _compute_market_context, number=1000),
+    BenchmarkCase("decision.compute_market_context_series", _compute_market_context_series),
+    BenchmarkCase("backtest.run", _backtest_run),
+]
+
+
+def run_benchmarks(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    cases: Iterable[str] | None = None,
+    repeat: int = 3,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """Time every selected case on synthetic histories of each size."""
+    selected = [c for c in CASES if cases is None or c.name in set(cases)]
+    if cases is not None and len(selected) != len(set(cases)):
+        known = {c.name for c in CASES}
+        raise ValueError(f"Unknown benchmark cases: {sorted(set(cases) - known)}")
+
+    results = []
+    for bars in sizes:
+        df = synthetic_ohlcv(bars, seed)
+        for case in selected:
+            timings = []
+            for _ in range(repeat):
+                call = case.setup(df)
+                started = time.perf_counter()
+                for _ in range(case.number):
+                    call()
+                timings.append((time.perf_counter() - started) / case.number)
+            result = BenchmarkResult(
+                case=case.name,
+                bars=bars,
+                repeat=repeat,
+                min=min(timings),
+                median=statistics.median(timings),
+                mean=statistics.fmean(timings),
+            )
+            logger.info("%s @ %d bars: %.6fs (min)", case.name, bars, result.min)
+            results.append(result)
+    return results
+
+
+def save_results(results: list[BenchmarkResult], path: str | Path) -> None:
+    """Write results with the environment they were measured in."""
+    payload = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_results(path: str | Path) -> list[BenchmarkResult]:
+    with open(path) as f:
+        payload = json.load(f)
+    return [BenchmarkResult(**r) for r in payload["results"]]
+
+
+def compare_results(
+    baseline: list[BenchmarkResult],
+    current: list[BenchmarkResult],
+    threshold: float = 0.10,
+) -> pd.DataFrame:
+    """Compare two runs on their best (min) timings.
+
+    A case is a "regression" when it got slower by more than `threshold`
+    (0.10 = 10%), an "improvement" when it got faster by more than that.
+    Cases found in one run only are reported as "new" or "missing".
+    """
+    before = {(r.case, r.bars): r.min for r in baseline}
+    after = {(r.case, r.bars): r.min for r in current}
+    rows = []
+    for key in list(before) + [k for k in after if k not in before]:
+        old, new = before.get(key), after.get(key)
+        if old is None:
+            status, ratio = "new", np.nan
+        elif new is None:
+            status, ratio = "missing", np.nan
+        else:
+            ratio = new / old if old > 0 else np.inf
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 - threshold:
+                status = "improvement"
+            else:
+                status = "ok"
+        rows.append({
+            "case": key[0],
+            "bars": key[1],
+            "baseline": old,
+            "current": new,
+            "ratio": ratio,
+            "status": status,
+        })
+    return pd.DataFrame(
+        rows, columns=["case", "bars", "baseline", "current", "ratio", "status"],
+    )
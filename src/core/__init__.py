@@ -1,3 +1,4 @@
 from .config import Settings, load_settings
 from .enums import MarketRegime, RiskProfile, TimeFrame, Signal, OrderSide, OrderType
-from .models import OHLCV, IndicatorResult, TradeSetup, TradeResult, PortfolioState
+from .models import OHLCV, IndicatorResult, IndicatorSeries, TradeSetup, TradeResult, PortfolioState
+from .bars import BarSeries
@@ -0,0 +1,160 @@
+"""BarSeries - columnar OHLCV container backed by contiguous NumPy arrays."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from .models import OHLCV
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarSeries:
+    """Array-backed OHLCV history with slots for derived columns.
+
+    Every column (OHLCV and indicator outputs alike) is one contiguous
+    array of `capacity` rows of which the first `len(bars)` are in use;
+    `bars[name]` returns a view of those rows, never a copy. Derived
+    columns get their slot on first assignment (or `allocate`), and
+    `append` fills spare capacity, growing all columns geometrically when
+    full. Views taken before a growth keep pointing at the old buffers.
+
+    It answers the subset of the DataFrame API the indicator plugins use
+    (`bars[name]`, `bars[name] = values`, `columns`, `index`), so
+    `IndicatorEngine.compute_all` / `analyze_all` run on it directly.
+
+    Usage:
+        bars = BarSeries.from_frame(df)
+        bars = engine.compute_all(bars)
+        results = engine.analyze_all(bars)
+        df = bars.to_frame()
+    """
+
+    def __init__(
+        self,
+        timestamps: np.ndarray | pd.Index,
+        columns: Mapping[str, np.ndarray],
+        dtype: np.dtype | type = np.float64,
+        capacity: int | None = None,
+    ):
+        timestamps = pd.DatetimeIndex(timestamps).as_unit("ns").to_numpy()
+        length = len(timestamps)
+        self.dtype = np.dtype(dtype)
+        self._length = length
+        self._capacity = max(capacity or length, length)
+        self._timestamps = np.empty(self._capacity, dtype="datetime64[ns]")
+        self._timestamps[:length] = timestamps
+        self._columns: dict[str, np.ndarray] = {}
+        # Free-form metadata, like DataFrame.attrs (kept by the adapters)
+        self.attrs: dict = {}
+        for name in OHLCV_FIELDS:
+            self[name] = columns[name] if name in columns else np.nan
+        for name, values in columns.items():
+            if name not in self._columns:
+                self[name] = values
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        dtype: np.dtype | type = np.float64,
+        capacity: int | None = None,
+    ) -> BarSeries:
+        """Copy the numeric columns of a DataFrame into a BarSeries."""
+        numeric = df.select_dtypes(include="number")
+        bars = cls(
+            df.index,
+            {name: numeric[name].to_numpy() for name in numeric.columns},
+            dtype=dtype,
+            capacity=capacity,
+        )
+        bars.attrs = dict(df.attrs)
+        return bars
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame view of the used rows (columns are not copied)."""
+        frame = pd.DataFrame(
+            {name: self[name] for name in self._columns},
+            index=self.index,
+            copy=False,
+        )
+        frame.attrs = dict(self.attrs)
+        return frame
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name][:self._length]
+
+    def __setitem__(self, name: str, values) -> None:
+        if isinstance(values, pd.Series):
+            values = values.to_numpy()
+        if np.ndim(values) and len(values) != self._length:
+            raise ValueError(
+                f"Column {name} has {len(values)} rows, expected {self._length}"
+            )
+        self.allocate(name)[:] = values
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns.keys())
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self._length]
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.timestamps, name="timestamp")
+
+    def allocate(self, name: str) -> np.ndarray:
+        """Writable view of the slot of `name`, created NaN-filled if missing."""
+        if name not in self._columns:
+            self._columns[name] = np.full(self._capacity, np.nan, dtype=self.dtype)
+        return self[name]
+
+    def last(self, name: str, n: int = 1) -> np.ndarray:
+        """View of the last `n` values of a column."""
+        return self[name][max(self._length - n, 0):]
+
+    def value(self, name: str, offset: int = -1) -> float | None:
+        """Value at a position (negative from the end); None if missing or NaN."""
+        if not -self._length <= offset < self._length:
+            return None
+        value = self._columns[name][offset % self._length]
+        return None if value != value else float(value)
+
+    def series(self, name: str) -> pd.Series:
+        """Column as a pandas Series sharing the data (for pandas/ta code)."""
+        return pd.Series(self[name], copy=False, name=name)
+
+    def append(self, bar: OHLCV) -> None:
+        """Add a bar; derived columns hold NaN for it until recomputed."""
+        if self._length == self._capacity:
+            self._grow(max(2 * self._capacity, 1))
+        i = self._length
+        self._timestamps[i] = np.datetime64(pd.Timestamp(bar.timestamp).as_unit("ns"))
+        for name, column in self._columns.items():
+            column[i] = getattr(bar, name) if name in OHLCV_FIELDS else np.nan
+        self._length += 1
+
+    def _grow(self, capacity: int) -> None:
+        timestamps = np.empty(capacity, dtype="datetime64[ns]")
+        timestamps[:self._length] = self.timestamps
+        self._timestamps = timestamps
+        for name, column in self._columns.items():
+            grown = np.full(capacity, np.nan, dtype=self.dtype)
+            grown[:self._length] = column[:self._length]
+            self._columns[name] = grown
+        self._capacity = capacity
@@ -11,6 +11,11 @@ class MarketRegime(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Compact int8 encoding of MarketRegime used by the vectorized pipeline
+REGIME_CODES: dict[MarketRegime, int] = {regime: code for code, regime in enumerate(MarketRegime)}
+REGIMES_BY_CODE: tuple[MarketRegime, ...] = tuple(MarketRegime)
+
+
 class RiskProfile(str, Enum):
     """Risk profiles for position sizing."""
     SAFE = "safe"              # 1% per trade
@@ -38,6 +43,11 @@ class Signal(str, Enum):
     UNDEFINED = "undefined"
 
 
+# Compact int8 encoding of Signal used by the vectorized (array) pipeline
+SIGNAL_CODES: dict[Signal, int] = {signal: code for code, signal in enumerate(Signal)}
+SIGNALS_BY_CODE: tuple[Signal, ...] = tuple(Signal)
+
+
 class OrderSide(str, Enum):
     """Order side."""
     BUY = "buy"
@@ -6,9 +6,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
-from .enums import MarketRegime, OrderSide, RiskProfile, Signal, TimeFrame
+from .enums import (
+    SIGNALS_BY_CODE, MarketRegime, OrderSide, RiskProfile, Signal, TimeFrame,
+)
 
 
 @dataclass
@@ -39,6 +42,52 @@ class IndicatorResult:
         return self.signal in (Signal.BEARISH, Signal.OVERBOUGHT)
 
 
+@dataclass
+class IndicatorSeries:
+    """Per-bar results of an indicator over a whole DataFrame.
+
+    `signals` holds int8 codes (see SIGNAL_CODES), `values` the float value
+    and `metadata` one array per key (nested dicts of arrays are allowed).
+    Bar i matches what `analyze()` returns on the first i + 1 rows.
+    """
+    name: str
+    signals: np.ndarray
+    values: np.ndarray
+    metadata: dict = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def signal_at(self, index: int) -> Signal:
+        return SIGNALS_BY_CODE[self.signals[index]]
+
+    def result_at(self, index: int) -> IndicatorResult:
+        """Rebuild the IndicatorResult of a single bar."""
+        signal = self.signal_at(index)
+        if signal == Signal.UNDEFINED:
+            return IndicatorResult(name=self.name, signal=signal, value=0.0)
+        return IndicatorResult(
+            name=self.name,
+            signal=signal,
+            value=self.values[index],
+            metadata=_metadata_at(self.metadata, index),
+        )
+
+
+def _metadata_at(metadata: dict, index: int) -> dict:
+    out = {}
+    for key, values in metadata.items():
+        if isinstance(values, dict):
+            out[key] = _metadata_at(values, index)
+            continue
+        value = values[index]
+        # Mirror Indicator._safe_iloc: missing numbers are reported as None
+        if isinstance(value, (float, np.floating)) and np.isnan(value):
+            value = None
+        out[key] = value
+    return out
+
+
 @dataclass
 class MarketContext:
     """Aggregated market context from all indicators."""
@@ -50,6 +99,84 @@ class MarketContext:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class MarketContextSeries:
+    """Market contexts of every bar of a history, kept as arrays.
+
+    `signals` holds int8 codes (see SIGNAL_CODES) and `regimes` MarketRegime
+    values. Iterating yields (bar, MarketContextView) from bar `start` on,
+    like a list of (bar, MarketContext) would, without building one
+    dataclass - nor the indicator results - per bar.
+    """
+    regimes: np.ndarray
+    regime_confidences: np.ndarray
+    trend_scores: np.ndarray
+    signals: np.ndarray
+    series: list[IndicatorSeries] = field(default_factory=list)
+    start: int = 0
+
+    def __len__(self) -> int:
+        return max(len(self.trend_scores) - self.start, 0)
+
+    def __iter__(self):
+        for i in range(self.start, len(self.trend_scores)):
+            yield i, MarketContextView(self, i)
+
+    def window(self, start: int, end: int):
+        """(bar, context) pairs of bars [start, end) - from `self.start` at best."""
+        for i in range(max(start, self.start), min(end, len(self.trend_scores))):
+            yield i, MarketContextView(self, i)
+
+    def at(self, index: int) -> MarketContextView:
+        return MarketContextView(self, index)
+
+    def context_at(self, index: int) -> MarketContext:
+        """Rebuild the full MarketContext of a single bar."""
+        return self.at(index).to_context()
+
+
+class MarketContextView:
+    """Read-only MarketContext of one bar of a MarketContextSeries.
+
+    Exposes the same attributes as MarketContext; `indicators` is only
+    rebuilt when accessed.
+    """
+    __slots__ = ("_contexts", "_index")
+
+    def __init__(self, contexts: MarketContextSeries, index: int):
+        self._contexts = contexts
+        self._index = index
+
+    @property
+    def regime(self) -> MarketRegime:
+        return self._contexts.regimes[self._index]
+
+    @property
+    def regime_confidence(self) -> float:
+        return float(self._contexts.regime_confidences[self._index])
+
+    @property
+    def trend_score(self) -> int:
+        return int(self._contexts.trend_scores[self._index])
+
+    @property
+    def signal(self) -> Signal:
+        return SIGNALS_BY_CODE[self._contexts.signals[self._index]]
+
+    @property
+    def indicators(self) -> list[IndicatorResult]:
+        return [s.result_at(self._index) for s in self._contexts.series]
+
+    def to_context(self) -> MarketContext:
+        return MarketContext(
+            regime=self.regime,
+            regime_confidence=self.regime_confidence,
+            trend_score=self.trend_score,
+            signal=self.signal,
+            indicators=self.indicators,
+        )
+
+
 @dataclass
 class TradeSetup:
     """A potential trade setup."""
@@ -0,0 +1,151 @@
+"""Candle boundaries for each TimeFrame (UTC, exchange conventions)."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .enums import TimeFrame
+
+# Length of one candle
+TIMEFRAME_OFFSETS: dict[TimeFrame, pd.DateOffset] = {
+    TimeFrame.MONTHLY: pd.DateOffset(months=1),
+    TimeFrame.WEEKLY: pd.DateOffset(weeks=1),
+    TimeFrame.DAILY: pd.DateOffset(days=1),
+    TimeFrame.INTRADAY: pd.DateOffset(hours=1),
+    TimeFrame.SCALPING: pd.DateOffset(minutes=15),
+}
+
+_FLOOR_FREQ = {
+    TimeFrame.DAILY: "D",
+    TimeFrame.INTRADAY: "h",
+    TimeFrame.SCALPING: "15min",
+}
+
+
+def utc_now() -> pd.Timestamp:
+    """Current time as a naive UTC timestamp, like the candle opens."""
+    return pd.Timestamp.now(tz="UTC").tz_localize(None)
+
+
+def candle_open(ts: pd.Timestamp, timeframe: TimeFrame) -> pd.Timestamp:
+    """Open time of the candle containing `ts`.
+
+    Weekly candles open on Monday and monthly candles on the 1st, like the
+    Binance klines.
+    """
+    if timeframe == TimeFrame.MONTHLY:
+        return ts.normalize().replace(day=1)
+    if timeframe == TimeFrame.WEEKLY:
+        return ts.normalize() - pd.Timedelta(days=ts.weekday())
+    return ts.floor(_FLOOR_FREQ[timeframe])
+
+
+def next_close(ts: pd.Timestamp, timeframe: TimeFrame) -> pd.Timestamp:
+    """Close time of the candle containing `ts` (strictly after `ts`)."""
+    return candle_open(ts, timeframe) + TIMEFRAME_OFFSETS[timeframe]
+
+
+_UNIT_SCALE = {"s": 10**9, "ms": 10**6, "us": 10**3, "ns": 1}
+
+
+def index_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Timestamps of a DatetimeIndex as int64 ns, without `as_unit` range checks."""
+    return index.asi8 * _UNIT_SCALE[index.unit]
+
+
+# Binance-style interval of each TimeFrame
+TIMEFRAME_INTERVALS: dict[TimeFrame, str] = {
+    TimeFrame.MONTHLY: "1M",
+    TimeFrame.WEEKLY: "1w",
+    TimeFrame.DAILY: "1d",
+    TimeFrame.INTRADAY: "1h",
+    TimeFrame.SCALPING: "15m",
+}
+
+_INTERVAL_PATTERN = re.compile(r"^(\d+)(m|h|d|w|M)$")
+_UNIT_NS = {"m": 60 * 10**9, "h": 3600 * 10**9, "d": 86400 * 10**9, "w": 7 * 86400 * 10**9}
+# 1970-01-01 is a Thursday; weeks open on Monday 1970-01-05
+_WEEK_ORIGIN_NS = 4 * 86400 * 10**9
+
+
+@dataclass(frozen=True)
+class Interval:
+    """Candle length of any size: "15m", "2h", "3d", "1w", "1M", ...
+
+    Minute to weekly candles are aligned on the Unix epoch (weeks on
+    Monday), monthly candles on January; boundaries are computed on int64
+    nanosecond arrays so whole histories are bucketed at once.
+    """
+    count: int
+    unit: str  # "m" | "h" | "d" | "w" | "M"
+
+    def __post_init__(self):
+        if self.count < 1 or self.unit not in ("m", "h", "d", "w", "M"):
+            raise ValueError(f"Invalid interval {self.count}{self.unit}")
+
+    @classmethod
+    def parse(cls, value: str | TimeFrame | Interval) -> Interval:
+        if isinstance(value, Interval):
+            return value
+        if isinstance(value, TimeFrame):
+            value = TIMEFRAME_INTERVALS[value]
+        match = _INTERVAL_PATTERN.match(value)
+        if match is None:
+            raise ValueError(f"Invalid interval {value!r}")
+        return cls(int(match.group(1)), match.group(2))
+
+    @property
+    def name(self) -> str:
+        return f"{self.count}{self.unit}"
+
+    @property
+    def nanoseconds(self) -> int | None:
+        """Fixed length in ns (None for months)."""
+        if self.unit == "M":
+            return None
+        return self.count * _UNIT_NS[self.unit]
+
+    def floor(self, timestamps: np.ndarray) -> np.ndarray:
+        """Open time (int64 ns) of the candle containing each timestamp (ns)."""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if self.unit == "M":
+            months = timestamps.view("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+            months -= months % self.count
+            return months.astype("datetime64[M]").astype("datetime64[ns]").view(np.int64)
+        step = self.nanoseconds
+        origin = _WEEK_ORIGIN_NS if self.unit == "w" else 0
+        return (timestamps - origin) // step * step + origin
+
+    def bars_between(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """Number of candles opening in [start, end) for aligned opens (ns)."""
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        if self.unit == "M":
+            months = [
+                t.view("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+                for t in (start, end)
+            ]
+            return (months[1] - months[0]) // self.count
+        return (end - start) // self.nanoseconds
+
+    def opens(self, first: int, last: int) -> np.ndarray:
+        """Every candle open (int64 ns) from aligned `first` to `last` included."""
+        if self.unit == "M":
+            months = np.array([first, last]).view("datetime64[ns]").astype("datetime64[M]")
+            steps = np.arange(months[0], months[1] + 1, self.count)
+            return steps.astype("datetime64[ns]").view(np.int64)
+        # Integer steps: arange on ns-scale bounds rounds its length
+        step = self.nanoseconds
+        return first + np.arange((last - first) // step + 1, dtype=np.int64) * step
+
+    def end(self, opens: np.ndarray) -> np.ndarray:
+        """Close time (int64 ns) of candles opening at `opens` (ns)."""
+        opens = np.asarray(opens, dtype=np.int64)
+        if self.unit == "M":
+            months = opens.view("datetime64[ns]").astype("datetime64[M]") + self.count
+            return months.astype("datetime64[ns]").view(np.int64)
+        return opens + self.nanoseconds
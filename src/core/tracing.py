@@ -0,0 +1,222 @@
+"""Tracing - timing spans across the decision pipeline, Prometheus export."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Returned by span()/profile() while disabled: entering it costs nothing
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+@dataclass
+class SpanStats:
+    """Aggregated timings of one (span, labels) series."""
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0
+    last: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _Span:
+    __slots__ = ("_tracer", "_key", "_started")
+
+    def __init__(self, tracer: Tracer, key: tuple):
+        self._tracer = tracer
+        self._key = key
+
+    def __enter__(self) -> _Span:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._tracer._record(
+            self._key, time.perf_counter() - self._started, exc_type is not None,
+        )
+
+
+class Tracer:
+    """Context-managed timing spans, disabled by default.
+
+    While disabled, `span()` and `profile()` return a shared no-op context
+    manager, so instrumented code pays one attribute check per span.
+
+    Usage:
+        tracer.enable(profile_dir="profiles")
+        with tracer.span("indicator.compute", indicator="rsi"):
+            ...
+        print(tracer.prometheus_text())
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.profile_dir: Path | None = None
+        self._stats: dict[tuple, SpanStats] = {}
+        self._lock = threading.Lock()
+        self._profiling = threading.local()
+
+    def enable(self, profile_dir: str | Path | None = None) -> None:
+        """Start recording spans; with `profile_dir`, also dump cProfile stats."""
+        self.enabled = True
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+        if self.profile_dir is not None:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.profile_dir = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def span(self, name: str, **labels: str):
+        """Time the enclosed block under `name` and `labels`."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Span(self, (name, tuple(sorted(labels.items()))))
+
+    def profile(self, name: str):
+        """Run the enclosed block under cProfile and dump `<name>-<time>.prof`.
+
+        Only active when a profile directory was given to `enable()`; nested
+        profiles in the same thread are ignored.
+        """
+        if not self.enabled or self.profile_dir is None:
+            return _NULL_CONTEXT
+        if getattr(self._profiling, "active", False):
+            return _NULL_CONTEXT
+        return self._profile(name)
+
+    @contextlib.contextmanager
+    def _profile(self, name: str) -> Iterator[None]:
+        profiler = cProfile.Profile()
+        self._profiling.active = True
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._profiling.active = False
+            filename = re.sub(r"[^\w.-]", "_", f"{name}-{time.time_ns()}") + ".prof"
+            path = self.profile_dir / filename
+            profiler.dump_stats(path)
+            logger.debug("Wrote profile %s", path)
+
+    def stats(self) -> dict[tuple, SpanStats]:
+        """Snapshot of the recorded series, keyed by (name, labels)."""
+        with self._lock:
+            return {
+                key: SpanStats(s.count, s.errors, s.total, s.max, s.last)
+                for key, s in self._stats.items()
+            }
+
+    def prometheus_text(self, prefix: str = "trading") -> str:
+        """Recorded spans in the Prometheus text exposition format."""
+        metric = f"{prefix}_span_seconds"
+        series = sorted(self.stats().items())
+        lines = [
+            f"# HELP {metric} Time spent in traced pipeline stages.",
+            f"# TYPE {metric} summary",
+        ]
+        for key, s in series:
+            lines.append(f"{metric}_sum{_labels(key)} {s.total!r}")
+            lines.append(f"{metric}_count{_labels(key)} {s.count}")
+        lines += [
+            f"# HELP {metric}_max Longest recorded duration of the stage.",
+            f"# TYPE {metric}_max gauge",
+        ]
+        lines += [f"{metric}_max{_labels(key)} {s.max!r}" for key, s in series]
+        lines += [
+            f"# HELP {prefix}_span_errors_total Stages that ended with an exception.",
+            f"# TYPE {prefix}_span_errors_total counter",
+        ]
+        lines += [
+            f"{prefix}_span_errors_total{_labels(key)} {s.errors}" for key, s in series
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _record(self, key: tuple, elapsed: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = SpanStats()
+            stats.count += 1
+            stats.errors += failed
+            stats.total += elapsed
+            stats.last = elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+
+
+def _labels(key: tuple) -> str:
+    name, labels = key
+    return format_labels([("span", name), *labels])
+
+
+def format_labels(pairs: Iterable[tuple[str, object]]) -> str:
+    """Prometheus label set, e.g. '{pair="BTCUSDT",timeframe="1h"}'."""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def serve_metrics(
+    port: int = 9464,
+    host: str = "127.0.0.1",
+    source: Tracer | None = None,
+    collectors: Iterable[Callable[[], str]] = (),
+) -> ThreadingHTTPServer:
+    """Serve `/metrics` of `source` (default: the global tracer) in a
+    background thread. Call `shutdown()` on the returned server to stop.
+
+    Each of `collectors` returns more exposition text appended to the
+    spans, e.g. `LiveScheduler.prometheus_text` for the job metrics.
+    """
+    source = source or tracer
+    collectors = list(collectors)
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            text = source.prometheus_text() + "".join(c() for c in collectors)
+            body = text.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("Metrics request: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True,
+    )
+    thread.start()
+    logger.info("Serving metrics on http://%s:%d/metrics", host, server.server_port)
+    return server
+
+
+# Process-wide tracer used by the instrumented pipeline
+tracer = Tracer()
@@ -1 +1,8 @@
 from .provider import DataProvider, BinanceProvider, KrakenProvider
+from .cache import CachedDataProvider, OHLCVStore
+from .sentiment import SentimentStore
+from .stream import BarBuffer, Kline, StreamingDataProvider
+from .replay import KlineReplayServer
+from .resample import BarResampler, ResampledDataProvider, resample_ohlcv, resample_trades
+from .downloader import DownloadError, DownloadReport, KlineDownloader, RateLimiter
+from .quality import DataQualityChecker, QualityReport, find_gaps
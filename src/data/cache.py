@@ -0,0 +1,210 @@
+"""On-disk OHLCV cache - columnar, append-only, memory-mapped on read."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from src.core.enums import TimeFrame
+from src.core.timeframes import TIMEFRAME_OFFSETS, utc_now
+
+from .provider import DataProvider
+
+if TYPE_CHECKING:
+    from .quality import DataQualityChecker, QualityReport
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Start date format understood by the exchange clients ("1 Jan, 2020")
+START_FORMAT = "%d %b, %Y %H:%M:%S"
+
+
+class OHLCVStore:
+    """Per-(symbol, timeframe) columnar store of closed OHLCV bars.
+
+    Each series lives in its own directory with one raw little-endian file
+    per column (`timestamp.i8` in ns, `open.f8`, ...). Files are only ever
+    appended to, so DataFrames returned by `load` can safely stay
+    memory-mapped while new bars are written.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path(self, symbol: str, timeframe: TimeFrame) -> Path:
+        return self.root / symbol / timeframe.value
+
+    def rows(self, symbol: str, timeframe: TimeFrame) -> int:
+        """Number of complete rows stored (all column files written)."""
+        directory = self.path(symbol, timeframe)
+        sizes = [
+            _file_size(directory / f"{col}.f8") for col in OHLCV_COLUMNS
+        ] + [_file_size(directory / "timestamp.i8")]
+        return min(sizes) // 8
+
+    def last_timestamp(self, symbol: str, timeframe: TimeFrame) -> pd.Timestamp | None:
+        rows = self.rows(symbol, timeframe)
+        if rows == 0:
+            return None
+        timestamps = self._map(self.path(symbol, timeframe) / "timestamp.i8", "<i8", rows)
+        return pd.Timestamp(int(timestamps[-1]))
+
+    def load(self, symbol: str, timeframe: TimeFrame) -> pd.DataFrame:
+        """Return the cached bars as a DataFrame backed by memory maps."""
+        rows = self.rows(symbol, timeframe)
+        if rows == 0:
+            return pd.DataFrame()
+        directory = self.path(symbol, timeframe)
+        index = pd.DatetimeIndex(
+            self._map(directory / "timestamp.i8", "<i8", rows).view("datetime64[ns]"),
+            name="timestamp",
+        )
+        columns = {
+            col: self._map(directory / f"{col}.f8", "<f8", rows)
+            for col in OHLCV_COLUMNS
+        }
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def append(self, symbol: str, timeframe: TimeFrame, df: pd.DataFrame) -> int:
+        """Append bars newer than the last stored one. Returns rows written."""
+        if df.empty:
+            return 0
+        last = self.last_timestamp(symbol, timeframe)
+        if last is not None:
+            df = df[df.index > last]
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        if df.empty:
+            return 0
+
+        directory = self.path(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        rows = self.rows(symbol, timeframe)
+        # Drop any partially written tail left by an interrupted append
+        for name in [f"{col}.f8" for col in OHLCV_COLUMNS] + ["timestamp.i8"]:
+            path = directory / name
+            if _file_size(path) > rows * 8:
+                os.truncate(path, rows * 8)
+
+        for col in OHLCV_COLUMNS:
+            _append_raw(directory / f"{col}.f8", df[col].to_numpy(dtype="<f8"))
+        # Timestamps last: a row only counts once every column holds it
+        timestamps = df.index.as_unit("ns").asi8.astype("<i8")
+        _append_raw(directory / "timestamp.i8", timestamps)
+        return len(df)
+
+    def load_meta(self, symbol: str, timeframe: TimeFrame) -> dict:
+        """Small JSON state kept with a series (e.g. exchange cursors)."""
+        path = self.path(symbol, timeframe) / "meta.json"
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_meta(self, symbol: str, timeframe: TimeFrame, meta: dict) -> None:
+        directory = self.path(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary = directory / "meta.json.tmp"
+        with open(temporary, "w") as f:
+            json.dump(meta, f)
+        os.replace(temporary, directory / "meta.json")
+
+    @staticmethod
+    def _map(path: Path, dtype: str, rows: int) -> np.ndarray:
+        return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+
+class CachedDataProvider(DataProvider):
+    """DataProvider wrapper that only downloads bars it has not seen yet.
+
+    Closed bars are persisted in an `OHLCVStore`; each fetch asks the wrapped
+    provider for data starting at the close of the last cached bar, appends
+    the newly closed bars and returns the cached history plus the bar still
+    forming. Only the OHLCV columns are kept, and history older than the
+    first cached bar is not backfilled.
+
+    Every returned series first goes through the `quality` checker (a
+    default `DataQualityChecker`, which only sorts, de-duplicates and flags,
+    unless given another); the report of the last check of each series is
+    kept in `quality_reports`.
+    """
+
+    def __init__(
+        self,
+        provider: DataProvider,
+        root: str | Path,
+        clock: Callable[[], pd.Timestamp] | None = None,
+        quality: DataQualityChecker | None = None,
+    ):
+        self._provider = provider
+        self._store = OHLCVStore(root)
+        self._clock = clock or utc_now
+        if quality is None:
+            from .quality import DataQualityChecker
+            quality = DataQualityChecker()
+        self.quality = quality
+        self.quality_reports: dict[tuple[str, TimeFrame], QualityReport] = {}
+
+    @property
+    def store(self) -> OHLCVStore:
+        return self._store
+
+    def fetch_ohlcv(
+        self, symbol: str, timeframe: TimeFrame, start: str = "1 Jan, 2020"
+    ) -> pd.DataFrame:
+        df = self._fetch(symbol, timeframe, start)
+        if df.empty:
+            return df
+        df, report = self.quality.check(df, timeframe)
+        self.quality_reports[(symbol, timeframe)] = report
+        return df
+
+    def _fetch(self, symbol: str, timeframe: TimeFrame, start: str) -> pd.DataFrame:
+        offset = TIMEFRAME_OFFSETS.get(timeframe, pd.DateOffset(days=1))
+        last = self._store.last_timestamp(symbol, timeframe)
+        since = start if last is None else (last + offset).strftime(START_FORMAT)
+
+        fresh = self._provider.fetch_ohlcv(symbol, timeframe, since)
+        if fresh.empty:
+            logger.debug("No new bars for %s (%s)", symbol, timeframe.value)
+            forming = fresh
+        else:
+            fresh = fresh[list(OHLCV_COLUMNS)]
+            closed = fresh.index + offset <= self._clock()
+            written = self._store.append(symbol, timeframe, fresh[closed])
+            logger.info(
+                "Cached %d new bars for %s (%s)", written, symbol, timeframe.value,
+            )
+            forming = fresh[~closed]
+
+        cached = self._store.load(symbol, timeframe)
+        if cached.empty:
+            return forming
+        # Positional slice keeps the memory-mapped columns
+        cached = cached.iloc[cached.index.searchsorted(pd.Timestamp(start)):]
+        if forming.empty:
+            return cached
+        return pd.concat([cached, forming[forming.index > cached.index[-1]]])
+
+    def get_balance(self, coin: str) -> float:
+        return self._provider.get_balance(coin)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _append_raw(path: Path, values: np.ndarray) -> None:
+    with open(path, "ab") as f:
+        f.write(values.tobytes())
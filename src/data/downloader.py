@@ -0,0 +1,306 @@
+"""Bulk kline downloader - chunked, concurrent, rate-limited and resumable."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.core.enums import TimeFrame
+from src.core.timeframes import Interval, utc_now
+
+from .cache import OHLCV_COLUMNS, OHLCVStore
+from .quality import find_gaps
+
+logger = logging.getLogger(__name__)
+
+# Most klines a Binance request returns
+KLINES_LIMIT = 1000
+
+
+class DownloadError(RuntimeError):
+    """Some chunks could not be downloaded; the others are checkpointed."""
+
+    def __init__(self, message: str, report: DownloadReport):
+        super().__init__(message)
+        self.report = report
+
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` requests per second, bursts of `burst`.
+
+    A caller finding the bucket empty reserves the next token and sleeps
+    until it is due, so concurrent callers are spaced out instead of
+    retrying in lockstep.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if needed. Returns the time slept."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+@dataclass
+class Chunk:
+    """Candles opening in [start, end) (ns), fetched by one or a few requests."""
+    index: int
+    start: int
+    end: int
+
+
+@dataclass
+class DownloadReport:
+    symbol: str
+    interval: str
+    chunks: int = 0
+    downloaded: int = 0  # chunks fetched by this run
+    resumed: int = 0  # chunks read back from checkpoints
+    requests: int = 0
+    rows: int = 0
+    stored: int = 0  # rows appended to the store
+    duplicates: int = 0
+    gaps: list[tuple[pd.Timestamp, pd.Timestamp, int]] = field(default_factory=list)
+    failed: list[int] = field(default_factory=list)
+
+    @property
+    def missing_bars(self) -> int:
+        return sum(missing for _, _, missing in self.gaps)
+
+
+class KlineDownloader:
+    """Backfills years of klines in parallel chunks that survive a crash.
+
+    The range is split into chunks of `chunk_bars` candles (one request
+    each on Binance), fetched by `max_workers` threads sharing a
+    `RateLimiter`. Each finished chunk is written atomically to
+    `checkpoint_dir`, so a rerun of the same download only fetches the
+    chunks still missing; a chunk failing `retries` times is reported and
+    raised as `DownloadError` once the other chunks are saved. The merged
+    history is sorted, de-duplicated and checked for gaps.
+
+    With a `store`, the history is appended to it. `OHLCVStore` only
+    appends bars newer than its last one, so backfilling before the bars a
+    live `CachedDataProvider` already stored writes nothing older: download
+    into an empty store (or a fresh root) instead. Such skipped rows are
+    logged and counted out of `DownloadReport.stored`.
+
+    `client` is any object with the python-binance `get_klines(symbol,
+    interval, startTime, endTime, limit)` method.
+
+    Usage:
+        downloader = KlineDownloader(Client(), "data/klines", max_workers=8)
+        df, report = downloader.download("BTCUSDT", TimeFrame.SCALPING, "1 Jan, 2020")
+    """
+
+    def __init__(
+        self,
+        client,
+        checkpoint_dir: str | Path,
+        chunk_bars: int = KLINES_LIMIT,
+        max_workers: int = 4,
+        requests_per_second: float = 10.0,
+        retries: int = 3,
+        backoff: float = 1.0,
+        rate_limiter: RateLimiter | None = None,
+        clock: Callable[[], pd.Timestamp] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._client = client
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.chunk_bars = chunk_bars
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_second, burst=max_workers, sleep=sleep,
+        )
+        self._clock = clock or utc_now
+        self._sleep = sleep
+
+    def chunks(
+        self, interval: Interval, start: pd.Timestamp, end: pd.Timestamp,
+    ) -> list[Chunk]:
+        """Chunks of `chunk_bars` candles covering the opens in [start, end)."""
+        first = int(interval.floor(np.array([start.value]))[0])
+        if first < start.value:
+            first = int(interval.end(np.array([first]))[0])
+        chunks, cursor = [], first
+        while cursor < end.value:
+            if interval.nanoseconds is None:
+                stop = end.value
+            else:
+                stop = min(cursor + self.chunk_bars * interval.nanoseconds, end.value)
+            chunks.append(Chunk(len(chunks), cursor, stop))
+            cursor = stop
+        return chunks
+
+    def download(
+        self,
+        symbol: str,
+        timeframe: str | TimeFrame | Interval,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp | None = None,
+        store: OHLCVStore | None = None,
+    ) -> tuple[pd.DataFrame, DownloadReport]:
+        """Candles opening in [start, end) that have closed (default: all)."""
+        interval = Interval.parse(timeframe)
+        start = pd.Timestamp(start)
+        # The candle containing now is still forming
+        end_open = int(interval.floor(np.array([self._clock().value]))[0])
+        if end is not None:
+            end_open = min(end_open, pd.Timestamp(end).value)
+        end = pd.Timestamp(end_open)
+
+        report = DownloadReport(symbol, interval.name)
+        chunks = self.chunks(interval, start, end)
+        report.chunks = len(chunks)
+        directory = self.checkpoint_dir / symbol / interval.name
+        directory.mkdir(parents=True, exist_ok=True)
+
+        todo = [c for c in chunks if not self._checkpoint(directory, c).exists()]
+        report.resumed = len(chunks) - len(todo)
+        logger.info(
+            "Downloading %s %s: %d chunks (%d checkpointed) on %d workers",
+            symbol, interval.name, len(chunks), report.resumed, self.max_workers,
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(self._fetch_chunk, symbol, interval, chunk, directory): chunk
+                for chunk in todo
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    requests = future.result()
+                except Exception as e:
+                    logger.error("Chunk %d of %s %s failed: %s", chunk.index, symbol, interval.name, e)
+                    report.failed.append(chunk.index)
+                    continue
+                report.downloaded += 1
+                report.requests += requests
+
+        if report.failed:
+            raise DownloadError(
+                f"{len(report.failed)} of {len(chunks)} chunks of {symbol} {interval.name} "
+                f"failed; rerun to resume",
+                report,
+            )
+        df = self._merge(directory, chunks, report)
+        # The store is keyed by TimeFrame; custom intervals are only returned
+        if store is not None and isinstance(timeframe, TimeFrame):
+            report.stored = store.append(symbol, timeframe, df)
+            if report.stored < len(df):
+                logger.warning(
+                    "%d of %d %s %s bars are not newer than the last stored bar (%s) "
+                    "and were not stored; backfill into an empty store",
+                    len(df) - report.stored, len(df), symbol, interval.name,
+                    store.last_timestamp(symbol, timeframe),
+                )
+        return df, report
+
+    def _fetch_chunk(
+        self, symbol: str, interval: Interval, chunk: Chunk, directory: Path,
+    ) -> int:
+        rows, requests, cursor = [], 0, chunk.start
+        while cursor < chunk.end:
+            klines = self._request(symbol, interval, cursor, chunk.end)
+            requests += 1
+            rows += [k for k in klines if int(k[0]) * 1_000_000 < chunk.end]
+            if not klines:
+                break
+            # Page on from the candle after the last one returned
+            cursor = int(interval.end(np.array([int(klines[-1][0]) * 1_000_000]))[0])
+
+        timestamps = np.array([int(k[0]) for k in rows], dtype=np.int64) * 1_000_000
+        values = np.array([k[1:6] for k in rows], dtype=float).reshape(-1, len(OHLCV_COLUMNS))
+        path = self._checkpoint(directory, chunk)
+        temporary = path.with_suffix(".tmp.npz")
+        np.savez(temporary, timestamp=timestamps, values=values)
+        os.replace(temporary, path)
+        return requests
+
+    def _request(self, symbol: str, interval: Interval, start: int, end: int) -> list:
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                return self._client.get_klines(
+                    symbol=symbol,
+                    interval=interval.name,
+                    startTime=start // 1_000_000,
+                    endTime=end // 1_000_000 - 1,
+                    limit=KLINES_LIMIT,
+                )
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.warning(
+                    "Klines request for %s failed (%s), retrying in %.1fs", symbol, e, delay,
+                )
+                self._sleep(delay)
+        return []
+
+    def _merge(
+        self, directory: Path, chunks: list[Chunk], report: DownloadReport,
+    ) -> pd.DataFrame:
+        timestamps, values = [], []
+        for chunk in chunks:
+            with np.load(self._checkpoint(directory, chunk)) as saved:
+                timestamps.append(saved["timestamp"])
+                values.append(saved["values"])
+        timestamps = np.concatenate(timestamps) if timestamps else np.zeros(0, np.int64)
+        values = np.concatenate(values) if values else np.zeros((0, len(OHLCV_COLUMNS)))
+
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, values = timestamps[order], values[order]
+        unique = np.ones(len(timestamps), dtype=bool)
+        unique[1:] = timestamps[1:] != timestamps[:-1]
+        report.duplicates = int(len(timestamps) - unique.sum())
+        index = pd.DatetimeIndex(timestamps[unique].view("datetime64[ns]"), name="timestamp")
+        df = pd.DataFrame(values[unique], index=index, columns=list(OHLCV_COLUMNS))
+
+        report.rows = len(df)
+        report.gaps = find_gaps(df.index, report.interval)
+        if report.duplicates or report.gaps:
+            logger.warning(
+                "%s %s: %d duplicate and %d missing candles (%d gaps)",
+                report.symbol, report.interval, report.duplicates,
+                report.missing_bars, len(report.gaps),
+            )
+        return df
+
+    @staticmethod
+    def _checkpoint(directory: Path, chunk: Chunk) -> Path:
+        return directory / f"{chunk.start}-{chunk.end}.npz"
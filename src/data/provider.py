@@ -8,16 +8,20 @@ from abc import ABC, abstractmethod
 import pandas as pd
 
 from src.core.enums import TimeFrame
+from src.core.timeframes import TIMEFRAME_INTERVALS
 
 logger = logging.getLogger(__name__)
 
 # Mapping from our TimeFrame enum to Binance interval strings
-BINANCE_INTERVALS = {
-    TimeFrame.MONTHLY: "1M",
-    TimeFrame.WEEKLY: "1w",
-    TimeFrame.DAILY: "1d",
-    TimeFrame.INTRADAY: "1h",
-    TimeFrame.SCALPING: "15m",
+BINANCE_INTERVALS = TIMEFRAME_INTERVALS
+
+# Kraken uses minutes for interval
+KRAKEN_INTERVALS = {
+    TimeFrame.MONTHLY: 43200,
+    TimeFrame.WEEKLY: 10080,
+    TimeFrame.DAILY: 1440,
+    TimeFrame.INTRADAY: 60,
+    TimeFrame.SCALPING: 15,
 }
 
 
@@ -73,6 +77,12 @@ class BinanceProvider(DataProvider):
             logger.error("Error fetching Binance data: %s", e)
             return pd.DataFrame()
 
+    def downloader(self, checkpoint_dir: str, **kwargs):
+        """Chunked, resumable `KlineDownloader` on this client for deep backfills."""
+        from .downloader import KlineDownloader
+
+        return KlineDownloader(self._client, checkpoint_dir, **kwargs)
+
     def get_balance(self, coin: str) -> float:
         if not self._authenticated:
             logger.warning("Binance client not authenticated, returning 0")
@@ -90,42 +100,106 @@ class BinanceProvider(DataProvider):
 
 
 class KrakenProvider(DataProvider):
-    """Kraken exchange data provider."""
-
-    def __init__(self, api_key: str = "", api_secret: str = ""):
-        import krakenex
-        from pykrakenapi import KrakenAPI
-
-        api = krakenex.API(key=api_key, secret=api_secret)
-        self._client = KrakenAPI(api)
+    """Kraken exchange data provider.
+
+    OHLC requests page forward with Kraken's `since` cursor: each response
+    holds the candles committed after the cursor plus the one still
+    forming, and the `last` cursor to poll from next. With a `store_root`,
+    committed candles are appended to an `OHLCVStore` and the cursor of
+    each (pair, timeframe) is saved next to them, so later fetches, even
+    after a restart, only transfer new candles. Kraken serves at most the
+    last 720 candles of an interval: deeper history builds up in the store
+    as the provider keeps polling.
+    """
+
+    def __init__(
+        self,
+        api_key: str = "",
+        api_secret: str = "",
+        store_root: str | None = None,
+        client=None,
+        max_pages: int = 50,
+    ):
+        if client is None:
+            import krakenex
+            from pykrakenapi import KrakenAPI
+
+            api = krakenex.API(key=api_key, secret=api_secret)
+            client = KrakenAPI(api)
+        self._client = client
+        self.max_pages = max_pages
+        self._store = None
+        if store_root is not None:
+            from .cache import OHLCVStore
+
+            self._store = OHLCVStore(store_root)
+
+    @property
+    def store(self):
+        return self._store
 
     def fetch_ohlcv(
         self, symbol: str, timeframe: TimeFrame, start: str = "1 Jan, 2020"
     ) -> pd.DataFrame:
-        # Kraken uses minutes for interval
-        interval_map = {
-            TimeFrame.MONTHLY: 43200,
-            TimeFrame.WEEKLY: 10080,
-            TimeFrame.DAILY: 1440,
-            TimeFrame.INTRADAY: 60,
-            TimeFrame.SCALPING: 15,
-        }
-        interval = interval_map.get(timeframe, 1440)
+        interval = KRAKEN_INTERVALS.get(timeframe, 1440)
+        # `since` is exclusive: start one second before the first candle wanted
+        since = int(pd.Timestamp(start).value // 10**9) - 1
+        if self._store is not None:
+            since = self._store.load_meta(symbol, timeframe).get("kraken_last", since)
         try:
-            df = self._client.get_ohlc_data(pair=symbol, interval=interval)[0]
-            for col in ["open", "high", "low", "close", "vwap", "volume", "count"]:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col])
-            df.reset_index(inplace=True)
-            if "time" in df.columns:
-                df["timestamp"] = pd.to_datetime(df["time"], unit="s")
-                df.set_index("timestamp", inplace=True)
-                df.drop(columns=["time"], inplace=True)
-            logger.info("Kraken OHLCV fetched for %s (%s)", symbol, timeframe.value)
-            return df
+            committed, forming, last = self._page_forward(symbol, interval, since)
         except Exception as e:
             logger.error("Error fetching Kraken data: %s", e)
             return pd.DataFrame()
+        logger.info(
+            "Kraken OHLCV fetched for %s (%s): %d new candles",
+            symbol, timeframe.value, len(committed),
+        )
+        if self._store is None:
+            df = pd.concat([committed, forming]) if not committed.empty else forming
+            if df.empty:
+                return df
+            return df.iloc[df.index.searchsorted(pd.Timestamp(start)):]
+
+        self._store.append(symbol, timeframe, committed)
+        meta = self._store.load_meta(symbol, timeframe)
+        self._store.save_meta(symbol, timeframe, {**meta, "kraken_last": last})
+        # Like CachedDataProvider: stored history plus the forming candle
+        cached = self._store.load(symbol, timeframe)
+        if cached.empty:
+            return forming
+        cached = cached.iloc[cached.index.searchsorted(pd.Timestamp(start)):]
+        if forming.empty or cached.empty:
+            return cached
+        return pd.concat([cached, forming[forming.index > cached.index[-1]]])
+
+    def _page_forward(
+        self, symbol: str, interval: int, since: int,
+    ) -> tuple[pd.DataFrame, pd.DataFrame, int]:
+        """(committed candles, forming candle, next cursor) after `since`."""
+        pages, cursor = [], since
+        forming = pd.DataFrame()
+        for _ in range(self.max_pages):
+            df, last = self._client.get_ohlc_data(
+                pair=symbol, interval=interval, since=cursor, ascending=True,
+            )
+            df = _kraken_frame(df)
+            if df.empty:
+                break
+            # The last candle of every response is the one still forming
+            pages.append(df.iloc[:-1])
+            forming = df.iloc[-1:]
+            moved = int(last) != cursor
+            cursor = int(last)
+            # Caught up once the forming candle directly follows the committed ones
+            caught_up = len(df) < 2 or (
+                df.index[-1] - df.index[-2] <= pd.Timedelta(minutes=interval)
+            )
+            if caught_up or not moved:
+                break
+        committed = pd.concat(pages) if pages else forming.iloc[:0]
+        committed = committed[~committed.index.duplicated(keep="last")]
+        return committed, forming, cursor
 
     def get_balance(self, coin: str) -> float:
         try:
@@ -136,3 +210,16 @@ class KrakenProvider(DataProvider):
         except Exception as e:
             logger.error("Error getting Kraken balance for %s: %s", coin, e)
             return 0.0
+
+
+def _kraken_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """OHLCV columns of a pykrakenapi OHLC frame, numeric and indexed by
+    timestamp (vwap and count are dropped, as by the store)."""
+    if df.empty:
+        return df
+    index = pd.DatetimeIndex(pd.to_datetime(df["time"], unit="s"), name="timestamp")
+    df = pd.DataFrame({
+        col: pd.to_numeric(df[col]).to_numpy()
+        for col in ["open", "high", "low", "close", "volume"]
+    }, index=index)
+    return df.sort_index()
@@ -0,0 +1,169 @@
+"""Kline replay server - a local stand-in for the exchange websocket."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from src.core.enums import TimeFrame
+from src.core.timeframes import TIMEFRAME_OFFSETS
+
+from .provider import BINANCE_INTERVALS
+from .stream import stream_name
+
+logger = logging.getLogger(__name__)
+
+
+def kline_messages(
+    df: pd.DataFrame, symbol: str, timeframe: TimeFrame, updates: int = 1,
+) -> list[dict]:
+    """Combined-stream kline messages replaying the OHLCV bars of `df`.
+
+    Each bar yields `updates - 1` intermediate updates (the candle growing
+    towards its final values) then the final, closed one, stamped with the
+    candle close time.
+    """
+    offset = TIMEFRAME_OFFSETS[timeframe]
+    stream = stream_name(symbol, timeframe)
+    interval = BINANCE_INTERVALS[timeframe]
+    messages = []
+    for open_time, bar in zip(df.index, df.itertuples(index=False)):
+        close_time = open_time + offset
+        t = _ms(open_time)
+        span = _ms(close_time) - t
+        for u in range(1, updates + 1):
+            final = u == updates
+            # Partial updates have the open, the close so far and a share of the volume
+            price = bar.close if final else bar.open + (bar.close - bar.open) * u / updates
+            kline = {
+                "t": t, "T": _ms(close_time) - 1, "s": symbol.upper(), "i": interval,
+                "o": str(bar.open),
+                "h": str(bar.high if final else max(bar.open, price)),
+                "l": str(bar.low if final else min(bar.open, price)),
+                "c": str(price),
+                "v": str(bar.volume * u / updates),
+                "x": final,
+            }
+            messages.append({
+                "stream": stream,
+                "data": {
+                    "e": "kline", "E": t + span * u // updates, "s": symbol.upper(),
+                    "k": kline,
+                },
+            })
+    messages.sort(key=lambda m: m["data"]["E"])
+    return messages
+
+
+def save_messages(messages: list[dict], path: str | Path) -> None:
+    with open(path, "w") as f:
+        for message in messages:
+            f.write(json.dumps(message) + "\n")
+
+
+def load_messages(path: str | Path) -> list[dict]:
+    """Messages of a JSON lines file (e.g. recorded by StreamingDataProvider)."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class KlineReplayServer:
+    """Websocket server replaying recorded kline messages at `speed`x.
+
+    It speaks the Binance combined-stream protocol (`/stream?streams=a/b`),
+    so a `StreamingDataProvider` pointed at `url` behaves as against the
+    exchange. Every connection replays the messages of its streams from the
+    start, sleeping the event-time gap divided by `speed` between two
+    messages (`speed=0` sends them back to back). With `drop_after`, the
+    first connection is closed after that many messages and the next
+    `outage` ones are lost: later connections resume after them.
+
+    Usage:
+        async with KlineReplayServer("btcusdt_1h.jsonl", speed=3600) as server:
+            stream = StreamingDataProvider(url=server.url)
+            ...
+    """
+
+    def __init__(
+        self,
+        messages: list[dict] | str | Path,
+        speed: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        drop_after: int | None = None,
+        outage: int = 0,
+    ):
+        if not isinstance(messages, list):
+            messages = load_messages(messages)
+        self.messages = messages
+        self.speed = speed
+        self.host = host
+        self.port = port
+        self.drop_after = drop_after
+        self.outage = outage
+        self.sent = 0
+        self._resume: int | None = None  # position after a dropped connection
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/stream", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        logger.info("Kline replay server on %s (%d messages)", self.url, len(self.messages))
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> KlineReplayServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        streams = set(request.query.get("streams", "").split("/"))
+        messages = [m for m in self.messages if m.get("stream") in streams]
+        if self._resume is not None:
+            messages = messages[self._resume:]
+        elif self.drop_after is not None:
+            messages = messages[:self.drop_after]
+            self._resume = self.drop_after + self.outage
+        previous = None
+        for message in messages:
+            event_time = message["data"].get("E")
+            if self.speed > 0 and previous is not None and event_time is not None:
+                await asyncio.sleep(max(event_time - previous, 0) / 1000 / self.speed)
+            previous = event_time
+            try:
+                await ws.send_str(json.dumps(message))
+            except ConnectionResetError:
+                break  # client went away
+            self.sent += 1
+        await ws.close()
+        return ws
+
+
+def _ms(ts: pd.Timestamp) -> int:
+    return ts.value // 1_000_000
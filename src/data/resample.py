@@ -0,0 +1,248 @@
+"""Bar resampling - every timeframe built from one low-granularity feed."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from src.core.enums import TimeFrame
+from src.core.timeframes import Interval, index_ns, utc_now
+
+from .cache import OHLCV_COLUMNS
+from .provider import DataProvider
+from .quality import DataQualityChecker, QualityReport
+
+logger = logging.getLogger(__name__)
+
+
+def _aggregate(
+    timestamps: np.ndarray,
+    interval: Interval,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+) -> pd.DataFrame:
+    """OHLCV bars of time-sorted rows grouped by candle (one reduceat pass)."""
+    if not len(timestamps):
+        return _empty()
+    buckets = interval.floor(timestamps)
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    ends = np.append(starts[1:], len(buckets)) - 1
+    index = pd.DatetimeIndex(buckets[starts].view("datetime64[ns]"), name="timestamp")
+    return pd.DataFrame({
+        "open": open_[starts],
+        "high": np.maximum.reduceat(high, starts),
+        "low": np.minimum.reduceat(low, starts),
+        "close": close[ends],
+        "volume": np.add.reduceat(volume, starts),
+    }, index=index)
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str | TimeFrame | Interval) -> pd.DataFrame:
+    """Aggregate time-sorted OHLCV bars into `interval` candles."""
+    if df.empty:
+        return _empty()
+    columns = [df[col].to_numpy(dtype=float) for col in OHLCV_COLUMNS]
+    return _aggregate(index_ns(df.index), Interval.parse(interval), *columns)
+
+
+def resample_trades(
+    trades: pd.DataFrame, interval: str | TimeFrame | Interval,
+) -> pd.DataFrame:
+    """OHLCV candles of time-sorted trades (`price` and `quantity` columns)."""
+    if trades.empty:
+        return _empty()
+    price = trades["price"].to_numpy(dtype=float)
+    quantity = trades["quantity"].to_numpy(dtype=float)
+    return _aggregate(
+        index_ns(trades.index), Interval.parse(interval), price, price, price, price, quantity,
+    )
+
+
+def resample_timeframes(
+    df: pd.DataFrame, timeframes: Iterable[TimeFrame] = tuple(TimeFrame),
+) -> dict[str, pd.DataFrame]:
+    """Bars of every timeframe keyed by name, as `detect_multi_timeframe` expects."""
+    return {tf.value: resample_ohlcv(df, tf) for tf in timeframes}
+
+
+class BarResampler:
+    """Incremental aggregation of a bar (or trade) feed into `interval` candles.
+
+    `update` takes the rows received since the previous call and returns
+    the candles they completed; rows of the candle still open are kept
+    (at most one candle worth) and re-aggregated with the next update, so
+    each row is only processed once or twice whatever the history length.
+
+    A candle is complete once a row of a later candle arrives, or, when the
+    `source` interval of the rows is known, once its last source bar has
+    closed. Trades have no source interval: call `flush(now)` to close the
+    candles that ended before `now`.
+    """
+
+    def __init__(
+        self,
+        interval: str | TimeFrame | Interval,
+        source: str | TimeFrame | Interval | None = None,
+        trades: bool = False,
+    ):
+        self.interval = Interval.parse(interval)
+        self.source = Interval.parse(source) if source is not None else None
+        self.trades = trades
+        self._chunks: list[pd.DataFrame] = []
+        self._pending: pd.DataFrame | None = None
+        self._last: int | None = None  # ns timestamp of the last row received
+
+    def update(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """Feed new time-sorted rows; return the candles they completed."""
+        if self._last is not None and not rows.empty:
+            rows = rows[index_ns(rows.index) > self._last]
+        if rows.empty:
+            return _empty()
+        self._last = int(index_ns(rows.index)[-1])
+        if self._pending is not None:
+            rows = pd.concat([self._pending, rows])
+        bars = self._aggregate(rows)
+
+        complete = len(bars) - 1
+        if self.source is not None:
+            last_close = self.source.end(self.source.floor(np.array([self._last])))[0]
+            if self.interval.end(index_ns(bars.index[-1:]))[0] <= last_close:
+                complete += 1
+        first_open = index_ns(bars.index[complete:complete + 1])
+        self._pending = (
+            rows.iloc[np.searchsorted(index_ns(rows.index), first_open[0]):]
+            if complete < len(bars) else None
+        )
+        return self._append(bars.iloc[:complete])
+
+    def flush(self, now: pd.Timestamp) -> pd.DataFrame:
+        """Complete the pending candle if it ended at or before `now`."""
+        if self._pending is None:
+            return _empty()
+        bars = self._aggregate(self._pending)
+        if self.interval.end(index_ns(bars.index))[0] > pd.Timestamp(now).value:
+            return _empty()
+        self._pending = None
+        return self._append(bars)
+
+    @property
+    def forming(self) -> pd.DataFrame:
+        """The candle still open, aggregated from the rows received so far."""
+        if self._pending is None:
+            return _empty()
+        return self._aggregate(self._pending)
+
+    def frame(self, include_forming: bool = False) -> pd.DataFrame:
+        """Every completed candle (and optionally the forming one)."""
+        if len(self._chunks) > 1:
+            self._chunks = [pd.concat(self._chunks)]
+        frame = self._chunks[0] if self._chunks else _empty()
+        if include_forming and self._pending is not None:
+            return pd.concat([frame, self.forming])
+        return frame
+
+    def _aggregate(self, rows: pd.DataFrame) -> pd.DataFrame:
+        if self.trades:
+            return resample_trades(rows, self.interval)
+        return resample_ohlcv(rows, self.interval)
+
+    def _append(self, bars: pd.DataFrame) -> pd.DataFrame:
+        if not bars.empty:
+            self._chunks.append(bars)
+        return bars
+
+
+class ResampledDataProvider(DataProvider):
+    """DataProvider serving every timeframe from the `base` timeframe bars.
+
+    Only the base series is downloaded (typically through a
+    `CachedDataProvider`); other timeframes, or any custom interval through
+    `fetch_interval`, are aggregated from it by one `BarResampler` per
+    (symbol, interval), so each fetch only processes the base bars closed
+    since the previous one. Base bars fetched less than `max_age` seconds
+    ago are reused, so jobs of every timeframe firing at the same candle
+    close share one download. Each download goes through the `quality`
+    checker before it is aggregated (reports in `quality_reports`).
+
+    The first fetch of a series sets its history; later fetches with an
+    earlier `start` are not backfilled.
+    """
+
+    def __init__(
+        self,
+        provider: DataProvider,
+        base: TimeFrame = TimeFrame.SCALPING,
+        max_age: float = 5.0,
+        clock: Callable[[], pd.Timestamp] | None = None,
+        quality: DataQualityChecker | None = None,
+    ):
+        self._provider = provider
+        self.base = base
+        self.max_age = max_age
+        self._clock = clock or utc_now
+        self.quality = quality or DataQualityChecker()
+        self.quality_reports: dict[str, QualityReport] = {}
+        self._resamplers: dict[tuple[str, Interval], BarResampler] = {}
+        self._base_frames: dict[str, tuple[pd.Timestamp, str, pd.DataFrame]] = {}
+
+    def fetch_ohlcv(
+        self, symbol: str, timeframe: TimeFrame, start: str = "1 Jan, 2020"
+    ) -> pd.DataFrame:
+        if timeframe == self.base:
+            return self._fetch_base(symbol, start)
+        return self.fetch_interval(symbol, timeframe, start)
+
+    def fetch_interval(
+        self, symbol: str, interval: str | TimeFrame | Interval, start: str = "1 Jan, 2020",
+    ) -> pd.DataFrame:
+        """Bars of any interval from `start`, including the one still forming."""
+        interval = Interval.parse(interval)
+        base = self._fetch_base(symbol, start)
+        if base.empty:
+            return base
+        source = Interval.parse(self.base)
+        key = (symbol, interval)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = self._resamplers[key] = BarResampler(interval, source)
+
+        # Only closed base bars are fed; the forming one joins the forming candle
+        timestamps = index_ns(base.index)
+        closed = source.end(timestamps) <= self._clock().value
+        resampler.update(base[closed])
+        df = resampler.frame()
+        # The forming candle re-aggregates its pending part with the forming base bar
+        rows = [part for part in (resampler.forming, base[~closed]) if not part.empty]
+        if rows:
+            df = pd.concat([df, resample_ohlcv(pd.concat(rows), interval)])
+        return df.iloc[df.index.searchsorted(pd.Timestamp(start)):]
+
+    def get_balance(self, coin: str) -> float:
+        return self._provider.get_balance(coin)
+
+    def _fetch_base(self, symbol: str, start: str) -> pd.DataFrame:
+        now = self._clock()
+        cached = self._base_frames.get(symbol)
+        if cached is not None:
+            fetched_at, cached_start, df = cached
+            if cached_start == start and (now - fetched_at).total_seconds() < self.max_age:
+                return df
+        df = self._provider.fetch_ohlcv(symbol, self.base, start)
+        if not df.empty:
+            df, report = self.quality.check(df[list(OHLCV_COLUMNS)], self.base)
+            self.quality_reports[symbol] = report
+        self._base_frames[symbol] = (now, start, df)
+        return df
+
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame(
+        {col: np.zeros(0) for col in OHLCV_COLUMNS},
+        index=pd.DatetimeIndex([], dtype="datetime64[ns]", name="timestamp"),
+    )
@@ -0,0 +1,136 @@
+"""Historical sentiment store - external series aligned on bar timestamps."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Full daily history of the index, oldest values included (limit=0)
+FEAR_AND_GREED_HISTORY_URL = "https://api.alternative.me/fng/?limit=0&format=json"
+
+
+class SentimentStore:
+    """Named sentiment series (Fear & Greed...) indexed by publication time.
+
+    Each series is kept as two sorted arrays (int64 ns timestamps, float
+    values). `align` maps a whole bar index onto a series in one
+    searchsorted pass, as-of: every bar sees the last value published at or
+    before its timestamp, NaN before the first one. Indicators store the
+    aligned column, so a per-bar lookup is a plain array access.
+
+    Usage:
+        store = SentimentStore.from_files(fear_and_greed="data/fng.json")
+        df["fear_and_greed"] = store.align("fear_and_greed", df.index)
+    """
+
+    def __init__(self):
+        self._series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._digests: dict[str, str] = {}
+
+    @classmethod
+    def from_files(cls, **paths: str | Path) -> SentimentStore:
+        store = cls()
+        for name, path in paths.items():
+            store.load(name, path)
+        return store
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._series.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._series
+
+    @property
+    def content_token(self) -> tuple[tuple[str, str], ...]:
+        """Digest of every series: equal for equal data, in any process."""
+        return tuple(sorted(self._digests.items()))
+
+    def add(self, name: str, series: pd.Series) -> None:
+        """Register a series indexed by timestamps (duplicates keep the last)."""
+        series = pd.to_numeric(series, errors="coerce").dropna()
+        index = pd.DatetimeIndex(series.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        series = pd.Series(series.to_numpy(dtype=float), index=index)
+        series = series[~series.index.duplicated(keep="last")].sort_index()
+        timestamps = series.index.as_unit("ns").asi8
+        values = series.to_numpy(dtype=float)
+        self._series[name] = (timestamps, values)
+        digest = hashlib.blake2b(timestamps.tobytes(), digest_size=16)
+        digest.update(values.tobytes())
+        self._digests[name] = digest.hexdigest()
+        logger.debug("Loaded sentiment series %s (%d points)", name, len(series))
+
+    def load(self, name: str, path: str | Path) -> None:
+        """Load a series from a local file.
+
+        Accepted formats: CSV with `timestamp` and `value` columns, or JSON
+        as served by the alternative.me API (`{"data": [{"value", "timestamp"}]}`)
+        or as a plain list of such records. Numeric timestamps are epoch
+        seconds.
+        """
+        path = Path(path)
+        if path.suffix.lower() == ".json":
+            with open(path) as f:
+                raw = json.load(f)
+            records = raw.get("data", []) if isinstance(raw, dict) else raw
+            frame = pd.DataFrame(records, columns=["timestamp", "value"])
+        else:
+            frame = pd.read_csv(path, usecols=["timestamp", "value"])
+        index = _parse_timestamps(frame["timestamp"])
+        self.add(name, pd.Series(frame["value"].to_numpy(), index=index))
+
+    def series(self, name: str) -> pd.Series:
+        timestamps, values = self._series[name]
+        index = pd.DatetimeIndex(timestamps.view("datetime64[ns]"))
+        return pd.Series(values, index=index, name=name)
+
+    def align(self, name: str, index: pd.Index) -> np.ndarray:
+        """Values of `name` as of each timestamp of `index` (NaN if none yet)."""
+        timestamps, values = self._series[name]
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        positions = np.searchsorted(timestamps, index.as_unit("ns").asi8, side="right") - 1
+        aligned = np.full(len(index), np.nan)
+        known = positions >= 0
+        aligned[known] = values[positions[known]]
+        return aligned
+
+    def value_at(self, name: str, timestamp) -> float | None:
+        """Value of `name` as of a single timestamp."""
+        value = self.align(name, pd.DatetimeIndex([pd.Timestamp(timestamp)]))[0]
+        return None if np.isnan(value) else float(value)
+
+
+def download_fear_and_greed_history(path: str | Path) -> int:
+    """Save the full Fear & Greed history to a local JSON file for backtests.
+
+    Returns the number of daily values written.
+    """
+    response = requests.get(FEAR_AND_GREED_HISTORY_URL, timeout=30)
+    response.raise_for_status()
+    payload = response.json()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f)
+    count = len(payload.get("data", []))
+    logger.info("Saved %d Fear & Greed values to %s", count, path)
+    return count
+
+
+def _parse_timestamps(values: pd.Series) -> pd.DatetimeIndex:
+    numeric = pd.to_numeric(values, errors="coerce")
+    if numeric.notna().all():
+        return pd.DatetimeIndex(pd.to_datetime(numeric.astype("int64"), unit="s"))
+    return pd.DatetimeIndex(pd.to_datetime(values))
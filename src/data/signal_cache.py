@@ -0,0 +1,118 @@
+"""Shared cache for slow external signals (Fear & Greed, Google Trends...)."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Source:
+    fetch: Callable[..., object]
+    ttl: float
+    max_stale: float | None
+
+
+@dataclass
+class _Entry:
+    value: object
+    fetched_at: float
+
+
+class ExternalSignalCache:
+    """TTL cache with stale-while-revalidate and single-flight fetches.
+
+    - fresh value (younger than the source TTL): returned directly
+    - stale value: returned immediately while one background refresh runs
+    - no usable value: fetched synchronously; concurrent callers for the
+      same key wait on that single fetch instead of issuing their own
+
+    A fetch returning None or raising is treated as a failure and never
+    cached; the last good value keeps being served meanwhile.
+
+    Usage:
+        external_signals.register("fear_and_greed", fetch_index, ttl=3600)
+        value = external_signals.get("fear_and_greed")
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        max_workers: int = 2,
+    ):
+        self._clock = clock
+        self._sources: dict[str, _Source] = {}
+        self._entries: dict[Hashable, _Entry] = {}
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="signal-refresh",
+        )
+
+    def register(
+        self,
+        name: str,
+        fetch: Callable[..., object],
+        ttl: float,
+        max_stale: float | None = None,
+    ) -> None:
+        """Declare a source. `max_stale` bounds how old a served value may be
+        (None: serve any stale value while refreshing)."""
+        self._sources[name] = _Source(fetch, ttl, max_stale)
+
+    def get(self, name: str, *args: Hashable) -> object:
+        """Return the cached value of `name(*args)`, fetching it if needed."""
+        source = self._sources[name]
+        key = (name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._clock() - entry.fetched_at
+                if age < source.ttl:
+                    return entry.value
+                if source.max_stale is None or age < source.ttl + source.max_stale:
+                    if key not in self._inflight:
+                        future = self._inflight[key] = Future()
+                        self._executor.submit(self._refresh, key, source, future)
+                    return entry.value
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if leader:
+            self._refresh(key, source, future)
+        return future.result()
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Forget cached values (of one source, or all of them)."""
+        with self._lock:
+            for key in list(self._entries):
+                if name is None or key[0] == name:
+                    del self._entries[key]
+
+    def _refresh(self, key: Hashable, source: _Source, future: Future) -> None:
+        name, args = key
+        value = None
+        try:
+            value = source.fetch(*args)
+        except Exception as e:
+            logger.warning("Could not refresh external signal %s: %s", name, e)
+        with self._lock:
+            if value is not None:
+                self._entries[key] = _Entry(value, self._clock())
+            else:
+                entry = self._entries.get(key)
+                value = entry.value if entry is not None else None
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+
+# Process-wide instance shared by the indicators and the legacy bot
+external_signals = ExternalSignalCache()
@@ -0,0 +1,348 @@
+"""Streaming DataProvider - websocket klines kept in rolling in-memory buffers."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.core.enums import TimeFrame
+
+from .cache import OHLCV_COLUMNS, START_FORMAT
+from .provider import BINANCE_INTERVALS, DataProvider
+
+logger = logging.getLogger(__name__)
+
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443"
+
+TIMEFRAMES_BY_INTERVAL = {interval: tf for tf, interval in BINANCE_INTERVALS.items()}
+
+
+@dataclass
+class Kline:
+    """One kline update; `closed` is set on the final update of the candle."""
+    symbol: str
+    timeframe: TimeFrame
+    open_time: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    closed: bool
+
+
+# subscriber(kline) is called with every closed bar; coroutines are awaited
+KlineCallback = Callable[[Kline], object]
+
+
+def stream_name(symbol: str, timeframe: TimeFrame) -> str:
+    """Binance stream name of a (symbol, timeframe), e.g. "btcusdt@kline_1h"."""
+    return f"{symbol.lower()}@kline_{BINANCE_INTERVALS[timeframe]}"
+
+
+def parse_kline(message: dict) -> Kline | None:
+    """Kline of a Binance kline event (raw or combined-stream), else None."""
+    data = message.get("data", message)
+    if data.get("e") != "kline":
+        return None
+    k = data["k"]
+    timeframe = TIMEFRAMES_BY_INTERVAL.get(k["i"])
+    if timeframe is None:
+        return None
+    return Kline(
+        symbol=k["s"],
+        timeframe=timeframe,
+        open_time=pd.Timestamp(int(k["t"]), unit="ms"),
+        open=float(k["o"]),
+        high=float(k["h"]),
+        low=float(k["l"]),
+        close=float(k["c"]),
+        volume=float(k["v"]),
+        closed=bool(k["x"]),
+    )
+
+
+class BarBuffer:
+    """Rolling buffer of the last `capacity` closed bars plus the forming one.
+
+    Bars are stored in preallocated arrays twice the capacity; once full,
+    the last `capacity` rows are moved back to the front, so appends are
+    amortized O(1) and `frame()` is a view of one contiguous slice.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype="<i8")
+        self._values = np.zeros((2 * capacity, len(OHLCV_COLUMNS)))
+        self._start = self._end = 0
+        self.forming: Kline | None = None
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_open(self) -> pd.Timestamp | None:
+        if not len(self):
+            return None
+        return pd.Timestamp(int(self._timestamps[self._end - 1]))
+
+    def extend(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Append closed bars newer than the last one held (e.g. REST history).
+
+        Returns the bars appended. A forming bar they cover is replaced.
+        """
+        last = self.last_open
+        if last is not None:
+            df = df[df.index > last]
+        df = df.iloc[-self.capacity:]
+        timestamps = df.index.as_unit("ns").asi8
+        values = df[list(OHLCV_COLUMNS)].to_numpy(dtype=float)
+        for ts, row in zip(timestamps, values):
+            self._push(ts, row)
+        if self.forming is not None and len(df) and self.forming.open_time <= self.last_open:
+            self.forming = None
+        return df
+
+    def update(self, kline: Kline) -> list[Kline]:
+        """Apply one kline update; return the bars it closed (oldest first).
+
+        A forming bar whose final message never came (e.g. lost around a
+        reconnect) is dropped when an update for a later candle arrives:
+        its partial values are not a closed bar. `extend` fills it in from
+        REST instead. Updates of candles already closed are ignored.
+        """
+        last = self.last_open
+        if last is not None and kline.open_time <= last:
+            return []
+        closed = []
+        forming = self.forming
+        if forming is not None and forming.open_time < kline.open_time:
+            logger.warning(
+                "Final update of %s (%s) %s lost: bar left out",
+                forming.symbol, forming.timeframe.value, forming.open_time,
+            )
+        self.forming = kline
+        if kline.closed:
+            closed.append(kline)
+            self.forming = None
+        for bar in closed:
+            self._push(
+                bar.open_time.value,
+                [bar.open, bar.high, bar.low, bar.close, bar.volume],
+            )
+        return closed
+
+    def frame(self, include_forming: bool = False) -> pd.DataFrame:
+        """Closed bars (and optionally the forming one) as an OHLCV DataFrame."""
+        index = pd.DatetimeIndex(
+            self._timestamps[self._start:self._end].view("datetime64[ns]"),
+            name="timestamp",
+        )
+        df = pd.DataFrame(
+            self._values[self._start:self._end], index=index, columns=list(OHLCV_COLUMNS),
+        )
+        if include_forming and self.forming is not None:
+            bar = self.forming
+            df.loc[bar.open_time] = [bar.open, bar.high, bar.low, bar.close, bar.volume]
+        return df
+
+    def _push(self, timestamp: int, row) -> None:
+        if self._end == len(self._timestamps):
+            keep = self.capacity - 1
+            self._timestamps[:keep] = self._timestamps[self._end - keep:self._end]
+            self._values[:keep] = self._values[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self._timestamps[self._end] = timestamp
+        self._values[self._end] = row
+        self._end += 1
+        self._start = max(self._start, self._end - self.capacity)
+
+
+class StreamingDataProvider(DataProvider):
+    """DataProvider fed by the Binance kline websocket instead of REST polls.
+
+    One combined-stream connection carries every subscribed (symbol,
+    timeframe). Each series keeps a `BarBuffer`, optionally seeded from a
+    REST `history` provider, and every closed bar is pushed to the
+    subscribers of its series as soon as the exchange sends it. The
+    connection is re-opened after `reconnect_delay` when it drops; on each
+    reconnect the bars closed meanwhile are fetched from `history` and
+    pushed before the new messages, so the buffers have no gap. Raw
+    messages can be appended to `record_path` (JSON lines) to be replayed
+    offline by `KlineReplayServer`.
+
+    Usage:
+        stream = StreamingDataProvider(history=BinanceProvider())
+        stream.subscribe("BTCUSDT", TimeFrame.INTRADAY, on_close)
+        asyncio.run(stream.run())
+    """
+
+    def __init__(
+        self,
+        url: str = BINANCE_STREAM_URL,
+        capacity: int = 1000,
+        history: DataProvider | None = None,
+        history_start: str = "1 Jan, 2020",
+        reconnect_delay: float = 5.0,
+        record_path: str | Path | None = None,
+    ):
+        self.url = url.rstrip("/")
+        self.capacity = capacity
+        self.history = history
+        self.history_start = history_start
+        self.reconnect_delay = reconnect_delay
+        self.record_path = Path(record_path) if record_path else None
+        self._buffers: dict[tuple[str, TimeFrame], BarBuffer] = {}
+        self._subscribers: dict[tuple[str, TimeFrame], list[KlineCallback]] = {}
+        self._stopped = asyncio.Event()
+        self.messages = 0
+        self.connections = 0
+
+    def subscribe(
+        self, symbol: str, timeframe: TimeFrame, callback: KlineCallback | None = None,
+    ) -> None:
+        """Stream a (symbol, timeframe); `callback` receives its closed bars."""
+        key = (symbol.upper(), timeframe)
+        self._buffers.setdefault(key, BarBuffer(self.capacity))
+        callbacks = self._subscribers.setdefault(key, [])
+        if callback is not None:
+            callbacks.append(callback)
+
+    @property
+    def streams(self) -> list[str]:
+        return [stream_name(symbol, tf) for symbol, tf in self._buffers]
+
+    def buffer(self, symbol: str, timeframe: TimeFrame) -> BarBuffer:
+        return self._buffers[(symbol.upper(), timeframe)]
+
+    def fetch_ohlcv(
+        self, symbol: str, timeframe: TimeFrame, start: str = "1 Jan, 2020"
+    ) -> pd.DataFrame:
+        """Buffered bars from `start`, including the bar still forming."""
+        buffer = self._buffers.get((symbol.upper(), timeframe))
+        if buffer is None:
+            logger.warning("%s (%s) is not streamed", symbol, timeframe.value)
+            return pd.DataFrame()
+        df = buffer.frame(include_forming=True)
+        return df.iloc[df.index.searchsorted(pd.Timestamp(start)):]
+
+    def get_balance(self, coin: str) -> float:
+        return self.history.get_balance(coin) if self.history else 0.0
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    async def run(self) -> None:
+        """Stream until `stop()` is called, reconnecting when the socket drops."""
+        import aiohttp
+
+        if not self._buffers:
+            raise ValueError("No stream subscribed")
+        self._stopped.clear()
+        url = f"{self.url}/stream?streams={'/'.join(self.streams)}"
+        async with aiohttp.ClientSession() as session:
+            while not self._stopped.is_set():
+                try:
+                    await self._consume(session, url)
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    logger.error("Kline stream error: %s", e)
+                if self._stopped.is_set():
+                    break
+                logger.warning("Kline stream closed, reconnecting in %.1fs", self.reconnect_delay)
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), self.reconnect_delay)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info("Kline stream stopped")
+
+    async def _load_history(self) -> None:
+        """Seed the buffers, then on reconnects backfill and push the missed bars."""
+        if self.history is None:
+            return
+        for (symbol, timeframe), buffer in self._buffers.items():
+            last = buffer.last_open
+            start = self.history_start if last is None else last.strftime(START_FORMAT)
+            try:
+                df = await asyncio.to_thread(
+                    self.history.fetch_ohlcv, symbol, timeframe, start,
+                )
+            except Exception as e:
+                logger.error("History of %s (%s) failed: %s", symbol, timeframe.value, e)
+                continue
+            if df.empty:
+                continue
+            # The last REST bar may still be forming; the stream will close it
+            added = buffer.extend(df.iloc[:-1])
+            logger.info(
+                "Loaded %d bars for %s (%s)", len(added), symbol, timeframe.value,
+            )
+            if self.connections > 1:
+                values = added[list(OHLCV_COLUMNS)].to_numpy(dtype=float)
+                await self._notify((symbol, timeframe), [
+                    Kline(symbol, timeframe, ts, *row, closed=True)
+                    for ts, row in zip(added.index, values)
+                ])
+
+    async def _consume(self, session, url: str) -> None:
+        import aiohttp
+
+        async with session.ws_connect(url, heartbeat=30) as ws:
+            self.connections += 1
+            logger.info("Kline stream connected: %d streams", len(self._buffers))
+            # Messages queue up on the socket meanwhile
+            await self._load_history()
+            record = open(self.record_path, "a") if self.record_path else None
+            stopping = asyncio.ensure_future(self._stopped.wait())
+            try:
+                while True:
+                    receiving = asyncio.ensure_future(ws.receive())
+                    await asyncio.wait(
+                        {receiving, stopping}, return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if not receiving.done():
+                        receiving.cancel()
+                        return
+                    msg = receiving.result()
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        return
+                    if record is not None:
+                        record.write(msg.data + "\n")
+                    await self._dispatch(json.loads(msg.data))
+            finally:
+                stopping.cancel()
+                if record is not None:
+                    record.close()
+
+    async def _dispatch(self, message: dict) -> None:
+        self.messages += 1
+        kline = parse_kline(message)
+        if kline is None:
+            return
+        key = (kline.symbol, kline.timeframe)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return
+        await self._notify(key, buffer.update(kline))
+
+    async def _notify(self, key: tuple[str, TimeFrame], bars: list[Kline]) -> None:
+        for bar in bars:
+            for callback in self._subscribers.get(key, []):
+                try:
+                    result = callback(bar)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(
+                        "Error in kline subscriber %s (%s): %s",
+                        bar.symbol, bar.timeframe.value, e,
+                    )
@@ -3,11 +3,19 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from math import floor
 
+import numpy as np
+
 from src.core.config import ProtectionConfig, RiskProfileConfig
-from src.core.enums import MarketRegime, OrderSide, RiskProfile, Signal, TimeFrame
-from src.core.models import IndicatorResult, MarketContext, TradeSetup
+from src.core.enums import (
+    SIGNAL_CODES, SIGNALS_BY_CODE, MarketRegime, OrderSide, RiskProfile, Signal,
+    TimeFrame,
+)
+from src.core.models import (
+    IndicatorResult, IndicatorSeries, MarketContext, MarketContextSeries, TradeSetup,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +25,35 @@ SCORING_INDICATORS = {
     "stoch_rsi", "volume", "fear_and_greed",
 }
 
+# Vote of each signal code in the trend score
+SCORE_BY_CODE = np.zeros(len(SIGNALS_BY_CODE), dtype=np.int8)
+for _signal in (Signal.BULLISH, Signal.OVERSOLD):
+    SCORE_BY_CODE[SIGNAL_CODES[_signal]] = 1
+for _signal in (Signal.BEARISH, Signal.OVERBOUGHT):
+    SCORE_BY_CODE[SIGNAL_CODES[_signal]] = -1
+
+
+def score_signal_codes(
+    signals: Mapping[str, np.ndarray], length: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Batch counterpart of `compute_market_context` scoring.
+
+    Takes the int8 signal codes of every bar per indicator name and returns
+    (trend_scores, signal codes) for the whole history: one table lookup
+    and one add per scoring indicator, instead of a Python loop per bar.
+    """
+    if length is None:
+        length = len(next(iter(signals.values()))) if signals else 0
+    scores = np.zeros(length, dtype=np.int16)
+    for name, codes in signals.items():
+        if name in SCORING_INDICATORS:
+            scores += SCORE_BY_CODE[codes]
+    overall = np.where(
+        scores > 0, SIGNAL_CODES[Signal.BULLISH],
+        np.where(scores < 0, SIGNAL_CODES[Signal.BEARISH], SIGNAL_CODES[Signal.NEUTRAL]),
+    ).astype(np.int8)
+    return scores, overall
+
 
 class DecisionEngine:
     """Converts indicator results + market context into trade decisions.
@@ -63,6 +100,29 @@ class DecisionEngine:
             indicators=results,
         )
 
+    def compute_market_context_series(
+        self,
+        series: list[IndicatorSeries],
+        regimes: np.ndarray,
+        regime_confidences: np.ndarray,
+        start: int = 0,
+    ) -> MarketContextSeries:
+        """Market context of every bar at once (see `score_signal_codes`).
+
+        Bar i matches `compute_market_context` on the results of bar i.
+        """
+        scores, signals = score_signal_codes(
+            {s.name: s.signals for s in series}, length=len(regimes),
+        )
+        return MarketContextSeries(
+            regimes=regimes,
+            regime_confidences=regime_confidences,
+            trend_scores=scores,
+            signals=signals,
+            series=series,
+            start=start,
+        )
+
     def evaluate(
         self,
         context: MarketContext,
@@ -1,2 +1,3 @@
 from .base import Indicator
+from .cache import ComputeCache, compute_cache
 from .engine import IndicatorEngine
@@ -2,30 +2,39 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import Lag
 
 
 class ADIIndicator(Indicator):
     """ADI with trend direction and strength analysis."""
 
     name = "adi"
+    inputs = ("high", "low", "close", "volume")
+    outputs = ("adi",)
+
+    def __init__(self):
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         df["adi"] = ta.volume.acc_dist_index(
-            high=df["high"], low=df["low"],
-            close=df["close"], volume=df["volume"],
+            high=self._input(df, "high"), low=self._input(df, "low"),
+            close=self._input(df, "close"), volume=self._input(df, "volume"),
         )
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
         adi = self._safe_iloc(df["adi"], -1)
         prev_adi = self._safe_iloc(df["adi"], -2)
+        return self._evaluate(adi, prev_adi)
 
+    def _evaluate(self, adi, prev_adi) -> "IndicatorResult":
         if adi is None or prev_adi is None:
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -40,3 +49,39 @@ class ADIIndicator(Indicator):
             signal = Signal.NEUTRAL
 
         return self._make_result(signal, adi, prev_adi=prev_adi, strength=strength)
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        adi = self._column(df, "adi")
+        prev_adi = self._shift(adi, 1)
+        valid = ~np.isnan(adi) & ~np.isnan(prev_adi)
+
+        diff = adi - prev_adi
+        signals = np.select(
+            [diff > 0, diff < 0],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.BEARISH]],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+        strength = np.where(np.abs(diff) >= 0.1, "strong", "weak").astype(object)
+
+        return self._make_series(
+            signals, adi, valid, prev_adi=prev_adi, strength=strength,
+        )
+
+    def reset(self) -> None:
+        self._total = 0.0
+        self._adi = Lag(1)
+
+    def _advance(self, bar) -> None:
+        price_range = bar.high - bar.low
+        if price_range:
+            clv = ((bar.close - bar.low) - (bar.high - bar.close)) / price_range
+        else:
+            clv = 0.0
+        self._total += clv * bar.volume
+        self._adi.update(self._total)
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate(
+            self._none_if_nan(self._adi.current),
+            self._none_if_nan(self._adi.lagged),
+        )
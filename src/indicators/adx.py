@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
 
@@ -14,13 +15,18 @@ class ADXIndicator(Indicator):
     """ADX measures trend strength. Key for Market Regime Detection."""
 
     name = "adx"
+    inputs = ("high", "low", "close")
+    outputs = ("adx", "adx_pos", "adx_neg")
 
     def __init__(self, window: int = 14):
         self.window = window
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         adx = ta.trend.ADXIndicator(
-            high=df["high"], low=df["low"], close=df["close"],
+            high=self._input(df, "high"),
+            low=self._input(df, "low"),
+            close=self._input(df, "close"),
             window=self.window,
         )
         df["adx"] = adx.adx()
@@ -32,7 +38,9 @@ class ADXIndicator(Indicator):
         adx = self._safe_iloc(df["adx"], -1)
         plus_di = self._safe_iloc(df["adx_pos"], -1)
         minus_di = self._safe_iloc(df["adx_neg"], -1)
+        return self._evaluate(adx, plus_di, minus_di)
 
+    def _evaluate(self, adx, plus_di, minus_di) -> "IndicatorResult":
         if any(v is None for v in [adx, plus_di, minus_di]):
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -51,3 +59,84 @@ class ADXIndicator(Indicator):
             signal, adx,
             plus_di=plus_di, minus_di=minus_di, strength=strength,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        adx = self._column(df, "adx")
+        plus_di = self._column(df, "adx_pos")
+        minus_di = self._column(df, "adx_neg")
+        valid = ~(np.isnan(adx) | np.isnan(plus_di) | np.isnan(minus_di))
+
+        directional = np.where(
+            plus_di > minus_di,
+            SIGNAL_CODES[Signal.BULLISH],
+            SIGNAL_CODES[Signal.BEARISH],
+        )
+        signals = np.where(adx < 20, SIGNAL_CODES[Signal.NEUTRAL], directional)
+        strength = np.select(
+            [adx > 25, adx < 20], ["strong", "weak"], "moderate",
+        ).astype(object)
+
+        return self._make_series(
+            signals, adx, valid,
+            plus_di=plus_di, minus_di=minus_di, strength=strength,
+        )
+
+    def reset(self) -> None:
+        self._bars = 0
+        self._prev = None
+        # Wilder sums of true range and +DM/-DM, seeded over the first window
+        self._trs = 0.0
+        self._dip = 0.0
+        self._din = 0.0
+        self._initial_dx: list[float] = []
+        self._adx = 0.0
+        self._plus_di = 0.0
+        self._minus_di = 0.0
+
+    def _advance(self, bar) -> None:
+        # Mirrors ta.trend.ADXIndicator step by step, including its warm-up
+        w = self.window
+        b = self._bars
+        self._bars += 1
+        prev, self._prev = self._prev, bar
+        if prev is None:
+            return
+
+        tr = max(bar.high, prev.close) - min(bar.low, prev.close)
+        up = bar.high - prev.high
+        down = prev.low - bar.low
+        pos = up if up > down and up > 0 else 0.0
+        neg = down if down > up and down > 0 else 0.0
+
+        if b <= w:
+            self._trs += tr
+            self._dip += pos
+            self._din += neg
+            if b < w:
+                return
+        else:
+            self._trs = self._trs - (self._trs / float(w)) + tr
+            self._dip = self._dip - (self._dip / float(w)) + pos
+            self._din = self._din - (self._din / float(w)) + neg
+
+        plus_di = 100 * (self._dip / self._trs) if self._trs != 0 else 0.0
+        minus_di = 100 * (self._din / self._trs) if self._trs != 0 else 0.0
+        if b > w:
+            # ta reports +DI/-DI as 0 on the seeding bar
+            self._plus_di, self._minus_di = plus_di, minus_di
+        if plus_di + minus_di != 0:
+            dx = 100 * abs((plus_di - minus_di) / (plus_di + minus_di))
+        else:
+            dx = 0.0
+
+        if b < 2 * w - 1:
+            self._initial_dx.append(dx)
+        elif b == 2 * w - 1:
+            self._initial_dx.append(dx)
+            self._adx = float(np.mean(self._initial_dx))
+        else:
+            self._adx = ((self._adx * (w - 1)) + dx) / float(w)
+
+    def _current(self) -> "IndicatorResult":
+        # Like the ta columns, ADX and +DI/-DI read 0 during the warm-up
+        return self._evaluate(self._adx, self._plus_di, self._minus_di)
@@ -2,37 +2,161 @@
 
 from __future__ import annotations
 
+import math
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from enum import Enum
 
+import numpy as np
 import pandas as pd
 
-from src.core.enums import Signal
-from src.core.models import IndicatorResult
+from src.core.bars import OHLCV_FIELDS, BarSeries
+from src.core.enums import SIGNAL_CODES, Signal
+from src.core.models import OHLCV, IndicatorResult, IndicatorSeries
 
+UNDEFINED_CODE = SIGNAL_CODES[Signal.UNDEFINED]
 
-class Indicator(ABC):
-    """Base class for all technical indicators.
 
-    Each indicator must:
-    1. Enrich the DataFrame with computed columns (via `compute`)
-    2. Analyze the latest data and return an IndicatorResult (via `analyze`)
+class Computation(ABC):
+    """A node of the indicator graph: derives columns from other columns.
+
+    `inputs` lists the columns `compute` reads (OHLCV fields or outputs of
+    other nodes) and `outputs` the columns it writes; `IndicatorGraph` uses
+    them to order the nodes, share intermediates and skip fresh columns.
+    Nodes without outputs are always run.
     """
 
+    inputs: tuple[str, ...] = OHLCV_FIELDS
+
     @property
     @abstractmethod
     def name(self) -> str:
-        """Unique identifier for this indicator."""
+        """Unique identifier for this node."""
+
+    @property
+    def outputs(self) -> tuple[str, ...]:
+        return ()
+
+    @property
+    def signature(self) -> str:
+        """Identifies the parameters (and data) the outputs were computed with.
+
+        Public attributes must be plain values (numbers, strings, enums and
+        containers of them) or data holders exposing a `content_token`, so
+        the signature is the same in every process and changes with the data.
+        """
+        params = {
+            k: _signature_value(self, k, v) for k, v in vars(self).items()
+            if not k.startswith("_") and not callable(v)
+        }
+        return f"{type(self).__name__}{sorted(params.items())!r}"
 
     @abstractmethod
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add indicator columns to the DataFrame. Must be idempotent."""
+        """Add the output columns to the DataFrame. Must be idempotent."""
+
+    @staticmethod
+    def _column(df: pd.DataFrame | BarSeries, name: str) -> np.ndarray:
+        """Return a DataFrame column as a float array."""
+        return np.asarray(df[name], dtype=float)
+
+    @staticmethod
+    def _input(df: pd.DataFrame | BarSeries, name: str) -> pd.Series:
+        """Column as a pandas Series, as expected by `ta` and pandas code."""
+        if isinstance(df, BarSeries):
+            return df.series(name)
+        return df[name]
+
+
+def _signature_value(node: Computation, key: str, value):
+    if value is None or isinstance(value, (bool, int, float, str, Enum, np.number)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_signature_value(node, key, v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _signature_value(node, key, v)) for k, v in value.items()))
+    token = getattr(value, "content_token", None)
+    if token is not None:
+        return (type(value).__name__, token)
+    raise TypeError(
+        f"{type(node).__name__}.{key}: {type(value).__name__} has no content_token; "
+        f"expose one or keep the attribute private"
+    )
+
+
+class Indicator(Computation):
+    """Base class for all technical indicators.
+
+    Each indicator must:
+    1. Enrich the DataFrame with computed columns (via `compute`)
+    2. Analyze the latest data and return an IndicatorResult (via `analyze`)
+
+    Both also accept a `BarSeries`: inputs are read with `_input` (or
+    `_column`) and outputs assigned by name, so a plugin runs unchanged on
+    either container.
+
+    Indicators may also override `analyze_series` to produce the signal of
+    every bar in a single NumPy pass (used by vectorized backtests), and
+    implement `reset` / `_advance` / `_current` to support O(1) streaming
+    updates via `seed` + `update`.
+    """
 
     @abstractmethod
     def analyze(self, df: pd.DataFrame) -> IndicatorResult:
         """Analyze the latest row(s) and return a signal."""
 
-    def _safe_iloc(self, series: pd.Series, index: int, default=None):
-        """Safely access a series by iloc index."""
+    def analyze_series(self, df: pd.DataFrame) -> IndicatorSeries:
+        """Analyze every bar of an already computed DataFrame.
+
+        Bar i of the result matches `analyze(df.iloc[:i + 1])`. This default
+        falls back to one `analyze` call per bar; plugins override it with a
+        vectorized implementation.
+        """
+        results = [self.analyze(df.iloc[:i + 1]) for i in range(len(df))]
+        keys = {key for r in results for key in r.metadata}
+        return IndicatorSeries(
+            name=self.name,
+            signals=np.array([SIGNAL_CODES[r.signal] for r in results], dtype=np.int8),
+            values=np.array([r.value for r in results], dtype=float),
+            metadata={
+                key: np.array([r.metadata.get(key) for r in results], dtype=object)
+                for key in keys
+            },
+        )
+
+    @property
+    def supports_streaming(self) -> bool:
+        return type(self)._advance is not Indicator._advance
+
+    def seed(self, df: pd.DataFrame) -> None:
+        """Initialise the streaming state from historical OHLCV data."""
+        self.reset()
+        for bar in iter_bars(df):
+            self._advance(bar)
+
+    def update(self, bar: OHLCV) -> IndicatorResult:
+        """Advance the streaming state by one closed bar and analyze it."""
+        self._advance(bar)
+        return self._current()
+
+    def reset(self) -> None:
+        """Clear the streaming state."""
+
+    def _advance(self, bar: OHLCV) -> None:
+        """Fold one bar into the streaming state in constant time."""
+        raise NotImplementedError(f"{self.name} does not support streaming updates")
+
+    def _current(self) -> IndicatorResult:
+        """Analyze the streaming state (same result as `analyze`)."""
+        raise NotImplementedError(f"{self.name} does not support streaming updates")
+
+    def _safe_iloc(self, series: pd.Series | np.ndarray, index: int, default=None):
+        """Safely access a series (or BarSeries column) by iloc index."""
+        if isinstance(series, np.ndarray):
+            if not -len(series) <= index < len(series):
+                return default
+            val = series[index]
+            return default if val != val else val
         try:
             val = series.iloc[index]
             if pd.isna(val):
@@ -50,3 +174,40 @@ class Indicator(ABC):
             value=value,
             metadata=metadata,
         )
+
+    @staticmethod
+    def _none_if_nan(value: float):
+        """Streaming counterpart of `_safe_iloc`: missing values become None."""
+        if value is None or math.isnan(value):
+            return None
+        return value
+
+    @staticmethod
+    def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+        """Shift an array forward by `periods` bars, padding with NaN."""
+        shifted = np.full(len(values), np.nan)
+        if periods < len(values):
+            shifted[periods:] = values[:len(values) - periods]
+        return shifted
+
+    def _make_series(
+        self,
+        signals: np.ndarray,
+        values: np.ndarray,
+        valid: np.ndarray,
+        **metadata,
+    ) -> IndicatorSeries:
+        """Build an IndicatorSeries, marking invalid bars as UNDEFINED."""
+        return IndicatorSeries(
+            name=self.name,
+            signals=np.where(valid, signals, UNDEFINED_CODE).astype(np.int8),
+            values=np.where(valid, values, 0.0),
+            metadata=metadata,
+        )
+
+
+def iter_bars(df: pd.DataFrame) -> Iterator[OHLCV]:
+    """Iterate over the rows of an OHLCV DataFrame as OHLCV bars."""
+    columns = df[["open", "high", "low", "close", "volume"]]
+    for timestamp, o, h, l, c, v in columns.itertuples(name=None):
+        yield OHLCV(timestamp=timestamp, open=o, high=h, low=l, close=c, volume=v)
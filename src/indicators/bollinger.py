@@ -2,26 +2,33 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import RollingWindow
 
 
 class BollingerIndicator(Indicator):
     """Bollinger Bands with overbought/oversold and volatility analysis."""
 
     name = "bollinger"
+    inputs = ("close",)
+    outputs = ("bol_high", "bol_low", "bol_medium", "bol_gap")
 
     def __init__(self, window: int = 20, window_dev: int = 2):
         self.window = window
         self.window_dev = window_dev
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         bb = ta.volatility.BollingerBands(
-            close=df["close"], window=self.window, window_dev=self.window_dev
+            close=self._input(df, "close"),
+            window=self.window,
+            window_dev=self.window_dev,
         )
         df["bol_high"] = bb.bollinger_hband()
         df["bol_low"] = bb.bollinger_lband()
@@ -34,7 +41,9 @@ class BollingerIndicator(Indicator):
         high = self._safe_iloc(df["bol_high"], -1)
         low = self._safe_iloc(df["bol_low"], -1)
         avg = self._safe_iloc(df["bol_medium"], -1)
+        return self._evaluate(close, high, low, avg)
 
+    def _evaluate(self, close, high, low, avg) -> "IndicatorResult":
         if any(v is None for v in [close, high, low, avg]):
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -55,3 +64,47 @@ class BollingerIndicator(Indicator):
             upper=high, lower=low, middle=avg,
             volatility_pct=volatility_pct,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        close = self._column(df, "close")
+        high = self._column(df, "bol_high")
+        low = self._column(df, "bol_low")
+        avg = self._column(df, "bol_medium")
+        valid = ~(np.isnan(close) | np.isnan(high) | np.isnan(low) | np.isnan(avg))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volatility_pct = np.where(close != 0, (high - low) / close * 100, 0.0)
+
+        signals = np.select(
+            [close > high, close < low, close > avg],
+            [
+                SIGNAL_CODES[Signal.OVERBOUGHT],
+                SIGNAL_CODES[Signal.OVERSOLD],
+                SIGNAL_CODES[Signal.BULLISH],
+            ],
+            SIGNAL_CODES[Signal.BEARISH],
+        )
+
+        return self._make_series(
+            signals, close, valid,
+            upper=high, lower=low, middle=avg,
+            volatility_pct=volatility_pct,
+        )
+
+    def reset(self) -> None:
+        self._closes = RollingWindow(self.window)
+        self._close = np.nan
+
+    def _advance(self, bar) -> None:
+        self._closes.update(bar.close)
+        self._close = bar.close
+
+    def _current(self) -> "IndicatorResult":
+        avg = self._closes.mean
+        band = self.window_dev * self._closes.std
+        return self._evaluate(
+            self._none_if_nan(self._close),
+            self._none_if_nan(avg + band),
+            self._none_if_nan(avg - band),
+            self._none_if_nan(avg),
+        )
@@ -0,0 +1,130 @@
+"""Compute cache - memoized IndicatorEngine.compute_all on unchanged candles."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.core.bars import OHLCV_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Shallow copies are only isolated under copy-on-write, always on from pandas 3
+_DEEP_COPY = int(pd.__version__.split(".")[0]) < 3
+
+
+@dataclass
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+def data_fingerprint(
+    df: pd.DataFrame, symbol: str | None = None, timeframe: str | None = None,
+) -> tuple:
+    """(symbol, timeframe, last timestamp, row count, content hash) of candles.
+
+    The hash covers the index and the OHLCV columns only, so a frame that
+    already carries indicator columns matches its raw counterpart.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex):
+        hasher.update(np.ascontiguousarray(index.as_unit("ns").asi8))
+    else:
+        hasher.update(pd.util.hash_pandas_object(index).to_numpy())
+    for name in OHLCV_FIELDS:
+        if name in df.columns:
+            hasher.update(name.encode())
+            hasher.update(np.ascontiguousarray(df[name].to_numpy(dtype=float)))
+    last = index[-1] if len(index) else None
+    return (symbol, timeframe, last, len(df), hasher.hexdigest())
+
+
+class ComputeCache:
+    """LRU of enriched DataFrames, bounded by their memory footprint.
+
+    Keys are a data fingerprint (see `data_fingerprint`) plus the name and
+    parameters of every node of the indicator graph, so a new bar, edited
+    candles or re-parameterized indicators all miss. The least recently used
+    entries are evicted once the stored frames exceed `max_bytes`; a frame
+    larger than the whole budget is not stored.
+
+    Frames are stored and returned as shallow copies: with pandas
+    copy-on-write (pandas >= 3) neither the caller nor the cache sees the
+    other's later changes. Older pandas get deep copies instead.
+
+    Usage:
+        engine = IndicatorEngine.default(cache=ComputeCache(max_bytes=64 << 20))
+        df = engine.compute_all(df, symbol="BTCUSDT", timeframe="daily")
+        print(engine.cache.info())
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return entry[0].copy(deep=_DEEP_COPY)
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> None:
+        size = int(df.memory_usage(index=True, deep=False).sum())
+        if size > self.max_bytes:
+            logger.debug("Not caching %d-byte frame (budget %d)", size, self.max_bytes)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (df.copy(deep=_DEEP_COPY), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+
+# Process-wide instance for engines that recompute the same history
+compute_cache = ComputeCache()
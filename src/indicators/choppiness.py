@@ -5,28 +5,36 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import RollingExtreme, RollingWindow
+from .true_range import true_range
 
 
 class ChoppinessIndicator(Indicator):
     """Choppiness Index - measures whether market is trending or ranging."""
 
     name = "choppiness"
+    inputs = ("high", "low", "true_range")
+    outputs = ("chop",)
 
     def __init__(self, window: int = 14):
         self.window = window
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        tr1 = df["high"] - df["low"]
-        tr2 = (df["high"] - df["close"].shift(1)).abs()
-        tr3 = (df["low"] - df["close"].shift(1)).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        high = self._input(df, "high")
+        low = self._input(df, "low")
+        # Shared column when run by the engine, computed here otherwise
+        if "true_range" in df.columns:
+            tr = self._input(df, "true_range")
+        else:
+            tr = true_range(high, low, self._input(df, "close"))
         atr = tr.rolling(1).mean()
 
-        high_max = df["high"].rolling(self.window).max()
-        low_min = df["low"].rolling(self.window).min()
+        high_max = high.rolling(self.window).max()
+        low_min = low.rolling(self.window).min()
 
         denominator = high_max - low_min
         denominator = denominator.replace(0, np.nan)
@@ -39,7 +47,9 @@ class ChoppinessIndicator(Indicator):
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
-        chop = self._safe_iloc(df["chop"], -1)
+        return self._evaluate(self._safe_iloc(df["chop"], -1))
+
+    def _evaluate(self, chop) -> "IndicatorResult":
         if chop is None:
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -55,3 +65,47 @@ class ChoppinessIndicator(Indicator):
             state = "transitioning"
 
         return self._make_result(signal, chop, state=state)
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        chop = self._column(df, "chop")
+        valid = ~np.isnan(chop)
+
+        signals = np.where(
+            chop < 38.2, SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.NEUTRAL],
+        )
+        state = np.select(
+            [chop > 61.8, chop < 38.2], ["ranging", "trending"], "transitioning",
+        ).astype(object)
+
+        return self._make_series(signals, chop, valid, state=state)
+
+    def reset(self) -> None:
+        self._true_range = RollingWindow(self.window)
+        self._highest = RollingExtreme(self.window, "max")
+        self._lowest = RollingExtreme(self.window, "min")
+        self._prev_close = np.nan
+        self._chop = np.nan
+
+    def _advance(self, bar) -> None:
+        tr = np.nanmax([
+            bar.high - bar.low,
+            abs(bar.high - self._prev_close),
+            abs(bar.low - self._prev_close),
+        ])
+        self._prev_close = bar.close
+        self._true_range.update(tr)
+        self._highest.update(bar.high)
+        self._lowest.update(bar.low)
+
+        denominator = self._highest.value - self._lowest.value
+        if denominator == 0 or np.isnan(denominator):
+            self._chop = np.nan
+        else:
+            self._chop = (
+                100
+                * np.log10(self._true_range.sum / denominator)
+                / np.log10(self.window)
+            )
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate(self._none_if_nan(self._chop))
@@ -2,36 +2,45 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import EWM
 
 
 class EMAIndicator(Indicator):
     """EMA with trend detection based on ordering of multiple EMAs."""
 
     name = "ema"
+    inputs = ("close",)
 
     def __init__(self, windows: list[int] | None = None):
         self.windows = windows or [5, 10, 20, 50]
+        self.reset()
+
+    @property
+    def outputs(self) -> tuple[str, ...]:
+        return tuple(f"ema{w}" for w in self.windows)
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         for w in self.windows:
             df[f"ema{w}"] = ta.trend.EMAIndicator(
-                close=df["close"], window=w
+                close=self._input(df, "close"), window=w
             ).ema_indicator()
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
-        emas = []
-        for w in self.windows:
-            val = self._safe_iloc(df[f"ema{w}"], -1)
-            if val is None:
-                return self._make_result(Signal.UNDEFINED, 0.0)
-            emas.append(val)
+        return self._evaluate(
+            [self._safe_iloc(df[f"ema{w}"], -1) for w in self.windows]
+        )
+
+    def _evaluate(self, emas: list) -> "IndicatorResult":
+        if any(val is None for val in emas):
+            return self._make_result(Signal.UNDEFINED, 0.0)
 
         # Bullish: short EMAs > long EMAs (perfectly ordered)
         if all(emas[i] > emas[i + 1] for i in range(len(emas) - 1)):
@@ -44,3 +53,27 @@ class EMAIndicator(Indicator):
 
         metadata = {f"ema{w}": v for w, v in zip(self.windows, emas)}
         return self._make_result(signal, emas[0], **metadata)
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        emas = np.vstack([self._column(df, f"ema{w}") for w in self.windows])
+        valid = ~np.isnan(emas).any(axis=0)
+
+        ordered = np.all(emas[:-1] > emas[1:], axis=0)
+        signals = np.select(
+            [ordered, emas[-1] > emas[0]],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.BEARISH]],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        metadata = {f"ema{w}": emas[k] for k, w in enumerate(self.windows)}
+        return self._make_series(signals, emas[0], valid, **metadata)
+
+    def reset(self) -> None:
+        self._emas = [EWM.from_span(w) for w in self.windows]
+
+    def _advance(self, bar) -> None:
+        for ema in self._emas:
+            ema.update(bar.close)
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate([self._none_if_nan(ema.value) for ema in self._emas])
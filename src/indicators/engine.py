@@ -6,9 +6,13 @@ import logging
 
 import pandas as pd
 
-from src.core.models import IndicatorResult
+from src.core.models import OHLCV, IndicatorResult, IndicatorSeries
+from src.core.tracing import tracer
+from src.data.sentiment import SentimentStore
 
-from .base import Indicator
+from .base import Indicator, iter_bars
+from .cache import ComputeCache, data_fingerprint
+from .graph import IndicatorGraph
 from .adi import ADIIndicator
 from .adx import ADXIndicator
 from .bollinger import BollingerIndicator
@@ -33,10 +37,26 @@ class IndicatorEngine:
         engine = IndicatorEngine.default()
         df = engine.compute_all(df)
         results = engine.analyze_all(df)
+
+        # Vectorized: the results of every bar in one pass
+        series = engine.analyze_series_all(df)
+
+        # Streaming: seed once, then O(1) per closed bar, no DataFrame
+        engine.seed_all(df)
+        results = engine.update_all(bar)
+
+    With a `ComputeCache`, `compute_all` on candles it has already enriched
+    returns the stored result instead of recomputing.
     """
 
-    def __init__(self, indicators: list[Indicator] | None = None):
+    def __init__(
+        self,
+        indicators: list[Indicator] | None = None,
+        cache: ComputeCache | None = None,
+    ):
         self._indicators: dict[str, Indicator] = {}
+        self._graph: IndicatorGraph | None = None
+        self.cache = cache
         if indicators:
             for ind in indicators:
                 self.register(ind)
@@ -44,23 +64,54 @@ class IndicatorEngine:
     def register(self, indicator: Indicator) -> None:
         """Register an indicator plugin."""
         self._indicators[indicator.name] = indicator
+        self._graph = None
         logger.debug("Registered indicator: %s", indicator.name)
 
     def unregister(self, name: str) -> None:
         """Remove an indicator."""
         self._indicators.pop(name, None)
+        self._graph = None
 
     @property
     def names(self) -> list[str]:
         return list(self._indicators.keys())
 
-    def compute_all(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Run compute() for all registered indicators, enriching the DataFrame."""
-        for name, indicator in self._indicators.items():
-            try:
-                df = indicator.compute(df)
-            except Exception as e:
-                logger.error("Error computing indicator %s: %s", name, e)
+    @property
+    def graph(self) -> IndicatorGraph:
+        if self._graph is None:
+            self._graph = IndicatorGraph(list(self._indicators.values()))
+        return self._graph
+
+    def compute_all(
+        self,
+        df: pd.DataFrame,
+        force: bool = False,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+    ) -> pd.DataFrame:
+        """Run compute() for all registered indicators, enriching the DataFrame.
+
+        Indicators run in dependency order and shared intermediates once;
+        indicators whose columns are already fresh are skipped unless
+        `force` (see `IndicatorGraph`). With a cache, the result is memoized
+        under the fingerprint of the candles (`symbol` and `timeframe` only
+        label it); `force` recomputes and refreshes the entry. Use the
+        returned frame: on a hit `df` itself is left untouched.
+        """
+        graph = self.graph
+        if self.cache is None or not isinstance(df, pd.DataFrame) or df.empty:
+            return graph.compute(df, force)
+
+        key = (data_fingerprint(df, symbol, timeframe), graph.signature)
+        if not force:
+            cached = self.cache.get(key)
+            if cached is not None:
+                # Columns of the caller that no indicator writes
+                for column in df.columns.difference(cached.columns, sort=False):
+                    cached[column] = df[column]
+                return cached
+        df = graph.compute(df, force)
+        self.cache.put(key, df)
         return df
 
     def analyze_all(self, df: pd.DataFrame) -> list[IndicatorResult]:
@@ -68,12 +119,54 @@ class IndicatorEngine:
         results = []
         for name, indicator in self._indicators.items():
             try:
-                result = indicator.analyze(df)
+                with tracer.span("indicator.analyze", indicator=name):
+                    result = indicator.analyze(df)
                 results.append(result)
             except Exception as e:
                 logger.error("Error analyzing indicator %s: %s", name, e)
         return results
 
+    def analyze_series_all(self, df: pd.DataFrame) -> list[IndicatorSeries]:
+        """Run analyze_series() for all registered indicators (every bar at once)."""
+        results = []
+        for name, indicator in self._indicators.items():
+            try:
+                with tracer.span("indicator.analyze_series", indicator=name):
+                    results.append(indicator.analyze_series(df))
+            except Exception as e:
+                logger.error("Error analyzing indicator series %s: %s", name, e)
+        return results
+
+    def seed_all(self, df: pd.DataFrame) -> None:
+        """Initialise the streaming state of every indicator from history."""
+        streaming = self._streaming_indicators()
+        for indicator in streaming.values():
+            indicator.reset()
+        for bar in iter_bars(df):
+            for name, indicator in list(streaming.items()):
+                try:
+                    indicator._advance(bar)
+                except Exception as e:
+                    logger.error("Error seeding indicator %s: %s", name, e)
+                    streaming.pop(name)
+
+    def update_all(self, bar: OHLCV) -> list[IndicatorResult]:
+        """Advance every streaming indicator by one closed bar."""
+        results = []
+        for name, indicator in self._streaming_indicators().items():
+            try:
+                results.append(indicator.update(bar))
+            except Exception as e:
+                logger.error("Error updating indicator %s: %s", name, e)
+        return results
+
+    def _streaming_indicators(self) -> dict[str, Indicator]:
+        return {
+            name: indicator
+            for name, indicator in self._indicators.items()
+            if indicator.supports_streaming
+        }
+
     def analyze_by_name(self, name: str, df: pd.DataFrame) -> IndicatorResult | None:
         """Analyze a single indicator by name."""
         indicator = self._indicators.get(name)
@@ -82,15 +175,23 @@ class IndicatorEngine:
         return indicator.analyze(df)
 
     @classmethod
-    def default(cls) -> IndicatorEngine:
-        """Create an engine with all default indicators registered."""
-        return cls(indicators=[
+    def default(
+        cls,
+        sentiment: SentimentStore | None = None,
+        cache: ComputeCache | None = None,
+    ) -> IndicatorEngine:
+        """Create an engine with all default indicators registered.
+
+        With a `sentiment` store, external indicators read their historical
+        series from it instead of calling the network (backtests).
+        """
+        return cls(cache=cache, indicators=[
             ADIIndicator(),
             ADXIndicator(),
             BollingerIndicator(),
             ChoppinessIndicator(),
             EMAIndicator(),
-            FearAndGreedIndicator(),
+            FearAndGreedIndicator(history=sentiment),
             FibonacciIndicator(),
             MACDIndicator(),
             RSIIndicator(),
@@ -101,9 +202,9 @@ class IndicatorEngine:
         ])
 
     @classmethod
-    def fast(cls) -> IndicatorEngine:
+    def fast(cls, cache: ComputeCache | None = None) -> IndicatorEngine:
         """Create an engine with only fast indicators (no external API calls)."""
-        return cls(indicators=[
+        return cls(cache=cache, indicators=[
             ADIIndicator(),
             ADXIndicator(),
             BollingerIndicator(),
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
+from src.data.sentiment import SentimentStore
+from src.data.signal_cache import external_signals
 
 from .base import Indicator
 
@@ -28,17 +31,49 @@ def fetch_fear_and_greed_index() -> int | None:
         return None
 
 
+# The index is published once a day: refresh hourly, serve stale meanwhile
+external_signals.register(
+    "fear_and_greed", lambda: fetch_fear_and_greed_index(), ttl=3600,
+)
+
+
+def get_fear_and_greed_index() -> int | None:
+    """Cached Fear & Greed Index (see `ExternalSignalCache`)."""
+    return external_signals.get("fear_and_greed")
+
+
 class FearAndGreedIndicator(Indicator):
-    """Bitcoin Fear & Greed Index analysis."""
+    """Bitcoin Fear & Greed Index analysis.
+
+    Live, the current index is fetched (cached). Given a `SentimentStore`
+    holding a "fear_and_greed" series, `compute` writes the historical value
+    of every bar in a `fear_and_greed` column and the analysis reads it back
+    instead, without any network call - this is what makes the default
+    engine backtestable.
+    """
 
     name = "fear_and_greed"
+    inputs = ()  # aligned on the bar timestamps only
+
+    def __init__(self, history: SentimentStore | None = None):
+        self.history = history
+        self.reset()
+
+    @property
+    def outputs(self) -> tuple[str, ...]:
+        return ("fear_and_greed",) if self.history is not None else ()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        # External indicator - no DataFrame enrichment needed
+        if self.history is not None:
+            df["fear_and_greed"] = self.history.align("fear_and_greed", df.index)
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
-        index_value = fetch_fear_and_greed_index()
+        if "fear_and_greed" in df.columns:
+            return self._evaluate(self._safe_iloc(df["fear_and_greed"], -1))
+        return self._evaluate(get_fear_and_greed_index())
+
+    def _evaluate(self, index_value) -> "IndicatorResult":
         if index_value is None:
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -61,3 +96,40 @@ class FearAndGreedIndicator(Indicator):
         return self._make_result(
             signal, float(index_value), sentiment=sentiment,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        if "fear_and_greed" in df.columns:
+            values = self._column(df, "fear_and_greed")
+        else:
+            # Only the current index is available: fetch it once and broadcast
+            # it, which is what a per-bar analyze() loop would see anyway.
+            index_value = get_fear_and_greed_index()
+            values = np.full(len(df), np.nan if index_value is None else float(index_value))
+        valid = ~np.isnan(values)
+
+        signals = np.select(
+            [values < 40, values < 60],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.NEUTRAL]],
+            SIGNAL_CODES[Signal.BEARISH],
+        )
+        sentiment = np.select(
+            [values < 20, values < 40, values < 60, values < 80],
+            ["extreme_fear", "fear", "neutral", "greed"],
+            "extreme_greed",
+        ).astype(object)
+
+        return self._make_series(signals, values, valid, sentiment=sentiment)
+
+    def reset(self) -> None:
+        self._timestamp = None
+
+    def _advance(self, bar) -> None:
+        # External index: only the bar time matters, for historical lookups
+        self._timestamp = bar.timestamp
+
+    def _current(self) -> "IndicatorResult":
+        if self.history is not None:
+            if self._timestamp is None:
+                return self._evaluate(None)
+            return self._evaluate(self.history.value_at("fear_and_greed", self._timestamp))
+        return self._evaluate(get_fear_and_greed_index())
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
 
@@ -13,16 +14,25 @@ class FibonacciIndicator(Indicator):
     """Fibonacci retracement and extension levels."""
 
     name = "fibonacci"
+    inputs = ("close",)
+
+    def __init__(self):
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         # Fibonacci levels are computed on-the-fly in analyze()
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
-        price_max = df["close"].max()
-        price_min = df["close"].min()
-        current = self._safe_iloc(df["close"], -1)
+        close = self._column(df, "close")
+        if not len(close):
+            return self._evaluate(None, None, None)
+        price_max = np.nanmax(close)
+        price_min = np.nanmin(close)
+        current = self._safe_iloc(close, -1)
+        return self._evaluate(price_max, price_min, current)
 
+    def _evaluate(self, price_max, price_min, current) -> "IndicatorResult":
         if any(v is None for v in [price_max, price_min, current]):
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -54,3 +64,54 @@ class FibonacciIndicator(Indicator):
             retracement_levels=levels,
             extension_levels=extensions,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        current = self._column(df, "close")
+        # Running extremes: bar i only sees the closes up to itself
+        price_max = np.fmax.accumulate(current)
+        price_min = np.fmin.accumulate(current)
+        valid = ~np.isnan(current)
+
+        diff = price_max - price_min
+        levels = {
+            "0%": price_max,
+            "23.6%": price_max - diff * 0.236,
+            "38.2%": price_max - diff * 0.382,
+            "50%": price_max - diff * 0.5,
+            "61.8%": price_max - diff * 0.618,
+            "100%": price_min,
+        }
+        extensions = {
+            "161.8%": price_max + diff * 0.618,
+            "261.8%": price_max + diff * 1.618,
+        }
+
+        mid = levels["50%"]
+        signals = np.select(
+            [current > mid, current < mid],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.BEARISH]],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        return self._make_series(
+            signals, current, valid,
+            retracement_levels=levels,
+            extension_levels=extensions,
+        )
+
+    def reset(self) -> None:
+        self._max = np.nan
+        self._min = np.nan
+        self._close = np.nan
+
+    def _advance(self, bar) -> None:
+        self._max = np.fmax(self._max, bar.close)
+        self._min = np.fmin(self._min, bar.close)
+        self._close = bar.close
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate(
+            self._none_if_nan(self._max),
+            self._none_if_nan(self._min),
+            self._none_if_nan(self._close),
+        )
@@ -0,0 +1,179 @@
+"""Indicator graph - dependency-ordered compute with shared intermediates."""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.core.bars import OHLCV_FIELDS, BarSeries
+from src.core.tracing import tracer
+
+from .base import Computation
+from .true_range import TrueRange
+
+logger = logging.getLogger(__name__)
+
+# df.attrs / BarSeries.attrs key: {column: (node signature, data token)}
+COLUMN_STAMPS = "indicator_columns"
+
+
+class _ColumnStamps(dict):
+    """Stamps are replaced, never mutated: pandas deep-copies `attrs` into
+    every derived object, so sharing them keeps that copy O(1)."""
+
+    def __deepcopy__(self, memo) -> _ColumnStamps:
+        return self
+
+
+def default_intermediates() -> list[Computation]:
+    """Shared nodes pulled into a graph when a plugin declares their outputs."""
+    return [TrueRange()]
+
+
+class IndicatorGraph:
+    """DAG of computation nodes built from their declared inputs/outputs.
+
+    Nodes run in dependency order (registration order otherwise); an
+    intermediate such as the true range is added once, whichever plugins
+    read it. Every column written is stamped with the signature of its
+    node and a token of the candles it saw (row count, last open and last
+    OHLCV row). A node whose outputs are already present, stamped by an
+    identical node and filled up to the last bar is skipped - unless one of
+    its inputs was recomputed in the same pass, or the frame still ends on
+    the stamped candle but its token changed (the last candle edited in
+    place, rows inserted or dropped). Slices of a computed frame stay
+    fresh; edits of earlier candles are not seen, use `force` after them.
+    """
+
+    def __init__(
+        self,
+        nodes: list[Computation],
+        intermediates: list[Computation] | None = None,
+    ):
+        if intermediates is None:
+            intermediates = default_intermediates()
+        self._nodes = self._resolve(list(nodes), intermediates)
+
+    @property
+    def order(self) -> list[str]:
+        return [node.name for node in self._nodes]
+
+    @property
+    def signature(self) -> tuple[tuple[str, str], ...]:
+        """(name, parameters) of every node, in compute order."""
+        return tuple((node.name, node.signature) for node in self._nodes)
+
+    def compute(self, df: pd.DataFrame, force: bool = False) -> pd.DataFrame:
+        """Run every stale node (all of them with `force`)."""
+        recomputed: set[str] = set()
+        token = _data_token(df)
+        for node in self._nodes:
+            outputs = node.outputs
+            if (
+                not force
+                and outputs
+                and recomputed.isdisjoint(node.inputs)
+                and _is_fresh(df, outputs, node.signature, token)
+            ):
+                continue
+            try:
+                with tracer.span("indicator.compute", indicator=node.name):
+                    df = node.compute(df)
+            except Exception as e:
+                logger.error("Error computing indicator %s: %s", node.name, e)
+                continue
+            _stamp(df, outputs, (node.signature, token))
+            recomputed.update(outputs)
+        return df
+
+    @staticmethod
+    def _resolve(
+        nodes: list[Computation], intermediates: list[Computation],
+    ) -> list[Computation]:
+        providers: dict[str, Computation] = {}
+        for node in nodes:
+            for column in node.outputs:
+                if column in providers:
+                    raise ValueError(
+                        f"Column {column} is written by both "
+                        f"{providers[column].name} and {node.name}"
+                    )
+                providers[column] = node
+
+        # Pull in the intermediates some node reads (transitively)
+        shared = {column: node for node in intermediates for column in node.outputs}
+        queue = list(nodes)
+        while queue:
+            for column in queue.pop().inputs:
+                if column not in providers and column in shared:
+                    intermediate = shared[column]
+                    for output in intermediate.outputs:
+                        providers[output] = intermediate
+                    nodes.insert(0, intermediate)
+                    queue.append(intermediate)
+
+        # Stable topological sort: earliest registered ready node first
+        ordered: list[Computation] = []
+        placed: set[int] = set()
+        remaining = nodes
+        while remaining:
+            for k, node in enumerate(remaining):
+                deps = {
+                    id(providers[c]) for c in node.inputs
+                    if c in providers and providers[c] is not node
+                }
+                if deps <= placed:
+                    ordered.append(node)
+                    placed.add(id(node))
+                    del remaining[k]
+                    break
+            else:
+                names = ", ".join(node.name for node in remaining)
+                raise ValueError(f"Indicator dependency cycle between: {names}")
+        return ordered
+
+
+def _data_token(df: pd.DataFrame | BarSeries) -> tuple:
+    """Row count, last open and last OHLCV row: appended or edited candles
+    at the end of the series change it."""
+    if not len(df):
+        return (0, None, b"")
+    columns = df.columns
+    last = np.array([_last(df, name) for name in OHLCV_FIELDS if name in columns], dtype=float)
+    # Bytes: a NaN compares equal to itself
+    return (len(df), df.index[-1], last.tobytes())
+
+
+def _is_fresh(
+    df: pd.DataFrame | BarSeries, outputs: tuple[str, ...], signature: str, token: tuple,
+) -> bool:
+    stamps = df.attrs.get(COLUMN_STAMPS, {})
+    columns = df.columns
+    for column in outputs:
+        stamp = stamps.get(column)
+        if column not in columns or stamp is None or stamp[0] != signature:
+            return False
+        if stamp[1][1] == token[1]:
+            # Same last candle as when computed: same rows, same values
+            if stamp[1] != token:
+                return False
+        # Rows appended after the last compute are still missing
+        elif len(df) and _last(df, column) != _last(df, column):
+            return False
+    return True
+
+
+def _last(df: pd.DataFrame | BarSeries, column: str) -> float:
+    values = df[column]
+    return values[-1] if isinstance(df, BarSeries) else values.iat[-1]
+
+
+def _stamp(df: pd.DataFrame | BarSeries, outputs: tuple[str, ...], stamp: tuple) -> None:
+    if not outputs:
+        return
+    # Copy: frames derived from `df` share the same stamps
+    stamps = _ColumnStamps(df.attrs.get(COLUMN_STAMPS, {}))
+    stamps.update(dict.fromkeys(outputs, stamp))
+    df.attrs[COLUMN_STAMPS] = stamps
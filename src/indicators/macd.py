@@ -2,27 +2,32 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import EWM, Lag
 
 
 class MACDIndicator(Indicator):
     """MACD with crossover and divergence detection."""
 
     name = "macd"
+    inputs = ("close",)
+    outputs = ("macd", "macd_signal", "macd_histo")
 
     def __init__(self, fast: int = 12, slow: int = 26, signal_window: int = 9):
         self.fast = fast
         self.slow = slow
         self.signal_window = signal_window
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         macd = ta.trend.MACD(
-            close=df["close"],
+            close=self._input(df, "close"),
             window_fast=self.fast,
             window_slow=self.slow,
             window_sign=self.signal_window,
@@ -38,7 +43,11 @@ class MACDIndicator(Indicator):
         prev_macd = self._safe_iloc(df["macd"], -2)
         prev_signal = self._safe_iloc(df["macd_signal"], -2)
         histogram = self._safe_iloc(df["macd_histo"], -1)
+        return self._evaluate(macd, signal_line, prev_macd, prev_signal, histogram)
 
+    def _evaluate(
+        self, macd, signal_line, prev_macd, prev_signal, histogram
+    ) -> "IndicatorResult":
         if any(v is None for v in [macd, signal_line, prev_macd, prev_signal]):
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -60,3 +69,56 @@ class MACDIndicator(Indicator):
             bullish_cross=bullish_cross,
             bearish_cross=bearish_cross,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        macd = self._column(df, "macd")
+        signal_line = self._column(df, "macd_signal")
+        histogram = self._column(df, "macd_histo")
+        prev_macd = self._shift(macd, 1)
+        prev_signal = self._shift(signal_line, 1)
+        valid = ~(
+            np.isnan(macd) | np.isnan(signal_line)
+            | np.isnan(prev_macd) | np.isnan(prev_signal)
+        )
+
+        bullish_cross = (prev_macd < prev_signal) & (macd > signal_line)
+        bearish_cross = (prev_macd > prev_signal) & (macd < signal_line)
+        signals = np.select(
+            [
+                (macd > 0) & (bullish_cross | (macd > signal_line)),
+                (macd < 0) & (bearish_cross | (macd < signal_line)),
+            ],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.BEARISH]],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        return self._make_series(
+            signals, macd, valid,
+            signal_line=signal_line,
+            histogram=histogram,
+            bullish_cross=bullish_cross,
+            bearish_cross=bearish_cross,
+        )
+
+    def reset(self) -> None:
+        self._fast = EWM.from_span(self.fast)
+        self._slow = EWM.from_span(self.slow)
+        self._signal = EWM.from_span(self.signal_window)
+        self._macd = Lag(1)
+        self._signal_line = Lag(1)
+
+    def _advance(self, bar) -> None:
+        macd = self._fast.update(bar.close) - self._slow.update(bar.close)
+        self._macd.update(macd)
+        self._signal_line.update(self._signal.update(macd))
+
+    def _current(self) -> "IndicatorResult":
+        macd = self._macd.current
+        signal_line = self._signal_line.current
+        return self._evaluate(
+            self._none_if_nan(macd),
+            self._none_if_nan(signal_line),
+            self._none_if_nan(self._macd.lagged),
+            self._none_if_nan(self._signal_line.lagged),
+            self._none_if_nan(macd - signal_line),
+        )
@@ -2,32 +2,39 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import EWM, Lag
 
 
 class RSIIndicator(Indicator):
     """RSI with overbought/oversold detection and divergence analysis."""
 
     name = "rsi"
+    inputs = ("close",)
+    outputs = ("rsi",)
 
     def __init__(self, window: int = 14):
         self.window = window
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         df["rsi"] = ta.momentum.RSIIndicator(
-            close=df["close"], window=self.window
+            close=self._input(df, "close"), window=self.window
         ).rsi()
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
         rsi = self._safe_iloc(df["rsi"], -1)
         prev_rsi = self._safe_iloc(df["rsi"], -3)
+        return self._evaluate(rsi, prev_rsi)
 
+    def _evaluate(self, rsi, prev_rsi) -> "IndicatorResult":
         if rsi is None or prev_rsi is None:
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -43,3 +50,52 @@ class RSIIndicator(Indicator):
             signal = Signal.NEUTRAL
 
         return self._make_result(signal, rsi, prev_rsi=prev_rsi)
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        rsi = self._column(df, "rsi")
+        prev_rsi = self._shift(rsi, 2)
+        valid = ~np.isnan(rsi) & ~np.isnan(prev_rsi)
+
+        signals = np.select(
+            [
+                rsi <= 30,
+                rsi >= 70,
+                (rsi > 50) & (rsi > prev_rsi),
+                (rsi < 50) & (rsi < prev_rsi),
+            ],
+            [
+                SIGNAL_CODES[Signal.OVERSOLD],
+                SIGNAL_CODES[Signal.OVERBOUGHT],
+                SIGNAL_CODES[Signal.BULLISH],
+                SIGNAL_CODES[Signal.BEARISH],
+            ],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        return self._make_series(signals, rsi, valid, prev_rsi=prev_rsi)
+
+    def reset(self) -> None:
+        # Wilder smoothing: ewm(alpha=1/window, adjust=False), as in ta
+        self._up = EWM(1 / self.window, self.window)
+        self._down = EWM(1 / self.window, self.window)
+        self._prev_close = np.nan
+        self._rsi = Lag(2)
+
+    def _advance(self, bar) -> None:
+        diff = bar.close - self._prev_close
+        up = self._up.update(diff if diff > 0 else 0.0)
+        down = self._down.update(-diff if diff < 0 else 0.0)
+        self._prev_close = bar.close
+        if np.isnan(down):
+            rsi = np.nan
+        elif down == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + up / down))
+        self._rsi.update(rsi)
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate(
+            self._none_if_nan(self._rsi.current),
+            self._none_if_nan(self._rsi.lagged),
+        )
@@ -2,36 +2,45 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import RollingWindow
 
 
 class SMAIndicator(Indicator):
     """SMA with golden/death cross detection."""
 
     name = "sma"
+    inputs = ("close",)
 
     def __init__(self, windows: list[int] | None = None):
         self.windows = windows or [50, 200]
+        self.reset()
+
+    @property
+    def outputs(self) -> tuple[str, ...]:
+        return tuple(f"sma{w}" for w in self.windows)
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         for w in self.windows:
             df[f"sma{w}"] = ta.trend.SMAIndicator(
-                close=df["close"], window=w
+                close=self._input(df, "close"), window=w
             ).sma_indicator()
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
-        smas = []
-        for w in self.windows:
-            val = self._safe_iloc(df[f"sma{w}"], -1)
-            if val is None:
-                return self._make_result(Signal.UNDEFINED, 0.0)
-            smas.append(val)
+        return self._evaluate(
+            [self._safe_iloc(df[f"sma{w}"], -1) for w in self.windows]
+        )
+
+    def _evaluate(self, smas: list) -> "IndicatorResult":
+        if any(val is None for val in smas):
+            return self._make_result(Signal.UNDEFINED, 0.0)
 
         # Golden cross: SMA50 > SMA200
         if all(smas[i] > smas[i + 1] for i in range(len(smas) - 1)):
@@ -44,3 +53,27 @@ class SMAIndicator(Indicator):
 
         metadata = {f"sma{w}": v for w, v in zip(self.windows, smas)}
         return self._make_result(signal, smas[0], **metadata)
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        smas = np.vstack([self._column(df, f"sma{w}") for w in self.windows])
+        valid = ~np.isnan(smas).any(axis=0)
+
+        ordered = np.all(smas[:-1] > smas[1:], axis=0)
+        signals = np.select(
+            [ordered, smas[-1] > smas[0]],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.BEARISH]],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        metadata = {f"sma{w}": smas[k] for k, w in enumerate(self.windows)}
+        return self._make_series(signals, smas[0], valid, **metadata)
+
+    def reset(self) -> None:
+        self._smas = [RollingWindow(w) for w in self.windows]
+
+    def _advance(self, bar) -> None:
+        for sma in self._smas:
+            sma.update(bar.close)
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate([self._none_if_nan(sma.mean) for sma in self._smas])
@@ -2,26 +2,33 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import ta
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import Lag, RollingExtreme, RollingWindow
 
 
 class StochasticRSIIndicator(Indicator):
     """Stochastic oscillator with overbought/oversold and divergence."""
 
     name = "stoch_rsi"
+    inputs = ("high", "low", "close")
+    outputs = ("stochastic", "stoch_signal")
 
     def __init__(self, window: int = 14, smooth_window: int = 3):
         self.window = window
         self.smooth_window = smooth_window
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
         stoch = ta.momentum.StochasticOscillator(
-            high=df["high"], low=df["low"], close=df["close"],
+            high=self._input(df, "high"),
+            low=self._input(df, "low"),
+            close=self._input(df, "close"),
             window=self.window, smooth_window=self.smooth_window,
         )
         df["stochastic"] = stoch.stoch()
@@ -33,7 +40,9 @@ class StochasticRSIIndicator(Indicator):
         orange = self._safe_iloc(df["stoch_signal"], -1)
         prev_blue = self._safe_iloc(df["stochastic"], -3)
         prev_orange = self._safe_iloc(df["stoch_signal"], -3)
+        return self._evaluate(blue, orange, prev_blue, prev_orange)
 
+    def _evaluate(self, blue, orange, prev_blue, prev_orange) -> "IndicatorResult":
         if any(v is None for v in [blue, orange, prev_blue, prev_orange]):
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -54,3 +63,63 @@ class StochasticRSIIndicator(Indicator):
             prev_blue=prev_blue,
             prev_orange=prev_orange,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        blue = self._column(df, "stochastic")
+        orange = self._column(df, "stoch_signal")
+        prev_blue = self._shift(blue, 2)
+        prev_orange = self._shift(orange, 2)
+        valid = ~(
+            np.isnan(blue) | np.isnan(orange)
+            | np.isnan(prev_blue) | np.isnan(prev_orange)
+        )
+
+        signals = np.select(
+            [
+                (blue <= 20) | (orange <= 20),
+                (blue >= 80) | (orange >= 80),
+                blue > orange,
+                blue < orange,
+            ],
+            [
+                SIGNAL_CODES[Signal.OVERSOLD],
+                SIGNAL_CODES[Signal.OVERBOUGHT],
+                SIGNAL_CODES[Signal.BULLISH],
+                SIGNAL_CODES[Signal.BEARISH],
+            ],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        return self._make_series(
+            signals, blue, valid,
+            signal_line=orange,
+            prev_blue=prev_blue,
+            prev_orange=prev_orange,
+        )
+
+    def reset(self) -> None:
+        self._lowest = RollingExtreme(self.window, "min")
+        self._highest = RollingExtreme(self.window, "max")
+        self._smooth = RollingWindow(self.smooth_window)
+        self._blue = Lag(2)
+        self._orange = Lag(2)
+
+    def _advance(self, bar) -> None:
+        self._lowest.update(bar.low)
+        self._highest.update(bar.high)
+        lowest, highest = self._lowest.value, self._highest.value
+        if highest - lowest > 0:
+            blue = 100 * (bar.close - lowest) / (highest - lowest)
+        else:
+            blue = np.nan
+        self._smooth.update(blue)
+        self._blue.update(blue)
+        self._orange.update(self._smooth.mean)
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate(
+            self._none_if_nan(self._blue.current),
+            self._none_if_nan(self._orange.current),
+            self._none_if_nan(self._blue.lagged),
+            self._none_if_nan(self._orange.lagged),
+        )
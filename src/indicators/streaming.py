@@ -0,0 +1,168 @@
+"""Constant-time building blocks for streaming indicator updates.
+
+Each primitive consumes one value per bar and mirrors the pandas operation
+used by the batch `compute()` (ewm with adjust=False, rolling windows with
+min_periods equal to the window), so seeded streaming state stays in line
+with a full recomputation.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class EWM:
+    """Recursive exponential moving average (pandas `adjust=False`)."""
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self._mean = math.nan
+        self._count = 0
+
+    @classmethod
+    def from_span(cls, span: int, min_periods: int | None = None) -> EWM:
+        return cls(2 / (span + 1), span if min_periods is None else min_periods)
+
+    def update(self, value: float) -> float:
+        if not math.isnan(value):
+            if self._count == 0:
+                self._mean = value
+            else:
+                self._mean = (1 - self.alpha) * self._mean + self.alpha * value
+            self._count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._mean if self._count >= max(self.min_periods, 1) else math.nan
+
+
+class RollingWindow:
+    """Fixed-size window keeping a running sum and sum of squares.
+
+    NaN values occupy a slot but are excluded from the statistics, like
+    pandas rolling aggregations. The running sums are recomputed exactly
+    from the window every `size` updates, so rounding errors do not pile
+    up; a window of identical values has that value as its exact mean and
+    a zero deviation, as in pandas.
+    """
+
+    def __init__(self, size: int, min_periods: int | None = None):
+        self.size = size
+        self.min_periods = size if min_periods is None else min_periods
+        self._values: deque[float] = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._count = 0
+        self._updates = 0
+        self._last = math.nan
+        self._same = 0  # trailing run of identical values
+
+    def update(self, value: float) -> None:
+        self._values.append(value)
+        if not math.isnan(value):
+            self._sum += value
+            self._sum_sq += value * value
+            self._count += 1
+            self._same = self._same + 1 if value == self._last else 1
+            self._last = value
+        if len(self._values) > self.size:
+            old = self._values.popleft()
+            if not math.isnan(old):
+                self._sum -= old
+                self._sum_sq -= old * old
+                self._count -= 1
+        self._updates += 1
+        if self._updates % self.size == 0:
+            valid = [v for v in self._values if not math.isnan(v)]
+            self._sum = math.fsum(valid)
+            self._sum_sq = math.fsum(v * v for v in valid)
+
+    @property
+    def _flat(self) -> bool:
+        return self._same >= self._count
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= max(self.min_periods, 1)
+
+    @property
+    def sum(self) -> float:
+        return self._sum if self.ready else math.nan
+
+    @property
+    def mean(self) -> float:
+        if not self.ready:
+            return math.nan
+        return self._last if self._flat else self._sum / self._count
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (ddof=0)."""
+        if not self.ready:
+            return math.nan
+        if self._flat:
+            return 0.0
+        mean = self._sum / self._count
+        return math.sqrt(max(self._sum_sq / self._count - mean * mean, 0.0))
+
+
+class RollingExtreme:
+    """Rolling max or min over a fixed window using a monotonic deque."""
+
+    def __init__(self, size: int, mode: str = "max"):
+        if mode not in ("max", "min"):
+            raise ValueError("mode must be 'max' or 'min'")
+        self.size = size
+        self._is_max = mode == "max"
+        self._candidates: deque[tuple[int, float]] = deque()
+        self._index = -1
+        self._valid: deque[bool] = deque()
+        self._count = 0
+
+    def update(self, value: float) -> None:
+        self._index += 1
+        is_valid = not math.isnan(value)
+        self._valid.append(is_valid)
+        self._count += is_valid
+        if len(self._valid) > self.size:
+            self._count -= self._valid.popleft()
+
+        if is_valid:
+            while self._candidates and (
+                self._candidates[-1][1] <= value if self._is_max
+                else self._candidates[-1][1] >= value
+            ):
+                self._candidates.pop()
+            self._candidates.append((self._index, value))
+        while self._candidates and self._candidates[0][0] <= self._index - self.size:
+            self._candidates.popleft()
+
+    @property
+    def value(self) -> float:
+        if self._count < self.size or not self._candidates:
+            return math.nan
+        return self._candidates[0][1]
+
+
+class Lag:
+    """Remembers the last `periods + 1` values to look back in O(1)."""
+
+    def __init__(self, periods: int):
+        self._values: deque[float] = deque(maxlen=periods + 1)
+
+    def update(self, value: float) -> None:
+        self._values.append(value)
+
+    @property
+    def current(self) -> float:
+        return self._values[-1] if self._values else math.nan
+
+    @property
+    def lagged(self) -> float:
+        """Value `periods` bars ago (NaN until enough bars were seen)."""
+        if len(self._values) < self._values.maxlen:
+            return math.nan
+        return self._values[0]
@@ -2,31 +2,39 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import RollingExtreme
 
 
 class SupportResistanceIndicator(Indicator):
     """Support/Resistance levels with breakout detection."""
 
     name = "support_resistance"
+    inputs = ("close",)
+    outputs = ("resistance", "support")
 
     def __init__(self, period: int = 20):
         self.period = period
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["resistance"] = df["close"].rolling(window=self.period).max().shift(1)
-        df["support"] = df["close"].rolling(window=self.period).min().shift(1)
+        close = self._input(df, "close")
+        df["resistance"] = close.rolling(window=self.period).max().shift(1)
+        df["support"] = close.rolling(window=self.period).min().shift(1)
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
         price = self._safe_iloc(df["close"], -1)
         support = self._safe_iloc(df["support"], -1)
         resistance = self._safe_iloc(df["resistance"], -1)
+        return self._evaluate(price, support, resistance)
 
+    def _evaluate(self, price, support, resistance) -> "IndicatorResult":
         if any(v is None for v in [price, support, resistance]):
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -40,3 +48,41 @@ class SupportResistanceIndicator(Indicator):
         return self._make_result(
             signal, price, support=support, resistance=resistance,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        price = self._column(df, "close")
+        support = self._column(df, "support")
+        resistance = self._column(df, "resistance")
+        valid = ~(np.isnan(price) | np.isnan(support) | np.isnan(resistance))
+
+        signals = np.select(
+            [price > resistance, price < support],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.BEARISH]],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        return self._make_series(
+            signals, price, valid, support=support, resistance=resistance,
+        )
+
+    def reset(self) -> None:
+        self._highest = RollingExtreme(self.period, "max")
+        self._lowest = RollingExtreme(self.period, "min")
+        self._price = np.nan
+        self._support = np.nan
+        self._resistance = np.nan
+
+    def _advance(self, bar) -> None:
+        # Levels come from the previous `period` closes (shift(1) in compute)
+        self._resistance = self._highest.value
+        self._support = self._lowest.value
+        self._highest.update(bar.close)
+        self._lowest.update(bar.close)
+        self._price = bar.close
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate(
+            self._none_if_nan(self._price),
+            self._none_if_nan(self._support),
+            self._none_if_nan(self._resistance),
+        )
@@ -0,0 +1,30 @@
+"""True range - intermediate column shared by range-based indicators."""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from .base import Computation
+
+
+def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    """max(high - low, |high - prev close|, |low - prev close|)."""
+    prev_close = close.shift(1)
+    tr1 = high - low
+    tr2 = (high - prev_close).abs()
+    tr3 = (low - prev_close).abs()
+    return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+
+class TrueRange(Computation):
+    """Graph node writing the `true_range` column."""
+
+    name = "true_range"
+    inputs = ("high", "low", "close")
+    outputs = ("true_range",)
+
+    def compute(self, df: pd.DataFrame) -> pd.DataFrame:
+        df["true_range"] = true_range(
+            self._input(df, "high"), self._input(df, "low"), self._input(df, "close"),
+        )
+        return df
@@ -2,32 +2,40 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
-from src.core.enums import Signal
+from src.core.enums import SIGNAL_CODES, Signal
 
 from .base import Indicator
+from .streaming import Lag, RollingWindow
 
 
 class VolumeIndicator(Indicator):
     """Volume analysis with whale activity detection."""
 
     name = "volume"
+    inputs = ("volume",)
+    outputs = ("volume_short_ma", "volume_long_ma")
 
     def __init__(self, short_window: int = 5, long_window: int = 14):
         self.short_window = short_window
         self.long_window = long_window
+        self.reset()
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["volume_short_ma"] = df["volume"].rolling(window=self.short_window).mean()
-        df["volume_long_ma"] = df["volume"].rolling(window=self.long_window).mean()
+        volume = self._input(df, "volume")
+        df["volume_short_ma"] = volume.rolling(window=self.short_window).mean()
+        df["volume_long_ma"] = volume.rolling(window=self.long_window).mean()
         return df
 
     def analyze(self, df: pd.DataFrame) -> "IndicatorResult":
         current_vol = self._safe_iloc(df["volume"], -1)
         prev_vol = self._safe_iloc(df["volume"], -2)
         long_ma = self._safe_iloc(df["volume_long_ma"], -1)
+        return self._evaluate(current_vol, prev_vol, long_ma)
 
+    def _evaluate(self, current_vol, prev_vol, long_ma) -> "IndicatorResult":
         if any(v is None for v in [current_vol, prev_vol, long_ma]):
             return self._make_result(Signal.UNDEFINED, 0.0)
 
@@ -48,3 +56,37 @@ class VolumeIndicator(Indicator):
             volume_change=vol_change,
             whale_activity=whale_activity,
         )
+
+    def analyze_series(self, df: pd.DataFrame) -> "IndicatorSeries":
+        current_vol = self._column(df, "volume")
+        prev_vol = self._shift(current_vol, 1)
+        long_ma = self._column(df, "volume_long_ma")
+        valid = ~(np.isnan(current_vol) | np.isnan(prev_vol) | np.isnan(long_ma))
+
+        signals = np.select(
+            [current_vol > long_ma, current_vol < long_ma],
+            [SIGNAL_CODES[Signal.BULLISH], SIGNAL_CODES[Signal.BEARISH]],
+            SIGNAL_CODES[Signal.NEUTRAL],
+        )
+
+        return self._make_series(
+            signals, current_vol, valid,
+            long_ma=long_ma,
+            volume_change=current_vol - prev_vol,
+            whale_activity=current_vol > 2 * long_ma,
+        )
+
+    def reset(self) -> None:
+        self._long = RollingWindow(self.long_window)
+        self._volume = Lag(1)
+
+    def _advance(self, bar) -> None:
+        self._long.update(bar.volume)
+        self._volume.update(bar.volume)
+
+    def _current(self) -> "IndicatorResult":
+        return self._evaluate(
+            self._none_if_nan(self._volume.current),
+            self._none_if_nan(self._volume.lagged),
+            self._none_if_nan(self._long.mean),
+        )
@@ -0,0 +1,2 @@
+from .scheduler import JobMetrics, LiveScheduler
+from .cycle import TradingCycle
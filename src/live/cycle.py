@@ -0,0 +1,104 @@
+"""Trading cycle - one analysis pass of the v2 stack for a (pair, timeframe)."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+import pandas as pd
+
+from src.core.config import Settings
+from src.core.enums import TimeFrame
+from src.core.models import PortfolioState, TradeSetup
+from src.core.tracing import tracer
+from src.data.provider import DataProvider
+from src.decision.engine import DecisionEngine
+from src.indicators.cache import ComputeCache
+from src.indicators.engine import IndicatorEngine
+from src.market.regime_detector import MarketRegimeDetector
+from src.portfolio.manager import PortfolioManager
+
+logger = logging.getLogger(__name__)
+
+
+class TradingCycle:
+    """Fetch -> indicators -> regime -> decision for one closed candle.
+
+    Instances are callables usable as `LiveScheduler` jobs. State that is
+    specific to a (pair, timeframe) - the portfolio snapshot - is kept per
+    key so a single cycle can serve every job.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        provider: DataProvider,
+        indicator_engine: IndicatorEngine | None = None,
+        on_setup: Callable[[TradeSetup, PortfolioState], None] | None = None,
+        start: str = "1 Jan, 2020",
+    ):
+        self.settings = settings
+        self.provider = provider
+        # Jobs of several timeframes may see the same candles between closes
+        self.indicator_engine = indicator_engine or IndicatorEngine.default(
+            cache=ComputeCache(max_bytes=64 << 20),
+        )
+        self.regime_detector = MarketRegimeDetector()
+        self.decision_engine = DecisionEngine(
+            risk_profile=list(settings.risk_profiles.values())[0],
+            protection=settings.trading.protection,
+        )
+        self.portfolio_manager = PortfolioManager(settings)
+        self.on_setup = on_setup
+        self.start = start
+        self._portfolios: dict[tuple[str, TimeFrame], PortfolioState] = {}
+
+    def portfolio(self, pair: str, timeframe: TimeFrame) -> PortfolioState:
+        key = (pair, timeframe)
+        if key not in self._portfolios:
+            self._portfolios[key] = PortfolioState(
+                fiat_amount=self.settings.trading.capital,
+                crypto_amount=0.0,
+                pair=pair,
+                current_price=0.0,
+            )
+        return self._portfolios[key]
+
+    def __call__(
+        self, pair: str, timeframe: TimeFrame, close_time: pd.Timestamp | None = None,
+    ) -> TradeSetup | None:
+        labels = {"pair": pair, "timeframe": timeframe.value}
+        with tracer.profile(f"cycle-{pair}-{timeframe.value}"), \
+                tracer.span("cycle", **labels):
+            return self._run(pair, timeframe, labels)
+
+    def _run(self, pair: str, timeframe: TimeFrame, labels: dict) -> TradeSetup | None:
+        with tracer.span("cycle.fetch", **labels):
+            df = self.provider.fetch_ohlcv(pair, timeframe, self.start)
+        if df.empty:
+            logger.error("No data for %s (%s), skipping cycle", pair, timeframe.value)
+            return None
+
+        with tracer.span("cycle.indicators", **labels):
+            df = self.indicator_engine.compute_all(
+                df, symbol=pair, timeframe=timeframe.value,
+            )
+            results = self.indicator_engine.analyze_all(df)
+        with tracer.span("cycle.regime", **labels):
+            regime, confidence = self.regime_detector.detect(df)
+        with tracer.span("cycle.decision", **labels):
+            context = self.decision_engine.compute_market_context(results, regime, confidence)
+
+        portfolio = self.portfolio(pair, timeframe)
+        portfolio.current_price = float(df["close"].iloc[-1])
+        with tracer.span("cycle.strategy", **labels):
+            setup = self.portfolio_manager.evaluate(context, portfolio)
+        logger.info(
+            "Cycle %s (%s): regime=%s score=%d setup=%s",
+            pair, timeframe.value, regime.value, context.trend_score,
+            setup.side.value if setup else None,
+        )
+        if setup is not None and self.on_setup is not None:
+            with tracer.span("cycle.order", **labels):
+                self.on_setup(setup, portfolio)
+        return setup
@@ -0,0 +1,220 @@
+"""Live scheduler - runs (pair, timeframe) jobs concurrently on candle close."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from src.core.enums import TimeFrame
+from src.core.timeframes import next_close, utc_now
+from src.core.tracing import format_labels
+
+logger = logging.getLogger(__name__)
+
+# job(pair, timeframe, close_time); sync callables run in a worker thread
+JobCallback = Callable[[str, TimeFrame, pd.Timestamp], object]
+
+
+@dataclass
+class JobMetrics:
+    """Timing statistics of one scheduled (pair, timeframe) job."""
+    pair: str
+    timeframe: TimeFrame
+    runs: int = 0
+    failures: int = 0
+    overruns: int = 0  # candle closes skipped because the job was still running
+    last_latency: float = 0.0  # seconds spent in the job
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+    last_delay: float = 0.0  # seconds between candle close and job start
+    last_close: pd.Timestamp | None = None
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.runs if self.runs else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "pair": self.pair,
+            "timeframe": self.timeframe.value,
+            "runs": self.runs,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "last_latency": self.last_latency,
+            "mean_latency": self.mean_latency,
+            "max_latency": self.max_latency,
+            "last_delay": self.last_delay,
+            "last_close": self.last_close,
+        }
+
+
+@dataclass
+class _Job:
+    pair: str
+    timeframe: TimeFrame
+    callback: JobCallback
+    metrics: JobMetrics
+    running: asyncio.Task | None = field(default=None, repr=False)
+
+
+class LiveScheduler:
+    """Fires every registered job right after its candle closes.
+
+    Each (pair, timeframe) job waits for its own next close, so a slow job
+    never delays the others, and nothing runs while no candle has closed.
+    At most `max_concurrency` jobs execute at the same time; a job still
+    running when its next candle closes skips that close and records an
+    overrun. Per-job runs, failures, overruns, latency and start delay are
+    exported by `prometheus_text`.
+
+    Usage:
+        scheduler = LiveScheduler(max_concurrency=8)
+        for pair in ["BTCUSDT", "ETHUSDT"]:
+            for tf in TimeFrame:
+                scheduler.add_job(pair, tf, cycle)
+        serve_metrics(collectors=[scheduler.prometheus_text])
+        asyncio.run(scheduler.run())
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        settle_delay: float = 1.0,
+        clock: Callable[[], pd.Timestamp] | None = None,
+        sleep: Callable[[float], Awaitable[None]] | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        # Give the exchange a moment to finalize the closed candle
+        self.settle_delay = settle_delay
+        self._clock = clock or utc_now
+        self._sleep = sleep or asyncio.sleep
+        self._jobs: dict[tuple[str, TimeFrame], _Job] = {}
+        self._stopped = asyncio.Event()
+
+    def add_job(self, pair: str, timeframe: TimeFrame, callback: JobCallback) -> None:
+        """Register a job for a (pair, timeframe)."""
+        key = (pair, timeframe)
+        self._jobs[key] = _Job(pair, timeframe, callback, JobMetrics(pair, timeframe))
+        logger.debug("Scheduled job %s (%s)", pair, timeframe.value)
+
+    def remove_job(self, pair: str, timeframe: TimeFrame) -> None:
+        self._jobs.pop((pair, timeframe), None)
+
+    @property
+    def jobs(self) -> list[tuple[str, TimeFrame]]:
+        return list(self._jobs.keys())
+
+    def metrics(self) -> list[JobMetrics]:
+        return [job.metrics for job in self._jobs.values()]
+
+    def snapshot(self) -> pd.DataFrame:
+        """Per-job metrics as a table (one row per job)."""
+        return pd.DataFrame([m.as_dict() for m in self.metrics()])
+
+    def prometheus_text(self, prefix: str = "trading") -> str:
+        """Per-job metrics in the Prometheus text exposition format."""
+        jobs = [
+            (format_labels([("pair", m.pair), ("timeframe", m.timeframe.value)]), m)
+            for m in self.metrics()
+        ]
+        families = [
+            ("job_runs_total", "counter", "Job executions.", lambda m: m.runs),
+            ("job_failures_total", "counter", "Job executions that raised.",
+             lambda m: m.failures),
+            ("job_overruns_total", "counter",
+             "Candle closes skipped because the job was still running.",
+             lambda m: m.overruns),
+            ("job_latency_seconds_max", "gauge", "Longest job execution.",
+             lambda m: m.max_latency),
+            ("job_last_latency_seconds", "gauge", "Duration of the last job execution.",
+             lambda m: m.last_latency),
+            ("job_start_delay_seconds", "gauge",
+             "Seconds between the last candle close and the job start.",
+             lambda m: m.last_delay),
+        ]
+        metric = f"{prefix}_job_latency_seconds"
+        lines = [
+            f"# HELP {metric} Time spent in scheduled jobs.",
+            f"# TYPE {metric} summary",
+        ]
+        for labels, m in jobs:
+            lines.append(f"{metric}_sum{labels} {m.total_latency!r}")
+            lines.append(f"{metric}_count{labels} {m.runs}")
+        for name, kind, text, value in families:
+            lines += [f"# HELP {prefix}_{name} {text}", f"# TYPE {prefix}_{name} {kind}"]
+            lines += [f"{prefix}_{name}{labels} {value(m)!r}" for labels, m in jobs]
+        return "\n".join(lines) + "\n"
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    async def run(self) -> None:
+        """Run until `stop()` is called."""
+        self._stopped.clear()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        loops = [
+            asyncio.create_task(self._job_loop(job, semaphore))
+            for job in self._jobs.values()
+        ]
+        logger.info(
+            "Live scheduler started: %d jobs, max concurrency %d",
+            len(loops), self.max_concurrency,
+        )
+        try:
+            await self._stopped.wait()
+        finally:
+            running = [job.running for job in self._jobs.values() if job.running]
+            for task in loops:
+                task.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+            # Let in-flight jobs finish instead of cutting them mid-cycle
+            await asyncio.gather(*running, return_exceptions=True)
+            logger.info("Live scheduler stopped")
+
+    async def _job_loop(self, job: _Job, semaphore: asyncio.Semaphore) -> None:
+        last = None  # close fired last: a sleep waking up early must not refire it
+        while True:
+            now = self._clock()
+            close = next_close(now if last is None else max(now, last), job.timeframe)
+            wait = (close - self._clock()).total_seconds() + self.settle_delay
+            await self._sleep(max(wait, 0.0))
+            last = close
+
+            if job.running is not None and not job.running.done():
+                job.metrics.overruns += 1
+                logger.warning(
+                    "Job %s (%s) still running at close %s, skipping",
+                    job.pair, job.timeframe.value, close,
+                )
+                continue
+            job.running = asyncio.create_task(self._execute(job, close, semaphore))
+
+    async def _execute(
+        self, job: _Job, close: pd.Timestamp, semaphore: asyncio.Semaphore,
+    ) -> None:
+        async with semaphore:
+            started = self._clock()
+            try:
+                if inspect.iscoroutinefunction(job.callback):
+                    await job.callback(job.pair, job.timeframe, close)
+                else:
+                    await asyncio.to_thread(job.callback, job.pair, job.timeframe, close)
+            except Exception as e:
+                job.metrics.failures += 1
+                logger.error(
+                    "Error in job %s (%s): %s", job.pair, job.timeframe.value, e,
+                )
+            finally:
+                latency = (self._clock() - started).total_seconds()
+                metrics = job.metrics
+                metrics.runs += 1
+                metrics.last_close = close
+                metrics.last_delay = (started - close).total_seconds()
+                metrics.last_latency = latency
+                metrics.max_latency = max(metrics.max_latency, latency)
+                metrics.total_latency += latency
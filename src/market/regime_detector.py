@@ -11,17 +11,21 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
 import pandas as pd
 
-from src.core.enums import MarketRegime, Signal
+from src.core.enums import REGIME_CODES, SIGNAL_CODES, MarketRegime, Signal
 from src.core.models import IndicatorResult
 from src.indicators.adx import ADXIndicator
 from src.indicators.choppiness import ChoppinessIndicator
 from src.indicators.ema import EMAIndicator
 from src.indicators.bollinger import BollingerIndicator
+from src.indicators.graph import IndicatorGraph
 
 logger = logging.getLogger(__name__)
 
+_REGIMES = np.array(list(MarketRegime), dtype=object)
+
 
 class MarketRegimeDetector:
     """Detects the current market regime using multiple indicators.
@@ -38,22 +42,87 @@ class MarketRegimeDetector:
         self._chop = ChoppinessIndicator(window=14)
         self._ema = EMAIndicator(windows=[5, 10, 20, 50])
         self._bollinger = BollingerIndicator()
+        # Columns already computed by an identical engine plugin are reused
+        self._graph = IndicatorGraph([self._adx, self._chop, self._ema, self._bollinger])
+
+    def _ensure_computed(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compute only the indicators whose columns are missing or stale."""
+        return self._graph.compute(df)
 
     def detect(self, df: pd.DataFrame) -> tuple[MarketRegime, float]:
         """Detect market regime and return (regime, confidence).
 
         confidence is a float from 0.0 to 1.0.
         """
-        # Ensure indicators are computed
-        df = self._adx.compute(df)
-        df = self._chop.compute(df)
-        df = self._ema.compute(df)
-        df = self._bollinger.compute(df)
+        # Ensure indicators are computed (reusing cached columns)
+        df = self._ensure_computed(df)
 
         adx_result = self._adx.analyze(df)
         chop_result = self._chop.analyze(df)
         ema_result = self._ema.analyze(df)
 
+        return self._classify(adx_result, chop_result, ema_result)
+
+    def detect_series(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """Detect the regime of every bar in one vectorized pass.
+
+        Returns (regimes, confidences): an object array of MarketRegime and a
+        float array. Entry i matches `detect(df.iloc[:i + 1])`.
+        """
+        df = self._ensure_computed(df)
+
+        adx_series = self._adx.analyze_series(df)
+        chop_series = self._chop.analyze_series(df)
+        ema_series = self._ema.analyze_series(df)
+
+        # Undefined results read as 0 (value and DI), like in detect()
+        undefined = SIGNAL_CODES[Signal.UNDEFINED]
+        adx_defined = adx_series.signals != undefined
+        adx_value = adx_series.values
+        plus_di = np.where(adx_defined, adx_series.metadata["plus_di"], 0.0)
+        minus_di = np.where(adx_defined, adx_series.metadata["minus_di"], 0.0)
+        chop_value = chop_series.values
+        ranging = (chop_series.signals != undefined) & (chop_value > 61.8)
+        ema_signal = ema_series.signals
+
+        strong = adx_defined & (adx_value > 25)
+        trend_confidence = np.minimum(adx_value / 50, 1.0)
+        moderate_confidence = np.minimum((adx_value - 20) / 30, 0.6)
+
+        conditions = [
+            strong & (plus_di > minus_di) & (ema_signal == SIGNAL_CODES[Signal.BULLISH]),
+            strong & (minus_di > plus_di) & (ema_signal == SIGNAL_CODES[Signal.BEARISH]),
+            (adx_value < 20) & (chop_value > 61.8),
+            (adx_value > 20) & (plus_di > minus_di),
+            adx_value > 20,
+            ranging,
+        ]
+        codes = np.select(conditions, [
+            REGIME_CODES[MarketRegime.BULL],
+            REGIME_CODES[MarketRegime.BEAR],
+            REGIME_CODES[MarketRegime.RANGE],
+            REGIME_CODES[MarketRegime.BULL],
+            REGIME_CODES[MarketRegime.BEAR],
+            REGIME_CODES[MarketRegime.RANGE],
+        ], REGIME_CODES[MarketRegime.UNKNOWN])
+        confidences = np.select(conditions, [
+            trend_confidence,
+            trend_confidence,
+            np.minimum(chop_value / 100, 1.0),
+            moderate_confidence,
+            moderate_confidence,
+            0.4,
+        ], 0.0)
+
+        return _REGIMES[codes], confidences
+
+    def _classify(
+        self,
+        adx_result: IndicatorResult,
+        chop_result: IndicatorResult,
+        ema_result: IndicatorResult,
+    ) -> tuple[MarketRegime, float]:
+        """Decision tree mapping ADX/CHOP/EMA results to a regime."""
         adx_value = adx_result.value
         adx_strength = adx_result.metadata.get("strength", "weak")
         plus_di = adx_result.metadata.get("plus_di", 0)
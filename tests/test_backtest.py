@@ -0,0 +1,397 @@
+"""Tests for the backtest engine."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.engine import BacktestEngine, BacktestResult
+from src.backtest.execution import FeeSchedule, SimulatedExecution
+from src.backtest.metrics import compute_metrics, drawdowns
+from src.backtest.monte_carlo import MonteCarloSimulator, trade_returns
+from src.backtest.portfolio import PortfolioBacktest
+from src.backtest.sweep import (
+    _WORKER, ParameterSweep, configure_engine, parameter_grid, prepare_data, worker_pool,
+)
+from src.backtest.walk_forward import WalkForwardOptimizer, walk_forward_folds
+from src.core.config import Settings
+from src.core.enums import REGIME_CODES, MarketRegime, OrderSide
+from src.data.sentiment import SentimentStore
+from src.indicators.engine import IndicatorEngine
+
+
+def _make_ohlcv(n: int = 320, seed: int = 7) -> pd.DataFrame:
+    """Generate a synthetic series alternating trends and ranges."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    base = 150 + 30 * np.sin(t / 40) + np.cumsum(rng.normal(0, 1.5, n))
+    return pd.DataFrame({
+        "open": base - rng.random(n),
+        "high": base + rng.random(n) * 3,
+        "low": base - rng.random(n) * 3,
+        "close": base,
+        "volume": rng.random(n) * 1000 + 100,
+    }, index=pd.date_range("2022-01-01", periods=n, freq="D"))
+
+
+def _worker_attrs(_) -> dict:
+    return _WORKER["data"].attrs
+
+
+class TestBacktestEngine(unittest.TestCase):
+    def test_vectorized_matches_windowed_loop(self):
+        df = _make_ohlcv()
+        windowed = BacktestEngine(Settings()).run(df.copy(), vectorized=False)
+        vectorized = BacktestEngine(Settings()).run(df.copy(), vectorized=True)
+
+        self.assertGreater(len(windowed.trades), 0)
+        self.assertEqual(vectorized.trades, windowed.trades)
+        self.assertEqual(vectorized.final_capital, windowed.final_capital)
+        self.assertEqual(vectorized.total_trades, windowed.total_trades)
+
+    def test_default_engine_with_sentiment_history(self):
+        df = _make_ohlcv()
+        store = SentimentStore()
+        store.add("fear_and_greed", pd.Series(
+            50 + 45 * np.sin(np.arange(len(df)) / 15), index=df.index,
+        ))
+        results = [
+            BacktestEngine(
+                Settings(), IndicatorEngine.default(sentiment=store),
+            ).run(df.copy(), vectorized=vectorized)
+            for vectorized in (False, True)
+        ]
+        self.assertEqual(results[1].trades, results[0].trades)
+        self.assertEqual(results[1].final_capital, results[0].final_capital)
+
+    def test_no_trades_before_min_bars(self):
+        df = _make_ohlcv(250)
+        result = BacktestEngine(Settings()).run(df, min_bars=200)
+        for trade in result.trades:
+            self.assertGreaterEqual(trade["bar"], 200)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_run_records_equity_per_bar(self):
+        df = _make_ohlcv()
+        result = BacktestEngine(Settings()).run(df.copy())
+        self.assertEqual(len(result.equity), len(df))
+        self.assertTrue(result.equity_curve.index.equals(df.index))
+        np.testing.assert_array_equal(result.equity[:200], 10000.0)
+        self.assertTrue((result.regimes[:200] == -1).all())
+        self.assertTrue((result.regimes[200:] >= 0).all())
+        self.assertAlmostEqual(result.equity[-1], result.final_capital)
+        buys = [trade["bar"] for trade in result.trades if trade["side"] == "buy"]
+        self.assertTrue((result.position[buys] > 0).all())
+
+        table = result.regime_breakdown()
+        self.assertEqual(table["bars"].sum(), len(df) - 201)
+        self.assertEqual(table["trades"].sum(), result.total_trades)
+        self.assertAlmostEqual(
+            np.prod(1 + table["return"]), result.equity[-1] / result.equity[200],
+        )
+        self.assertIn("Sharpe", result.summary())
+
+    def test_metrics_of_a_known_curve(self):
+        result = BacktestResult(
+            100.0, 121.0, 2, 1, 1,
+            trades=[{"side": "sell", "pnl": 10.0}, {"side": "sell", "pnl": -5.0}],
+            equity=np.array([100.0, 110.0, 99.0, 121.0]),
+            position=np.array([0.0, 1.0, 1.0, 0.0]),
+            regimes=np.full(4, REGIME_CODES[MarketRegime.BULL], dtype=np.int8),
+        )
+        m = compute_metrics(result, periods=4)
+        self.assertAlmostEqual(m.total_return, 0.21)
+        self.assertAlmostEqual(m.annualized_return, 1.21 ** (4 / 3) - 1)
+        self.assertAlmostEqual(m.max_drawdown, 0.1)
+        self.assertEqual(m.max_drawdown_duration, 1)
+        self.assertEqual(m.exposure, 0.5)
+        self.assertEqual(m.profit_factor, 2.0)
+        self.assertEqual(m.win_rate, 0.5)
+        returns = np.array([0.1, -0.1, 22 / 99])
+        self.assertAlmostEqual(m.sharpe, returns.mean() / returns.std(ddof=1) * 2)
+        self.assertAlmostEqual(m.sortino, returns.mean() / np.sqrt(0.01 / 3) * 2)
+
+    def test_drawdown_duration_runs_to_the_end_when_not_recovered(self):
+        depth, duration = drawdowns(np.array([1.0, 2.0, 1.5, 1.8, 1.0]))
+        np.testing.assert_allclose(depth, [0.0, 0.0, 0.25, 0.1, 0.5])
+        np.testing.assert_array_equal(duration, [0, 0, 1, 2, 3])
+
+
+class TestExecution(unittest.TestCase):
+    def _model(self, **kwargs) -> SimulatedExecution:
+        model = SimulatedExecution(**kwargs)
+        model.prepare(pd.DataFrame({
+            "open":   [100.0, 100.0, 97.0, 100.0, 104.0],
+            "high":   [101.0, 102.0, 99.0, 111.0, 115.0],
+            "low":    [99.0, 98.5, 94.0, 94.0, 103.0],
+            "close":  [100.0, 101.0, 98.0, 100.0, 112.0],
+            "volume": [1000.0] * 5,
+        }))
+        return model
+
+    def test_market_orders_pay_spread_impact_and_taker_fee(self):
+        model = self._model(fees=FeeSchedule(maker=0.0, taker=0.001), spread=0.002, impact=0.5)
+        buy = model.fill(OrderSide.BUY, 100.0, 10.0, 0)
+        self.assertAlmostEqual(buy.price, 100.0 * (1 + 0.001 + 0.005))
+        self.assertAlmostEqual(buy.fee, buy.price * 10.0 * 0.001)
+        sell = model.fill(OrderSide.SELL, 100.0, 10.0, 0)
+        self.assertAlmostEqual(sell.price, 100.0 * (1 - 0.006))
+        capped = model.fill(OrderSide.BUY, 100.0, 1e6, 0)
+        self.assertAlmostEqual(capped.price, 100.0 * (1 + model.max_slippage))
+
+    def test_intrabar_stop_and_take_profit(self):
+        model = self._model(spread=0.0, impact=0.0)
+        stop = model.find_exit(0, 1.0, stop_loss=95.0, take_profit=120.0)
+        self.assertEqual((stop.bar, stop.reason, stop.price), (2, "stop_loss", 95.0))
+        gap = model.find_exit(0, 1.0, stop_loss=98.0, take_profit=120.0)
+        self.assertEqual((gap.bar, gap.price), (2, 97.0))  # gapped below: open
+        take = model.find_exit(2, 1.0, stop_loss=90.0, take_profit=110.0)
+        self.assertEqual((take.bar, take.reason, take.price), (3, "take_profit", 110.0))
+        self.assertEqual(take.fee_rate, model.fees.maker)
+        both = model.find_exit(2, 1.0, stop_loss=95.0, take_profit=110.0)
+        self.assertEqual(both.reason, "stop_loss")
+        self.assertEqual(self._model(stop_first=False).find_exit(
+            2, 1.0, stop_loss=95.0, take_profit=110.0,
+        ).reason, "take_profit")
+        self.assertIsNone(model.find_exit(0, 1.0, stop_loss=50.0, take_profit=200.0))
+
+    def test_backtest_with_simulated_execution(self):
+        df = _make_ohlcv()
+        ideal = BacktestEngine(Settings()).run(df.copy())
+        real = BacktestEngine(Settings(), execution=SimulatedExecution()).run(df.copy())
+        self.assertEqual(ideal.fees, 0.0)
+        self.assertGreater(real.fees, 0.0)
+        self.assertAlmostEqual(real.fees, sum(t["fee"] for t in real.trades))
+        self.assertAlmostEqual(real.equity[-1], real.final_capital)
+        self.assertTrue({"stop_loss", "take_profit"} & {t.get("reason") for t in real.trades})
+        # PnL of a round trip is net of both fees
+        for entry, exit_ in zip(real.trades[::2], real.trades[1::2]):
+            self.assertEqual((entry["side"], exit_["side"]), ("buy", "sell"))
+            self.assertAlmostEqual(
+                exit_["pnl"],
+                (exit_["price"] - entry["price"]) * entry["quantity"]
+                - entry["fee"] - exit_["fee"],
+            )
+
+
+class TestPortfolioBacktest(unittest.TestCase):
+    def test_single_pair_matches_backtest_engine(self):
+        df = _make_ohlcv()
+        expected = BacktestEngine(Settings()).run(df.copy())
+        result = PortfolioBacktest(Settings(), max_workers=1).run({"BTCUSDT": df})
+        np.testing.assert_allclose(result.equity, expected.equity)
+        self.assertAlmostEqual(result.final_capital, expected.final_capital)
+        self.assertEqual(len(result.trades), len(expected.trades))
+
+    def test_pairs_share_one_cash_balance_on_a_common_clock(self):
+        datasets = {
+            "BTCUSDT": _make_ohlcv(360, seed=1),
+            "ETHUSDT": _make_ohlcv(360, seed=2).iloc[40:],  # listed later
+            "SOLUSDT": _make_ohlcv(340, seed=3),
+        }
+        result = PortfolioBacktest(Settings(), max_workers=1).run(datasets)
+        self.assertEqual(len(result.index), 360)
+        self.assertTrue((result.cash >= -1e-9).all())
+        np.testing.assert_allclose(result.equity, result.cash + result.position)
+        self.assertEqual(
+            result.per_asset["trades"].sum(),
+            sum(t["side"] == "sell" for t in result.trades),
+        )
+        self.assertEqual(set(result.per_asset.index), set(datasets))
+        self.assertTrue(pd.Index([t["timestamp"] for t in result.trades]).is_monotonic_increasing)
+
+        pooled = PortfolioBacktest(Settings(), max_workers=2).run(datasets)
+        np.testing.assert_array_equal(result.equity, pooled.equity)
+
+
+class TestParameterSweep(unittest.TestCase):
+    GRID = {
+        "bull.sl_level": [0.005, 0.03],
+        "bull.risk_per_trade": [0.02, 0.1],
+        "range.risk_per_trade": [0.015, 0.05],
+    }
+
+    def test_parameter_grid_expands_all_combinations(self):
+        configs = parameter_grid(self.GRID)
+        self.assertEqual(len(configs), 8)
+        self.assertIn(
+            {"bull.sl_level": 0.03, "bull.risk_per_trade": 0.1,
+             "range.risk_per_trade": 0.015},
+            configs,
+        )
+
+    def test_configure_engine_applies_params(self):
+        execution = SimulatedExecution()
+        engine = configure_engine(
+            Settings(), {"bull.tp_level": 0.2, "bear.sl_level": 0.05}, execution,
+        )
+        strategies = engine.portfolio_manager.strategies
+        self.assertEqual(strategies[MarketRegime.BULL].tp_level, 0.2)
+        self.assertEqual(strategies[MarketRegime.BEAR].sl_level, 0.05)
+        self.assertIs(engine.execution, execution)
+        for params in ({"bull.unknown": 1}, {"bull": 1}, {"protection.sl_level": 0.01}):
+            with self.assertRaises(ValueError):
+                configure_engine(Settings(), params)
+
+    def test_stop_levels_move_results_with_simulated_execution(self):
+        df = _make_ohlcv()
+        grid = {"bull.sl_level": [0.005, 0.03]}
+        close = ParameterSweep(Settings(), max_workers=1).run(df, grid)
+        simulated = ParameterSweep(
+            Settings(), max_workers=1, execution=SimulatedExecution(),
+        ).run(df, grid)
+
+        # Fills at the close ignore stops; simulated exits depend on them
+        self.assertEqual(close["final_capital"].nunique(), 1)
+        self.assertEqual(simulated["final_capital"].nunique(), 2)
+        for _, row in simulated.iterrows():
+            expected = configure_engine(
+                Settings(), {"bull.sl_level": row["bull.sl_level"]}, SimulatedExecution(),
+            ).run(df.copy())
+            self.assertAlmostEqual(row["final_capital"], expected.final_capital)
+            self.assertEqual(row["total_trades"], expected.total_trades)
+
+    def test_results_are_ranked_and_match_single_runs(self):
+        df = _make_ohlcv()
+        table = ParameterSweep(Settings(), max_workers=1).run(df, self.GRID)
+
+        self.assertEqual(len(table), 8)
+        self.assertEqual(list(table["rank"]), list(range(1, 9)))
+        self.assertTrue(table["pnl_pct"].is_monotonic_decreasing)
+
+        best = table.iloc[0]
+        params = {key: best[key] for key in self.GRID}
+        expected = configure_engine(Settings(), params).run(df.copy())
+        self.assertAlmostEqual(best["final_capital"], expected.final_capital)
+        self.assertEqual(best["total_trades"], expected.total_trades)
+
+    def test_process_pool_matches_inline(self):
+        df = _make_ohlcv()
+        runs = [
+            ParameterSweep(
+                Settings(), max_workers=workers, execution=SimulatedExecution(),
+            ).run(df, self.GRID)
+            for workers in (1, 2)
+        ]
+        pd.testing.assert_frame_equal(runs[0], runs[1])
+
+    def test_workers_keep_indicator_stamps(self):
+        data = prepare_data(_make_ohlcv(), "BTCUSDT")
+        self.assertTrue(data.attrs)
+        with worker_pool(data, Settings(), (10000.0, 0.0, "BTCUSDT", 200), 2) as run:
+            attrs = run(_worker_attrs, [0, 1])
+        self.assertEqual(attrs, [data.attrs, data.attrs])
+
+
+class TestWalkForward(unittest.TestCase):
+    GRID = {"bull.risk_per_trade": [0.02, 0.1], "range.risk_per_trade": [0.015, 0.05]}
+
+    def test_rolling_and_anchored_folds(self):
+        rolling = walk_forward_folds(500, 150, 60, start=200)
+        self.assertEqual(
+            [(f.train_start, f.train_end, f.test_start, f.test_end) for f in rolling],
+            [(200, 350, 350, 410), (260, 410, 410, 470), (320, 470, 470, 500)],
+        )
+        anchored = walk_forward_folds(500, 150, 60, anchored=True, start=200)
+        self.assertEqual([f.train_start for f in anchored], [200, 200, 200])
+        self.assertEqual(walk_forward_folds(300, 150, 60, start=200), [])
+
+    def test_folds_are_tested_out_of_sample_and_stitched(self):
+        df = _make_ohlcv(500)
+        result = WalkForwardOptimizer(Settings(), max_workers=1).run(
+            df, self.GRID, train_bars=150, test_bars=60,
+        )
+        folds = result.folds
+        self.assertEqual(len(folds), 3)
+        self.assertTrue((folds["train_end"] < folds["test_start"]).all())
+        self.assertEqual(len(result.equity), 150)
+        self.assertEqual(result.equity.index[0], df.index[350])
+
+        # Each fold is the plain backtest of its window with the chosen params
+        engine = BacktestEngine(Settings())
+        data = engine.indicator_engine.compute_all(df.copy())
+        contexts = engine.contexts(data)
+        first = folds.iloc[0]
+        params = {key: first[key] for key in self.GRID}
+        expected = configure_engine(Settings(), params).simulate(
+            data.iloc[:410], contexts.window(350, 410),
+        )
+        self.assertAlmostEqual(first["test_final_capital"], expected.final_capital)
+        self.assertAlmostEqual(result.equity.iloc[59], expected.final_capital)
+        self.assertAlmostEqual(
+            result.final_capital,
+            10000.0 * np.prod(folds["test_final_capital"] / 10000.0),
+        )
+
+    def test_process_pool_matches_inline(self):
+        df = _make_ohlcv(500)
+        runs = [
+            WalkForwardOptimizer(
+                Settings(), max_workers=workers, execution=SimulatedExecution(),
+            ).run(
+                df, self.GRID, train_bars=150, test_bars=60, anchored=True,
+            )
+            for workers in (1, 2)
+        ]
+        pd.testing.assert_frame_equal(runs[0].folds, runs[1].folds)
+        pd.testing.assert_series_equal(runs[0].equity, runs[1].equity)
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        trades = []
+        for i, pnl in enumerate(rng.normal(5, 40, 200)):
+            trades.append({"bar": 2 * i, "side": "buy", "price": 100.0, "quantity": 10.0})
+            trades.append({
+                "bar": 2 * i + 1, "side": "sell", "price": 100.0 + pnl / 10,
+                "quantity": 10.0, "pnl": pnl,
+            })
+        final = 10000.0 + sum(t.get("pnl", 0.0) for t in trades)
+        self.result = BacktestResult(10000.0, final, 200, 0, 0, trades)
+
+    def test_trade_returns_compound_to_the_final_capital(self):
+        returns, exposure = trade_returns(self.result)
+        self.assertEqual(len(returns), 200)
+        self.assertAlmostEqual(
+            10000.0 * np.prod(1 + returns), self.result.final_capital, places=6,
+        )
+        self.assertAlmostEqual(exposure[0], 0.1)
+
+    def test_shuffle_keeps_the_final_return(self):
+        mc = MonteCarloSimulator(paths=500, method="shuffle", seed=0).run(self.result)
+        np.testing.assert_allclose(mc.final_returns, mc.observed_return)
+        self.assertGreaterEqual(mc.max_drawdowns.min(), 0.0)
+        self.assertGreater(mc.max_drawdowns.std(), 0.0)
+
+    def test_slippage_lowers_returns(self):
+        mc = MonteCarloSimulator(
+            paths=500, method="slippage", slippage=0.001, seed=0,
+        ).run(self.result)
+        self.assertTrue((mc.final_returns < mc.observed_return).all())
+        low, high = mc.interval(mc.final_returns)
+        self.assertLess(low, np.median(mc.final_returns))
+        self.assertGreater(high, np.median(mc.final_returns))
+
+    def test_invalid_slippage_is_rejected(self):
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator(slippage=-0.001)
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator(method="slippage")
+
+    def test_bootstrap_is_reproducible_across_workers(self):
+        runs = [
+            MonteCarloSimulator(paths=2500, block_size=4, seed=7, max_workers=w).run(
+                self.result,
+            )
+            for w in (1, 2)
+        ]
+        self.assertEqual(runs[0].paths, 2500)
+        np.testing.assert_array_equal(runs[0].final_returns, runs[1].final_returns)
+        np.testing.assert_array_equal(runs[0].max_drawdowns, runs[1].max_drawdowns)
+        self.assertGreater(runs[0].final_returns.std(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
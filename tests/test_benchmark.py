@@ -0,0 +1,48 @@
+"""Tests for the benchmark suite."""
+
+import tempfile
+import unittest
+
+from src.benchmark import (
+    BenchmarkResult, compare_results, load_results, run_benchmarks, save_results,
+    synthetic_ohlcv,
+)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_synthetic_data_is_deterministic(self):
+        self.assertTrue(synthetic_ohlcv(500, seed=1).equals(synthetic_ohlcv(500, seed=1)))
+        self.assertFalse(synthetic_ohlcv(500, seed=1).equals(synthetic_ohlcv(500, seed=2)))
+
+    def test_run_save_and_load(self):
+        results = run_benchmarks(
+            sizes=[600], cases=["regime.detect", "backtest.run"], repeat=1,
+        )
+        self.assertEqual([(r.case, r.bars) for r in results],
+                         [("regime.detect", 600), ("backtest.run", 600)])
+        self.assertTrue(all(r.min > 0 for r in results))
+
+        with tempfile.TemporaryDirectory() as root:
+            save_results(results, f"{root}/bench.json")
+            self.assertEqual(load_results(f"{root}/bench.json"), results)
+
+    def test_unknown_case_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run_benchmarks(sizes=[600], cases=["nope"])
+
+    def test_compare_flags_regressions(self):
+        def result(case, seconds):
+            return BenchmarkResult(case, 1000, 3, seconds, seconds, seconds)
+
+        baseline = [result("a", 1.0), result("b", 1.0), result("c", 1.0), result("d", 1.0)]
+        current = [result("a", 1.05), result("b", 1.5), result("c", 0.5), result("e", 1.0)]
+        table = compare_results(baseline, current, threshold=0.10)
+        self.assertEqual(
+            dict(zip(table["case"], table["status"])),
+            {"a": "ok", "b": "regression", "c": "improvement",
+             "d": "missing", "e": "new"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
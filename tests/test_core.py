@@ -3,16 +3,21 @@
 import os
 import tempfile
 import unittest
+import urllib.request
 
+import numpy as np
+import pandas as pd
 import yaml
 
 from src.core.config import (
     Settings, TradingConfig, ProtectionConfig, RiskProfileConfig,
     load_settings,
 )
+from src.core.bars import BarSeries
 from src.core.enums import MarketRegime, RiskProfile, Signal, TimeFrame, OrderSide
+from src.core.tracing import Tracer, serve_metrics
 from src.core.models import (
-    IndicatorResult, MarketContext, PortfolioState, TradeSetup, TradeResult,
+    OHLCV, IndicatorResult, MarketContext, PortfolioState, TradeSetup, TradeResult,
 )
 
 
@@ -119,5 +124,107 @@ class TestModels(unittest.TestCase):
         self.assertEqual(result.price, 50000.0)
 
 
+class TestBarSeries(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "open": [1.0, 2.0, 3.0], "high": [2.0, 3.0, 4.0], "low": [0.5, 1.5, 2.5],
+            "close": [1.5, 2.5, 3.5], "volume": [10.0, 20.0, 30.0],
+        }, index=pd.date_range("2023-01-01", periods=3, freq="D"))
+
+    def test_frame_round_trip(self):
+        bars = BarSeries.from_frame(self.df)
+        self.assertEqual(len(bars), 3)
+        expected = self.df.set_axis(self.df.index.as_unit("ns"))
+        pd.testing.assert_frame_equal(
+            bars.to_frame(), expected, check_names=False, check_freq=False,
+        )
+
+    def test_columns_are_views_with_derived_slots(self):
+        bars = BarSeries.from_frame(self.df, capacity=8)
+        bars["mid"] = (bars["high"] + bars["low"]) / 2
+        self.assertIn("mid", bars.columns)
+        bars["mid"][0] = 9.0  # writes through the view
+        self.assertEqual(bars.value("mid", 0), 9.0)
+        np.testing.assert_array_equal(bars.last("close", 2), [2.5, 3.5])
+        self.assertEqual(bars.value("mid", -1), 3.25)
+        self.assertIsNone(bars.value("mid", 5))
+        with self.assertRaises(ValueError):
+            bars["bad"] = np.zeros(2)
+
+    def test_append_fills_capacity_then_grows(self):
+        bars = BarSeries.from_frame(self.df, capacity=4)
+        bars["mid"] = 1.0
+        bars.append(OHLCV(pd.Timestamp("2023-01-04"), 4.0, 5.0, 3.5, 4.5, 40.0))
+        self.assertEqual(bars.capacity, 4)
+        bars.append(OHLCV(pd.Timestamp("2023-01-05"), 5.0, 6.0, 4.5, 5.5, 50.0))
+        self.assertEqual(bars.capacity, 8)
+        self.assertEqual(len(bars), 5)
+        np.testing.assert_array_equal(bars["close"], [1.5, 2.5, 3.5, 4.5, 5.5])
+        self.assertIsNone(bars.value("mid"))
+        self.assertEqual(bars.index[-1], pd.Timestamp("2023-01-05"))
+
+    def test_float32_storage(self):
+        bars = BarSeries.from_frame(self.df, dtype=np.float32)
+        bars["mid"] = bars["close"] * 2
+        self.assertEqual(bars["close"].dtype, np.float32)
+        self.assertEqual(bars["mid"].dtype, np.float32)
+
+
+class TestTracer(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        with tracer.span("stage"), tracer.profile("cycle"):
+            pass
+        self.assertEqual(tracer.stats(), {})
+
+    def test_spans_are_aggregated_per_labels(self):
+        tracer = Tracer()
+        tracer.enable()
+        for _ in range(3):
+            with tracer.span("indicator.compute", indicator="rsi"):
+                pass
+        with self.assertRaises(RuntimeError):
+            with tracer.span("indicator.compute", indicator="macd"):
+                raise RuntimeError("boom")
+
+        stats = tracer.stats()
+        rsi = stats[("indicator.compute", (("indicator", "rsi"),))]
+        macd = stats[("indicator.compute", (("indicator", "macd"),))]
+        self.assertEqual((rsi.count, rsi.errors), (3, 0))
+        self.assertEqual((macd.count, macd.errors), (1, 1))
+        self.assertGreaterEqual(rsi.max, rsi.last)
+
+    def test_prometheus_export_over_http(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("cycle", pair="BTCUSDT"):
+            pass
+        server = serve_metrics(
+            port=0, source=tracer, collectors=[lambda: "trading_jobs 2\n"],
+        )
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+        self.assertIn("# TYPE trading_span_seconds summary", body)
+        self.assertIn('trading_span_seconds_count{span="cycle",pair="BTCUSDT"} 1', body)
+        self.assertIn('trading_span_errors_total{span="cycle",pair="BTCUSDT"} 0', body)
+        self.assertTrue(body.endswith("trading_jobs 2\n"))
+
+    def test_profile_dumps_stats_file(self):
+        with tempfile.TemporaryDirectory() as root:
+            tracer = Tracer()
+            tracer.enable(profile_dir=root)
+            with tracer.profile("cycle-BTCUSDT-1d"):
+                with tracer.profile("nested"):  # ignored
+                    sum(range(1000))
+            files = os.listdir(root)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith("cycle-BTCUSDT-1d-"))
+        self.assertTrue(files[0].endswith(".prof"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,697 @@
+"""Tests for the data layer (OHLCV cache and stream, external signal cache)."""
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.enums import TimeFrame
+from src.data.cache import OHLCV_COLUMNS, CachedDataProvider, OHLCVStore
+from src.data.downloader import DownloadError, KlineDownloader, RateLimiter
+from src.data.provider import DataProvider, KrakenProvider
+from src.data.quality import DataQualityChecker, find_gaps
+from src.data.resample import (
+    BarResampler, ResampledDataProvider, resample_ohlcv, resample_timeframes, resample_trades,
+)
+from src.data.replay import KlineReplayServer, kline_messages, load_messages, save_messages
+from src.data.sentiment import SentimentStore
+from src.data.signal_cache import ExternalSignalCache
+from src.data.stream import BarBuffer, StreamingDataProvider, parse_kline
+
+
+class FakeProvider(DataProvider):
+    """Serves hourly bars up to `now`, recording every request."""
+
+    def __init__(self, now: pd.Timestamp):
+        self.now = now
+        self.calls: list[tuple[str, TimeFrame, str]] = []
+
+    def fetch_ohlcv(self, symbol, timeframe, start="1 Jan, 2020"):
+        self.calls.append((symbol, timeframe, start))
+        index = pd.date_range(pd.Timestamp(start), self.now, freq="h", name="timestamp")
+        close = 100 + (index - pd.Timestamp("2020-01-01")) / pd.Timedelta(hours=1)
+        return pd.DataFrame({
+            "open": close - 1,
+            "high": close + 2,
+            "low": close - 2,
+            "close": close,
+            "volume": np.full(len(index), 10.0),
+            "trades": np.arange(len(index)),
+        }, index=index)
+
+    def get_balance(self, coin):
+        return 42.0
+
+
+class TestCachedDataProvider(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.now = pd.Timestamp("2024-01-03 10:30")
+        self.fake = FakeProvider(self.now)
+        self.provider = CachedDataProvider(
+            self.fake, self.root, clock=lambda: self.now,
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _advance(self, hours: int):
+        self.now += pd.Timedelta(hours=hours)
+        self.fake.now = self.now
+
+    def test_first_fetch_downloads_full_history(self):
+        df = self.provider.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+        self.assertEqual(len(self.fake.calls), 1)
+        self.assertEqual(self.fake.calls[0][2], "1 Jan, 2024")
+        self.assertEqual(list(df.columns), ["open", "high", "low", "close", "volume"])
+        # 58 closed bars cached plus the 10:00 bar still forming
+        self.assertEqual(len(df), 59)
+        self.assertEqual(self.provider.store.rows("BTCUSDT", TimeFrame.INTRADAY), 58)
+
+    def test_only_new_bars_are_fetched(self):
+        self.provider.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+        self._advance(3)
+        df = self.provider.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+
+        self.assertEqual(len(self.fake.calls), 2)
+        self.assertEqual(self.fake.calls[1][2], "03 Jan, 2024 10:00:00")
+        expected = self.fake.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+        pd.testing.assert_frame_equal(
+            df, expected[["open", "high", "low", "close", "volume"]],
+            check_freq=False, check_index_type=False,
+        )
+
+    def test_cached_columns_are_memory_mapped(self):
+        self.provider.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+        df = self.provider.store.load("BTCUSDT", TimeFrame.INTRADAY)
+        values = df["close"].to_numpy()
+        while not isinstance(values, np.memmap) and values.base is not None:
+            values = values.base
+        self.assertIsInstance(values, np.memmap)
+        self.assertEqual(df.index[-1], pd.Timestamp("2024-01-03 09:00"))
+
+    def test_series_are_cached_separately(self):
+        self.provider.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+        self.provider.fetch_ohlcv("ETHUSDT", TimeFrame.INTRADAY, "2 Jan, 2024")
+        self.assertEqual(self.fake.calls[1][2], "2 Jan, 2024")
+        self.assertEqual(self.provider.store.rows("ETHUSDT", TimeFrame.INTRADAY), 34)
+
+    def test_start_filters_cached_history(self):
+        self.provider.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+        df = self.provider.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY, "3 Jan, 2024")
+        self.assertEqual(df.index[0], pd.Timestamp("2024-01-03"))
+
+    def test_get_balance_delegates(self):
+        self.assertEqual(self.provider.get_balance("BTC"), 42.0)
+
+
+class TestOHLCVStore(unittest.TestCase):
+    def test_append_skips_known_bars_and_torn_writes(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = OHLCVStore(root)
+            index = pd.date_range("2024-01-01", periods=5, freq="D")
+            df = pd.DataFrame(
+                {col: np.arange(5.0) for col in ["open", "high", "low", "close", "volume"]},
+                index=index,
+            )
+            self.assertEqual(store.append("BTC", TimeFrame.DAILY, df.iloc[:3]), 3)
+            # Simulate an interrupted append: one column got an extra value
+            with open(store.path("BTC", TimeFrame.DAILY) / "open.f8", "ab") as f:
+                f.write(np.float64(99.0).tobytes())
+
+            self.assertEqual(store.rows("BTC", TimeFrame.DAILY), 3)
+            self.assertEqual(store.append("BTC", TimeFrame.DAILY, df), 2)
+            loaded = store.load("BTC", TimeFrame.DAILY)
+            np.testing.assert_array_equal(loaded["open"].to_numpy(), np.arange(5.0))
+
+
+def _bars(start: str, periods: int, freq: str = "h") -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq=freq, name="timestamp")
+    close = 100 + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        "open": close - 1, "high": close + 2, "low": close - 2,
+        "close": close, "volume": np.full(periods, 10.0),
+    }, index=index)
+
+
+class TestStreamingDataProvider(unittest.TestCase):
+    def test_buffer_rolls_and_closes_on_next_candle(self):
+        buffer = BarBuffer(capacity=3)
+        buffer.extend(_bars("2024-01-01", 5))
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.last_open, pd.Timestamp("2024-01-01 04:00"))
+
+        messages = kline_messages(_bars("2024-01-01 05:00", 2), "BTCUSDT", TimeFrame.INTRADAY, 2)
+        klines = [parse_kline(m) for m in messages]
+        self.assertEqual(buffer.update(klines[0]), [])
+        self.assertEqual(buffer.frame(include_forming=True).index[-1], klines[0].open_time)
+        # The final update of 05:00 is lost: its partial values are not closed
+        self.assertEqual(buffer.update(klines[2]), [])
+        self.assertEqual(buffer.last_open, pd.Timestamp("2024-01-01 04:00"))
+
+        closed = buffer.update(klines[3])
+        self.assertEqual(len(closed), 1)
+        df = buffer.frame()
+        self.assertEqual(list(df["close"]), [103.0, 104.0, 101.0])
+        self.assertEqual(df.index[-1], pd.Timestamp("2024-01-01 06:00"))
+
+    def test_rest_bars_replace_the_forming_one(self):
+        buffer = BarBuffer(capacity=10)
+        buffer.extend(_bars("2024-01-01", 2))
+        bar = _bars("2024-01-01 02:00", 1)
+        message = kline_messages(bar, "BTCUSDT", TimeFrame.INTRADAY, updates=2)[0]
+        buffer.update(parse_kline(message))
+
+        added = buffer.extend(_bars("2024-01-01", 4))
+        self.assertEqual(list(added.index), list(_bars("2024-01-01 02:00", 2).index))
+        self.assertIsNone(buffer.forming)
+        self.assertEqual(buffer.frame()["close"].iloc[2], 102.0)
+
+    def test_replay_pushes_closed_bars(self):
+        btc = _bars("2024-01-01", 6)
+        eth = _bars("2024-01-01", 24, "15min")
+        messages = sorted(
+            kline_messages(btc, "BTCUSDT", TimeFrame.INTRADAY, updates=3)
+            + kline_messages(eth, "ETHUSDT", TimeFrame.SCALPING),
+            key=lambda m: m["data"]["E"],
+        )
+        with tempfile.TemporaryDirectory() as root:
+            path = f"{root}/klines.jsonl"
+            save_messages(messages, path)
+            record = f"{root}/recorded.jsonl"
+            received, eth_closes = [], []
+
+            async def main():
+                async with KlineReplayServer(path, speed=3600 * 100) as server:
+                    stream = StreamingDataProvider(
+                        url=server.url, reconnect_delay=0.01, record_path=record,
+                    )
+
+                    async def on_btc(kline):
+                        received.append(kline)
+
+                    def on_eth(kline):
+                        eth_closes.append(kline)
+                        if len(eth_closes) == len(eth):
+                            stream.stop()
+
+                    stream.subscribe("BTCUSDT", TimeFrame.INTRADAY, on_btc)
+                    stream.subscribe("ETHUSDT", TimeFrame.SCALPING, on_eth)
+                    await asyncio.wait_for(stream.run(), timeout=10)
+                    return stream
+
+            stream = asyncio.run(main())
+            recorded = load_messages(record)
+
+        self.assertEqual([k.open_time for k in received], list(btc.index))
+        self.assertTrue(all(k.closed for k in received))
+        df = stream.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY)
+        btc.index = btc.index.as_unit("ns")
+        pd.testing.assert_frame_equal(df, btc, check_freq=False)
+        self.assertEqual(len(stream.buffer("ETHUSDT", TimeFrame.SCALPING)), len(eth))
+        self.assertEqual(recorded, messages[:len(recorded)])
+
+    def test_reconnect_backfills_bars_missed_in_the_outage(self):
+        btc = _bars("2024-01-01", 6)
+        # 3 updates a bar: drop during 01:00, lose up to the end of 03:00
+        messages = kline_messages(btc, "BTCUSDT", TimeFrame.INTRADAY, updates=3)
+        history = _History(btc)
+        received = []
+
+        async def main():
+            async with KlineReplayServer(
+                messages, speed=3600 * 100, drop_after=5, outage=7,
+            ) as server:
+                stream = StreamingDataProvider(
+                    url=server.url, history=history, reconnect_delay=0.01,
+                )
+
+                def on_close(kline):
+                    received.append(kline)
+                    # REST has the bars closed during the outage
+                    history.until = btc.index[4]
+                    if len(received) == len(btc):
+                        stream.stop()
+
+                stream.subscribe("BTCUSDT", TimeFrame.INTRADAY, on_close)
+                await asyncio.wait_for(stream.run(), timeout=10)
+                return stream
+
+        stream = asyncio.run(main())
+
+        self.assertEqual(stream.connections, 2)
+        self.assertEqual(history.starts, ["1 Jan, 2020", "01 Jan, 2024 00:00:00"])
+        self.assertEqual([k.open_time for k in received], list(btc.index))
+        self.assertTrue(all(k.closed for k in received))
+        self.assertEqual([k.close for k in received], list(btc["close"]))
+        df = stream.fetch_ohlcv("BTCUSDT", TimeFrame.INTRADAY)
+        btc.index = btc.index.as_unit("ns")
+        pd.testing.assert_frame_equal(df, btc, check_freq=False)
+
+
+class _History(DataProvider):
+    """REST history of `bars` up to the open of `until` (the forming bar)."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars
+        self.until = bars.index[0]
+        self.starts: list[str] = []
+
+    def fetch_ohlcv(self, symbol, timeframe, start="1 Jan, 2020"):
+        self.starts.append(start)
+        return self.bars.loc[pd.Timestamp(start):self.until]
+
+    def get_balance(self, coin):
+        return 0.0
+
+
+class FakeExchange:
+    """Binance-like `get_klines` over hourly bars, with injectable failures."""
+
+    def __init__(self, bars: pd.DataFrame, limit: int = 1000):
+        self.bars = bars
+        self.limit = limit
+        self.failures: dict[int, int] = {}  # startTime (ms) -> failures left
+        self.calls: list[int] = []
+        self._lock = threading.Lock()
+
+    def get_klines(self, symbol, interval, startTime, endTime, limit):
+        with self._lock:
+            self.calls.append(startTime)
+            if self.failures.get(startTime, 0):
+                self.failures[startTime] -= 1
+                raise ConnectionError("HTTP 503")
+        opens = self.bars.index.as_unit("ms").asi8
+        rows = self.bars[(opens >= startTime) & (opens <= endTime)].iloc[:min(limit, self.limit)]
+        return [
+            [int(ts), str(o), str(h), str(lo), str(c), str(v), 0, "0", 0, "0", "0", "0"]
+            for ts, (o, h, lo, c, v) in zip(rows.index.as_unit("ms").asi8, rows.to_numpy())
+        ]
+
+
+class TestKlineDownloader(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.bars = _bars("2024-01-01", 1000)
+        self.bars.index = self.bars.index.as_unit("ns")
+        self.exchange = FakeExchange(self.bars, limit=40)
+        self.now = pd.Timestamp("2024-02-11 16:30")  # bar 999 (15:00) is closed
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _downloader(self, **kwargs) -> KlineDownloader:
+        return KlineDownloader(
+            self.exchange, self._tmp.name, chunk_bars=100, requests_per_second=1e6,
+            backoff=0, clock=lambda: self.now, sleep=lambda s: None, **kwargs,
+        )
+
+    def test_chunks_are_paged_and_merged(self):
+        df, report = self._downloader().download("BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024")
+        pd.testing.assert_frame_equal(df, self.bars, check_freq=False)
+        self.assertEqual(report.chunks, 10)
+        self.assertEqual(report.requests, 30)  # 100 bars in pages of 40
+        self.assertEqual((report.duplicates, report.gaps), (0, []))
+
+    def test_failed_chunks_resume_from_checkpoints(self):
+        chunk_start = int(pd.Timestamp("2024-01-09 08:00").value // 1_000_000)
+        self.exchange.failures[chunk_start] = 3
+        with self.assertRaises(DownloadError) as caught:
+            self._downloader(retries=2).download("BTCUSDT", "1h", "1 Jan, 2024")
+        self.assertEqual(caught.exception.report.downloaded, 9)
+        self.assertEqual(self.exchange.calls.count(chunk_start), 3)
+
+        self.exchange.calls.clear()
+        df, report = self._downloader(retries=2).download("BTCUSDT", "1h", "1 Jan, 2024")
+        self.assertEqual((report.resumed, report.downloaded), (9, 1))
+        self.assertEqual(self.exchange.calls.count(chunk_start), 1)
+        pd.testing.assert_frame_equal(df, self.bars, check_freq=False)
+
+    def test_gaps_are_reported_and_stored(self):
+        self.exchange.bars = self.bars.drop(self.bars.index[500:505])
+        store = OHLCVStore(f"{self._tmp.name}/store")
+        df, report = self._downloader().download(
+            "BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024", store=store,
+        )
+        self.assertEqual(report.gaps, [(self.bars.index[500], self.bars.index[505], 5)])
+        self.assertEqual(report.missing_bars, 5)
+        self.assertEqual(store.rows("BTCUSDT", TimeFrame.INTRADAY), 995)
+        self.assertEqual(report.stored, 995)
+
+    def test_backfill_behind_stored_bars_is_reported(self):
+        store = OHLCVStore(f"{self._tmp.name}/store")
+        store.append("BTCUSDT", TimeFrame.INTRADAY, self.bars.iloc[-10:])
+        with self.assertLogs("src.data.downloader", "WARNING") as logs:
+            df, report = self._downloader().download(
+                "BTCUSDT", TimeFrame.INTRADAY, "1 Jan, 2024", store=store,
+            )
+        self.assertEqual((len(df), report.stored), (len(self.bars), 0))
+        self.assertIn("not stored", logs.output[0])
+        self.assertEqual(store.rows("BTCUSDT", TimeFrame.INTRADAY), 10)
+
+    def test_rate_limiter_spaces_requests(self):
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(rate=2.0, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire()
+        self.assertEqual(slept, [0.5, 0.5])
+
+
+class FakeKrakenAPI:
+    """pykrakenapi `get_ohlc_data` over hourly candles up to `now`.
+
+    Like Kraken, only the `window` most recent candles are served, at most
+    `limit` per response, and the forming candle is always appended.
+    """
+
+    def __init__(self, now: pd.Timestamp, window: int = 720, limit: int = 720):
+        self.now = now
+        self.window = window
+        self.limit = limit
+        self.returned: list[int] = []  # rows of each response
+
+    def get_ohlc_data(self, pair, interval=1, since=None, ascending=False):
+        opens = pd.date_range(end=self.now.floor("h"), periods=self.window, freq="h")
+        times = opens.as_unit("s").asi8
+        committed = times[:-1]
+        if since is not None:
+            committed = committed[committed > since]
+        committed = committed[:self.limit - 1]
+        times = np.append(committed, times[-1])
+        close = 100.0 + (times - times[0]) / 3600
+        df = pd.DataFrame({
+            "time": times, "open": close - 1, "high": close + 1, "low": close - 2,
+            "close": close, "vwap": close, "volume": np.full(len(times), 5.0),
+            "count": np.full(len(times), 3),
+        }, index=pd.DatetimeIndex(pd.to_datetime(times, unit="s"), name="dtime"))
+        self.returned.append(len(df))
+        last = int(committed[-1]) if len(committed) else since
+        return df, last
+
+
+class TestKrakenProvider(unittest.TestCase):
+    def test_cursor_persists_and_only_new_candles_transfer(self):
+        api = FakeKrakenAPI(pd.Timestamp("2024-03-01 10:30"))
+        with tempfile.TemporaryDirectory() as root:
+            provider = KrakenProvider(store_root=root, client=api)
+            df = provider.fetch_ohlcv("XBTUSD", TimeFrame.INTRADAY, "1 Jan, 2024")
+            self.assertEqual(len(df), 720)
+            self.assertEqual(df.index[-1], pd.Timestamp("2024-03-01 10:00"))
+            self.assertEqual(list(df.columns), list(OHLCV_COLUMNS))
+            self.assertEqual(provider.store.rows("XBTUSD", TimeFrame.INTRADAY), 719)
+
+            # A restarted provider resumes from the saved cursor
+            api.now = pd.Timestamp("2024-03-01 13:30")
+            restarted = KrakenProvider(store_root=root, client=api)
+            df = restarted.fetch_ohlcv("XBTUSD", TimeFrame.INTRADAY, "1 Jan, 2024")
+            self.assertEqual(api.returned[-1], 4)  # 3 newly committed + forming
+            self.assertEqual(len(df), 723)
+            self.assertTrue(df.index.is_unique)
+            self.assertEqual(restarted.store.rows("XBTUSD", TimeFrame.INTRADAY), 722)
+
+    def test_pages_forward_until_caught_up(self):
+        api = FakeKrakenAPI(pd.Timestamp("2024-03-01 10:30"), limit=100)
+        provider = KrakenProvider(client=api)
+        df = provider.fetch_ohlcv("XBTUSD", TimeFrame.INTRADAY, "1 Jan, 2024")
+        self.assertEqual(len(api.returned), 8)
+        self.assertEqual(len(df), 720)
+        self.assertEqual(list(df.columns), list(OHLCV_COLUMNS))
+        self.assertTrue(df.index.is_monotonic_increasing and df.index.is_unique)
+
+        df = provider.fetch_ohlcv("XBTUSD", TimeFrame.INTRADAY, "1 Mar, 2024")
+        self.assertEqual(df.index[0], pd.Timestamp("2024-03-01"))
+
+
+class TestDataQuality(unittest.TestCase):
+    def test_clean_series_is_returned_untouched(self):
+        df = _bars("2024-01-01", 500)
+        checked, report = DataQualityChecker(fill="ffill").check(df, TimeFrame.INTRADAY)
+        self.assertIs(checked, df)
+        self.assertTrue(report.clean)
+
+    def test_repairs_and_flags(self):
+        df = _bars("2024-01-01", 500)
+        df.iloc[300, df.columns.get_loc("close")] = 1000.0  # spike and revert
+        df.iloc[300, df.columns.get_loc("high")] = 1000.0
+        df.iloc[350, df.columns.get_loc("low")] = np.nan
+        damaged = pd.concat([df.drop(df.index[100:103]), df.iloc[[10, 20]]])
+
+        checker = DataQualityChecker(fill="ffill", drop_outliers=True)
+        checked, report = checker.check(damaged, TimeFrame.INTRADAY)
+        self.assertTrue(report.unsorted)
+        self.assertEqual(report.duplicates, 2)
+        self.assertEqual(list(report.spikes), [df.index[300]])
+        self.assertEqual(list(report.invalid), [df.index[350]])
+        # Dropped outliers leave gaps of their own
+        self.assertEqual(report.gaps, [
+            (df.index[100], df.index[103], 3),
+            (df.index[300], df.index[301], 1),
+            (df.index[350], df.index[351], 1),
+        ])
+        self.assertEqual((report.filled, report.dropped_outliers), (5, 2))
+        # Every candle open is present; filled ones are flat at the previous close
+        self.assertTrue(checked.index.equals(df.index.as_unit("ns")))
+        flat = checked.iloc[100]
+        self.assertEqual(flat["open"], df["close"].iloc[99])
+        self.assertEqual((flat["high"], flat["low"], flat["volume"]), (flat["close"], flat["close"], 0.0))
+
+    def test_misaligned_rows_are_reported_and_not_filled(self):
+        df = _bars("2024-01-01", 6)
+        shifted = df.index[1] + pd.Timedelta(minutes=30)
+        damaged = df.rename(index={df.index[1]: shifted}).drop(df.index[3])
+
+        checked, report = DataQualityChecker(fill="ffill").check(damaged, TimeFrame.INTRADAY)
+        self.assertEqual(list(report.misaligned), [shifted])
+        # Gaps are measured on the candle opens; the 01:30 row fills none
+        self.assertEqual(report.gaps, [
+            (df.index[1], df.index[2], 1), (df.index[3], df.index[4], 1),
+        ])
+        self.assertEqual(report.filled, 0)
+        self.assertFalse(report.clean)
+        self.assertIs(checked, damaged)
+
+        # Evenly spaced rows off the grid are all misaligned
+        offset = df.set_axis(df.index + pd.Timedelta(minutes=30))
+        _, report = DataQualityChecker().check(offset, TimeFrame.INTRADAY)
+        self.assertEqual(len(report.misaligned), len(df))
+
+    def test_monthly_gaps(self):
+        index = pd.DatetimeIndex(["2024-01-01", "2024-02-01", "2024-05-01"])
+        self.assertEqual(
+            find_gaps(index, TimeFrame.MONTHLY),
+            [(pd.Timestamp("2024-03-01"), pd.Timestamp("2024-05-01"), 2)],
+        )
+
+    def test_cached_provider_checks_every_load(self):
+        with tempfile.TemporaryDirectory() as root:
+            fake = FakeProvider(pd.Timestamp("2024-01-03 10:30"))
+            provider = CachedDataProvider(fake, root, clock=lambda: fake.now)
+            df = provider.fetch_ohlcv("BTC", TimeFrame.INTRADAY, "1 Jan, 2024")
+        self.assertEqual(len(df), 59)
+        report = provider.quality_reports[("BTC", TimeFrame.INTRADAY)]
+        self.assertTrue(report.clean)
+        self.assertEqual(report.rows_in, 59)
+
+
+class TestResampling(unittest.TestCase):
+    AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+    def _expected(self, df, freq, **kwargs):
+        expected = df.resample(freq, **kwargs).agg(self.AGG).dropna()
+        expected.index = expected.index.as_unit("ns").rename("timestamp")
+        return expected
+
+    def test_matches_pandas_resample(self):
+        df = _bars("2024-01-01", 24 * 100, "h")
+        cases = [
+            ("2h", "2h", {}),
+            ("3d", "72h", {"origin": "epoch"}),
+            ("1w", "W-MON", {"label": "left", "closed": "left"}),
+            (TimeFrame.MONTHLY, "MS", {}),
+        ]
+        for interval, freq, kwargs in cases:
+            pd.testing.assert_frame_equal(
+                resample_ohlcv(df, interval), self._expected(df, freq, **kwargs),
+                check_freq=False,
+            )
+        frames = resample_timeframes(df)
+        self.assertEqual(set(frames), {tf.value for tf in TimeFrame})
+        self.assertEqual(len(frames["daily"]), 100)
+
+    def test_incremental_updates_match_one_shot(self):
+        df = _bars("2024-01-01", 24 * 10 + 5, "h")
+        resampler = BarResampler("1d", source=TimeFrame.INTRADAY)
+        closed = [resampler.update(df.iloc[i:i + 7]) for i in range(0, len(df), 7)]
+        full = resample_ohlcv(df, "1d")
+        pd.testing.assert_frame_equal(pd.concat(closed), full.iloc[:-1], check_freq=False)
+        pd.testing.assert_frame_equal(
+            resampler.frame(include_forming=True), full, check_freq=False,
+        )
+        # Rows already seen are ignored
+        self.assertTrue(resampler.update(df.iloc[-3:]).empty)
+
+    def test_trades_to_bars(self):
+        index = pd.DatetimeIndex(
+            ["2024-01-01 00:01", "2024-01-01 00:07", "2024-01-01 00:14", "2024-01-01 00:16"],
+        )
+        trades = pd.DataFrame({"price": [10.0, 12.0, 9.0, 11.0], "quantity": [1.0, 2.0, 3.0, 4.0]},
+                              index=index)
+        bars = resample_trades(trades, "15m")
+        self.assertEqual(bars.iloc[0].tolist(), [10.0, 12.0, 9.0, 9.0, 6.0])
+
+        resampler = BarResampler("15m", trades=True)
+        self.assertTrue(resampler.update(trades.iloc[:3]).empty)
+        self.assertEqual(len(resampler.update(trades.iloc[3:])), 1)
+        self.assertTrue(resampler.flush(pd.Timestamp("2024-01-01 00:20")).empty)
+        self.assertEqual(len(resampler.flush(pd.Timestamp("2024-01-01 00:30"))), 1)
+
+    def test_provider_serves_timeframes_from_base(self):
+        now = pd.Timestamp("2024-01-03 10:30")
+        fake = FakeProvider(now)
+        provider = ResampledDataProvider(
+            fake, base=TimeFrame.INTRADAY, max_age=60, clock=lambda: now,
+        )
+        daily = provider.fetch_ohlcv("BTC", TimeFrame.DAILY, "1 Jan, 2024")
+        four = provider.fetch_interval("BTC", "4h", "1 Jan, 2024")
+        self.assertEqual(len(fake.calls), 1)
+
+        base = fake.fetch_ohlcv("BTC", TimeFrame.INTRADAY, "1 Jan, 2024")
+        pd.testing.assert_frame_equal(
+            daily, self._expected(base.drop(columns="trades"), "D"), check_freq=False,
+        )
+        self.assertEqual(four.index[-1], pd.Timestamp("2024-01-03 08:00"))
+        self.assertTrue(provider.quality_reports["BTC"].clean)
+
+        # Later fetches only aggregate the new base bars
+        now = pd.Timestamp("2024-01-04 01:30")
+        fake.now = now
+        daily = provider.fetch_ohlcv("BTC", TimeFrame.DAILY, "1 Jan, 2024")
+        self.assertEqual(daily.index[-1], pd.Timestamp("2024-01-04"))
+        base = fake.fetch_ohlcv("BTC", TimeFrame.INTRADAY, "1 Jan, 2024")
+        pd.testing.assert_frame_equal(
+            daily, self._expected(base.drop(columns="trades"), "D"), check_freq=False,
+        )
+
+
+class TestExternalSignalCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = ExternalSignalCache(clock=lambda: self.now)
+        self.calls = 0
+
+    def _fetch(self, *args):
+        self.calls += 1
+        return self.calls
+
+    def test_fresh_values_are_served_from_cache(self):
+        self.cache.register("index", self._fetch, ttl=60)
+        self.assertEqual(self.cache.get("index"), 1)
+        self.now = 59
+        self.assertEqual(self.cache.get("index"), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_is_served_while_revalidating(self):
+        self.cache.register("index", self._fetch, ttl=60)
+        self.cache.get("index")
+        self.now = 120
+        self.assertEqual(self.cache.get("index"), 1)  # stale, refresh queued
+        deadline = time.monotonic() + 5
+        while self.cache.get("index") != 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.cache.get("index"), 2)
+        self.assertEqual(self.calls, 2)
+
+    def test_max_stale_forces_synchronous_fetch(self):
+        self.cache.register("index", self._fetch, ttl=60, max_stale=10)
+        self.cache.get("index")
+        self.now = 100
+        self.assertEqual(self.cache.get("index"), 2)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        release = threading.Event()
+
+        def slow_fetch(term):
+            self.calls += 1
+            release.wait(5)
+            return f"trend:{term}"
+
+        self.cache.register("trends", slow_fetch, ttl=60)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get("trends", "Bitcoin")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ["trend:Bitcoin"] * 8)
+
+    def test_failures_are_not_cached(self):
+        outcomes = [None, RuntimeError("down"), 42]
+
+        def flaky():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.cache.register("index", flaky, ttl=60)
+        self.assertIsNone(self.cache.get("index"))
+        self.assertIsNone(self.cache.get("index"))
+        self.assertEqual(self.cache.get("index"), 42)
+
+
+class TestSentimentStore(unittest.TestCase):
+    def test_load_api_json_and_align_as_of(self):
+        # alternative.me serves the newest value first, values as strings
+        payload = {"data": [
+            {"value": "30", "value_classification": "Fear", "timestamp": "1672617600"},
+            {"value": "70", "value_classification": "Greed", "timestamp": "1672531200"},
+        ]}
+        with tempfile.TemporaryDirectory() as root:
+            path = f"{root}/fng.json"
+            with open(path, "w") as f:
+                json.dump(payload, f)
+            store = SentimentStore.from_files(fear_and_greed=path)
+
+        index = pd.DatetimeIndex(
+            ["2022-12-31", "2023-01-01", "2023-01-01 12:00", "2023-01-02", "2023-01-05"],
+        )
+        aligned = store.align("fear_and_greed", index)
+        self.assertTrue(np.isnan(aligned[0]))
+        np.testing.assert_array_equal(aligned[1:], [70.0, 70.0, 30.0, 30.0])
+        self.assertEqual(store.value_at("fear_and_greed", "2023-01-03"), 30.0)
+        self.assertIsNone(store.value_at("fear_and_greed", "2022-06-01"))
+
+    def test_load_csv_with_dates(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = f"{root}/fng.csv"
+            with open(path, "w") as f:
+                f.write("timestamp,value\n2023-01-02,30\n2023-01-01,70\n")
+            store = SentimentStore()
+            store.load("fear_and_greed", path)
+
+        series = store.series("fear_and_greed")
+        self.assertEqual(list(series.index), list(pd.date_range("2023-01-01", periods=2)))
+        self.assertEqual(list(series), [70.0, 30.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,12 @@
 
 import unittest
 
+import numpy as np
+
 from src.core.config import ProtectionConfig, RiskProfileConfig
-from src.core.enums import MarketRegime, OrderSide, Signal, TimeFrame
-from src.core.models import IndicatorResult, MarketContext
-from src.decision.engine import DecisionEngine
+from src.core.enums import SIGNAL_CODES, MarketRegime, OrderSide, Signal, TimeFrame
+from src.core.models import IndicatorResult, IndicatorSeries, MarketContext
+from src.decision.engine import DecisionEngine, score_signal_codes
 
 
 class TestDecisionEngine(unittest.TestCase):
@@ -95,6 +97,44 @@ class TestDecisionEngine(unittest.TestCase):
         )
         self.assertIsNone(setup)
 
+    def test_series_scoring_matches_per_bar_context(self):
+        rng = np.random.default_rng(3)
+        names = ["adi", "ema", "rsi", "stoch_rsi", "fibonacci", "fear_and_greed"]
+        signals = list(Signal)
+        series = [
+            IndicatorSeries(
+                name=name,
+                signals=rng.integers(0, len(signals), 50).astype(np.int8),
+                values=rng.random(50),
+            )
+            for name in names
+        ]
+        regimes = np.array([MarketRegime.BULL] * 50, dtype=object)
+        contexts = self.engine.compute_market_context_series(
+            series, regimes, np.full(50, 0.7), start=10,
+        )
+
+        self.assertEqual(len(contexts), 40)
+        self.assertEqual([i for i, _ in contexts], list(range(10, 50)))
+        for i, view in contexts:
+            expected = self.engine.compute_market_context(
+                [s.result_at(i) for s in series], MarketRegime.BULL, 0.7,
+            )
+            self.assertEqual(view.trend_score, expected.trend_score)
+            self.assertEqual(view.signal, expected.signal)
+            self.assertEqual(view.regime, expected.regime)
+            self.assertEqual(view.indicators, expected.indicators)
+
+    def test_score_signal_codes_ignores_non_scoring_indicators(self):
+        bullish = np.full(3, SIGNAL_CODES[Signal.BULLISH], dtype=np.int8)
+        oversold = np.full(3, SIGNAL_CODES[Signal.OVERSOLD], dtype=np.int8)
+        bearish = np.full(3, SIGNAL_CODES[Signal.BEARISH], dtype=np.int8)
+        scores, overall = score_signal_codes(
+            {"rsi": oversold, "ema": bullish, "fibonacci": bearish, "macd": bearish},
+        )
+        np.testing.assert_array_equal(scores, [1, 1, 1])
+        np.testing.assert_array_equal(overall, bullish)
+
 
 if __name__ == "__main__":
     unittest.main()
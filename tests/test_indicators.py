@@ -1,12 +1,19 @@
 """Tests for the indicator engine and individual indicators."""
 
 import unittest
+from unittest import mock
 
 import numpy as np
 import pandas as pd
 
-from src.core.enums import Signal
+from src.core.bars import BarSeries
+from src.core.enums import SIGNAL_CODES, Signal
+from src.data.sentiment import SentimentStore
+from src.indicators.base import Computation, iter_bars
 from src.indicators.engine import IndicatorEngine
+from src.indicators.cache import ComputeCache
+from src.indicators.fear_and_greed import FearAndGreedIndicator
+from src.indicators.graph import IndicatorGraph
 from src.indicators.rsi import RSIIndicator
 from src.indicators.macd import MACDIndicator
 from src.indicators.bollinger import BollingerIndicator
@@ -19,6 +26,7 @@ from src.indicators.support_resistance import SupportResistanceIndicator
 from src.indicators.fibonacci import FibonacciIndicator
 from src.indicators.choppiness import ChoppinessIndicator
 from src.indicators.adx import ADXIndicator
+from src.indicators.streaming import RollingExtreme
 
 
 def _make_ohlcv(n: int = 300, trend: str = "up") -> pd.DataFrame:
@@ -63,6 +71,51 @@ class TestIndicatorEngine(unittest.TestCase):
             self.assertIsNotNone(r.signal)
             self.assertIsNotNone(r.name)
 
+    def test_analyze_series_matches_analyze(self):
+        engine = IndicatorEngine.fast()
+        engine.register(FibonacciIndicator())
+        df = engine.compute_all(_make_ohlcv(300, "range"))
+        series = {s.name: s for s in engine.analyze_series_all(df)}
+        self.assertEqual(set(series), set(engine.names))
+
+        for i in [0, 1, 2, 30, 120, 250, 299]:
+            for result in engine.analyze_all(df.iloc[:i + 1]):
+                expected = series[result.name].result_at(i)
+                self.assertEqual(expected.signal, result.signal, (result.name, i))
+                self.assertAlmostEqual(expected.value, result.value)
+
+    def test_update_all_matches_analyze(self):
+        engine = IndicatorEngine.fast()
+        engine.register(FibonacciIndicator())
+        raw = _make_ohlcv(300, "range")
+        df = engine.compute_all(raw.copy())
+
+        engine.seed_all(raw.iloc[:100])
+        for i, bar in enumerate(iter_bars(raw.iloc[100:]), start=100):
+            streamed = {r.name: r for r in engine.update_all(bar)}
+            self.assertEqual(set(streamed), set(engine.names))
+            if i % 25:
+                continue
+            for result in engine.analyze_all(df.iloc[:i + 1]):
+                expected = streamed[result.name]
+                self.assertEqual(expected.signal, result.signal, (result.name, i))
+                self.assertAlmostEqual(expected.value, result.value)
+
+    def test_bar_series_matches_dataframe(self):
+        engine = IndicatorEngine.fast()
+        engine.register(FibonacciIndicator())
+        raw = _make_ohlcv(300, "down")
+        df = engine.compute_all(raw.copy())
+        bars = engine.compute_all(BarSeries.from_frame(raw))
+
+        for col in df.columns:
+            np.testing.assert_allclose(bars[col], df[col].to_numpy(), equal_nan=True)
+        self.assertEqual(engine.analyze_all(bars), engine.analyze_all(df))
+        for expected, series in zip(
+            engine.analyze_series_all(df), engine.analyze_series_all(bars),
+        ):
+            np.testing.assert_array_equal(series.signals, expected.signals)
+
     def test_register_unregister(self):
         engine = IndicatorEngine()
         self.assertEqual(len(engine.names), 0)
@@ -72,6 +125,160 @@ class TestIndicatorEngine(unittest.TestCase):
         self.assertEqual(len(engine.names), 0)
 
 
+class _Node(Computation):
+    name = ""
+    outputs = ()
+
+    def __init__(self, name, inputs, outputs):
+        self.name = name
+        self.inputs = inputs
+        self.outputs = outputs
+
+    def compute(self, df):
+        for column in self.outputs:
+            df[column] = 1.0
+        return df
+
+
+class TestIndicatorGraph(unittest.TestCase):
+    def test_shared_intermediate_runs_before_its_readers(self):
+        engine = IndicatorEngine([ChoppinessIndicator(), RSIIndicator()])
+        order = engine.graph.order
+        self.assertEqual(order.count("true_range"), 1)
+        self.assertLess(order.index("true_range"), order.index("choppiness"))
+
+        expected = ChoppinessIndicator().compute(_make_ohlcv())
+        df = engine.compute_all(_make_ohlcv())
+        np.testing.assert_array_equal(df["chop"].to_numpy(), expected["chop"].to_numpy())
+
+    def test_fresh_columns_are_skipped(self):
+        rsi = RSIIndicator()
+        engine = IndicatorEngine([rsi, MACDIndicator()])
+        df = engine.compute_all(_make_ohlcv())
+
+        with mock.patch.object(rsi, "compute", wraps=rsi.compute) as compute:
+            engine.compute_all(df)
+            compute.assert_not_called()
+            engine.compute_all(df.iloc[:200].copy())  # slices stay fresh
+            compute.assert_not_called()
+            engine.compute_all(df, force=True)
+            self.assertEqual(compute.call_count, 1)
+
+        # A new bar without indicator values makes the columns stale
+        extended = pd.concat([df, _make_ohlcv(301).iloc[[-1]]])
+        extended = engine.compute_all(extended)
+        self.assertFalse(np.isnan(extended["rsi"].iloc[-1]))
+
+        # So does the last candle edited in place
+        edited = df.copy()
+        edited.iloc[-1, edited.columns.get_loc("close")] *= 1.5
+        edited = engine.compute_all(edited)
+        expected = RSIIndicator().compute(edited[["open", "high", "low", "close", "volume"]])
+        self.assertEqual(edited["rsi"].iloc[-1], expected["rsi"].iloc[-1])
+        self.assertNotEqual(edited["rsi"].iloc[-1], df["rsi"].iloc[-1])
+
+    def test_other_parameters_recompute(self):
+        df = IndicatorEngine([RSIIndicator(14)]).compute_all(_make_ohlcv())
+        expected = RSIIndicator(7).compute(_make_ohlcv())["rsi"]
+        df = IndicatorEngine([RSIIndicator(7)]).compute_all(df)
+        np.testing.assert_array_equal(df["rsi"].to_numpy(), expected.to_numpy())
+
+    def test_dependencies_order_nodes(self):
+        graph = IndicatorGraph([
+            _Node("c", ("b",), ("c",)),
+            _Node("b", ("a",), ("b",)),
+            _Node("a", ("close",), ("a",)),
+        ])
+        self.assertEqual(graph.order, ["a", "b", "c"])
+
+    def test_cycles_and_duplicate_outputs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            IndicatorGraph([_Node("a", ("b",), ("a",)), _Node("b", ("a",), ("b",))])
+        with self.assertRaises(ValueError):
+            IndicatorGraph([_Node("a", ("close",), ("x",)), _Node("b", ("close",), ("x",))])
+
+
+class TestComputeCache(unittest.TestCase):
+    def test_unchanged_candles_hit(self):
+        rsi = RSIIndicator()
+        engine = IndicatorEngine([rsi, MACDIndicator()], cache=ComputeCache())
+        first = engine.compute_all(_make_ohlcv(), symbol="BTCUSDT", timeframe="daily")
+
+        with mock.patch.object(rsi, "compute", wraps=rsi.compute) as compute:
+            again = engine.compute_all(_make_ohlcv(), symbol="BTCUSDT", timeframe="daily")
+            compute.assert_not_called()
+            engine.compute_all(_make_ohlcv(), symbol="ETHUSDT", timeframe="daily")
+            edited = _make_ohlcv()
+            edited.iloc[10, edited.columns.get_loc("close")] += 1.0
+            engine.compute_all(edited, symbol="BTCUSDT", timeframe="daily")
+            self.assertEqual(compute.call_count, 2)
+
+        pd.testing.assert_frame_equal(again, first)
+        info = engine.cache.info()
+        self.assertEqual((info.hits, info.misses, info.entries), (1, 3, 3))
+
+    def test_hits_are_isolated_from_the_caller(self):
+        engine = IndicatorEngine([RSIIndicator()], cache=ComputeCache())
+        df = engine.compute_all(_make_ohlcv())
+        df["rsi"] = 0.0
+        self.assertFalse((engine.compute_all(_make_ohlcv())["rsi"] == 0.0).any())
+        hit = engine.compute_all(_make_ohlcv())
+        hit.iloc[-1, hit.columns.get_loc("rsi")] = -1.0
+        self.assertNotEqual(engine.compute_all(_make_ohlcv())["rsi"].iat[-1], -1.0)
+
+        tagged = _make_ohlcv()
+        tagged["tag"] = 1.0
+        self.assertIn("tag", engine.compute_all(tagged).columns)
+
+    def test_parameters_are_part_of_the_key(self):
+        cache = ComputeCache()
+        IndicatorEngine([RSIIndicator(14)], cache=cache).compute_all(_make_ohlcv())
+        df = IndicatorEngine([RSIIndicator(7)], cache=cache).compute_all(_make_ohlcv())
+        expected = RSIIndicator(7).compute(_make_ohlcv())["rsi"]
+        np.testing.assert_array_equal(df["rsi"].to_numpy(), expected.to_numpy())
+        self.assertEqual(cache.info().hits, 0)
+
+    def test_least_recently_used_is_evicted(self):
+        engine = IndicatorEngine([RSIIndicator()])
+        size = int(engine.compute_all(_make_ohlcv()).memory_usage(index=True).sum())
+        engine.cache = ComputeCache(max_bytes=2 * size)
+        up, down, flat = _make_ohlcv(trend="up"), _make_ohlcv(trend="down"), _make_ohlcv(trend="flat")
+        engine.compute_all(up)
+        engine.compute_all(down)
+        engine.compute_all(up)  # hit: `down` is now the oldest
+        engine.compute_all(flat)
+
+        info = engine.cache.info()
+        self.assertEqual((info.entries, info.evictions), (2, 1))
+        self.assertLessEqual(info.bytes, info.max_bytes)
+        engine.compute_all(up)
+        self.assertEqual(engine.cache.info().hits, 2)
+
+
+class TestStreaming(unittest.TestCase):
+    def test_rolling_extreme_matches_pandas(self):
+        values = pd.Series(np.random.RandomState(3).randn(200))
+        highest = RollingExtreme(10, "max")
+        lowest = RollingExtreme(10, "min")
+        streamed_max, streamed_min = [], []
+        for value in values:
+            highest.update(value)
+            lowest.update(value)
+            streamed_max.append(highest.value)
+            streamed_min.append(lowest.value)
+        np.testing.assert_array_equal(streamed_max, values.rolling(10).max())
+        np.testing.assert_array_equal(streamed_min, values.rolling(10).min())
+
+    def test_indicator_seed_and_update(self):
+        rsi = RSIIndicator()
+        df = _make_ohlcv(120, "up")
+        rsi.seed(df.iloc[:-1])
+        result = rsi.update(next(iter_bars(df.iloc[-1:])))
+        expected = rsi.analyze(rsi.compute(df.copy()))
+        self.assertEqual(result.signal, expected.signal)
+        self.assertAlmostEqual(result.value, expected.value)
+
+
 class TestRSI(unittest.TestCase):
     def test_compute_adds_column(self):
         rsi = RSIIndicator()
@@ -150,6 +357,29 @@ class TestStochasticRSI(unittest.TestCase):
         self.assertIn("stochastic", df.columns)
         self.assertIn("stoch_signal", df.columns)
 
+    def test_streaming_matches_batch_on_flat_segments(self):
+        for seed in (1, 2, 3):
+            rng = np.random.default_rng(seed)
+            close = 100 + np.cumsum(rng.normal(0, 1, 400))
+            high, low = close + rng.random(400) * 2, close - rng.random(400) * 2
+            # Flat stretches inside a steady range: the smoothed line ties the raw one
+            for start in (120, 260):
+                close[start:start + 40] = close[start - 1]
+                high[start:start + 40] = high[start - 1] + 1
+                low[start:start + 40] = low[start - 1] - 1
+            df = pd.DataFrame({
+                "open": close, "high": high, "low": low, "close": close,
+                "volume": np.full(400, 10.0),
+            }, index=pd.date_range("2023-01-01", periods=400, freq="D"))
+
+            stoch = StochasticRSIIndicator()
+            expected = stoch.analyze_series(stoch.compute(df.copy())).signals
+            stoch.seed(df.iloc[:20])
+            streamed = [
+                SIGNAL_CODES[stoch.update(bar).signal] for bar in iter_bars(df.iloc[20:])
+            ]
+            np.testing.assert_array_equal(streamed, expected[20:], err_msg=f"seed {seed}")
+
 
 class TestVolume(unittest.TestCase):
     def test_compute_and_analyze(self):
@@ -180,6 +410,64 @@ class TestFibonacci(unittest.TestCase):
         self.assertIn("61.8%", levels)
 
 
+class TestFearAndGreed(unittest.TestCase):
+    def setUp(self):
+        self.df = _make_ohlcv(60)
+        history = pd.Series(np.arange(10.0, 100.0, 2.0), index=self.df.index[15:60])
+        self.store = SentimentStore()
+        self.store.add("fear_and_greed", history)
+        # Historical mode must never reach the network
+        patcher = mock.patch(
+            "src.indicators.fear_and_greed.get_fear_and_greed_index",
+            side_effect=AssertionError("network call"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_historical_column_drives_analysis(self):
+        fng = FearAndGreedIndicator(history=self.store)
+        df = fng.compute(self.df.copy())
+        self.assertTrue(df["fear_and_greed"].iloc[:15].isna().all())
+        self.assertEqual(df["fear_and_greed"].iloc[15], 10.0)
+
+        result = fng.analyze(df)
+        self.assertEqual(result.value, 98.0)
+        self.assertEqual(result.signal, Signal.BEARISH)
+        self.assertEqual(fng.analyze(df.iloc[:20]).signal, Signal.BULLISH)
+        self.assertEqual(fng.analyze(df.iloc[:10]).signal, Signal.UNDEFINED)
+
+        series = fng.analyze_series(df)
+        for i in (5, 20, 40, 59):
+            self.assertEqual(series.result_at(i), fng.analyze(df.iloc[: i + 1]))
+
+    def test_store_update_recomputes_column(self):
+        for cache in (None, ComputeCache()):
+            store = SentimentStore()
+            store.add("fear_and_greed", self.store.series("fear_and_greed"))
+            engine = IndicatorEngine([FearAndGreedIndicator(history=store)], cache=cache)
+            df = engine.compute_all(self.df.copy())
+            self.assertEqual(df["fear_and_greed"].iloc[-1], 98.0)
+
+            store.add("fear_and_greed", pd.Series(5.0, index=self.df.index))
+            df = engine.compute_all(df)
+            self.assertTrue((df["fear_and_greed"] == 5.0).all())
+
+    def test_signature_depends_on_store_content_only(self):
+        copy = SentimentStore()
+        copy.add("fear_and_greed", self.store.series("fear_and_greed"))
+        self.assertEqual(
+            FearAndGreedIndicator(history=copy).signature,
+            FearAndGreedIndicator(history=self.store).signature,
+        )
+
+    def test_streaming_uses_history(self):
+        fng = FearAndGreedIndicator(history=self.store)
+        df = fng.compute(self.df.copy())
+        fng.seed(self.df.iloc[:30])
+        for i, bar in enumerate(iter_bars(self.df.iloc[30:]), start=30):
+            self.assertEqual(fng.update(bar), fng.analyze(df.iloc[: i + 1]))
+
+
 class TestChoppiness(unittest.TestCase):
     def test_compute_and_analyze(self):
         chop = ChoppinessIndicator()
@@ -0,0 +1,136 @@
+"""Tests for the batched InfluxDB writer (legacy trading package)."""
+
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+os.environ.setdefault("URL", "http://127.0.0.1:8086")
+
+from influxdb_client import InfluxDBClient
+
+from trading.influx_utils import BatchedInfluxWriter, influx_sink
+
+
+class MemorySink:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, points):
+        self.batches.append([p.to_line_protocol() for p in points])
+
+    @property
+    def lines(self):
+        return [line for batch in self.batches for line in batch]
+
+
+class TestBatchedInfluxWriter(unittest.TestCase):
+    def test_flushes_by_batch_size(self):
+        sink = MemorySink()
+        writer = BatchedInfluxWriter(sink, batch_size=3, flush_interval=60)
+        for i in range(7):
+            writer.write("indicators", {"value": float(i)}, {"type": "rsi"}, timestamp=i)
+        self.assertTrue(writer.flush(timeout=5))
+        writer.close()
+
+        self.assertEqual(len(sink.lines), 7)
+        self.assertTrue(all(len(batch) <= 3 for batch in sink.batches))
+        self.assertEqual(writer.stats["written"], 7)
+
+    def test_flushes_by_time(self):
+        sink = MemorySink()
+        writer = BatchedInfluxWriter(sink, batch_size=100, flush_interval=0.05)
+        writer.write("trades", {"price": 1.0}, {"type": "buy"})
+        deadline = time.monotonic() + 5
+        while not sink.lines and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.close()
+        self.assertEqual(len(sink.lines), 1)
+
+    def test_coalesces_same_series_when_full(self):
+        sink = MemorySink()
+        writer = BatchedInfluxWriter(
+            sink, batch_size=100, flush_interval=60, max_pending=3,
+        )
+        self.assertTrue(writer.write("indicators", {"value": 1.0}, {"type": "a"}, 1))
+        self.assertTrue(writer.write("indicators", {"value": 1.0}, {"type": "b"}, 1))
+        self.assertTrue(writer.write("indicators", {"value": 1.0}, {"type": "c"}, 1))
+        self.assertTrue(writer.write("indicators", {"value": 2.0}, {"type": "a"}, 2))
+        self.assertFalse(writer.write("indicators", {"value": 1.0}, {"type": "d"}, 1))
+        writer.close()
+
+        self.assertEqual(writer.stats["coalesced"], 1)
+        self.assertEqual(writer.stats["dropped"], 1)
+        self.assertEqual(sink.lines[0], "indicators,type=a value=2 2")
+        self.assertEqual(len(sink.lines), 3)
+
+    def test_drop_mode_rejects_when_full(self):
+        sink = MemorySink()
+        writer = BatchedInfluxWriter(
+            sink, batch_size=100, flush_interval=60, max_pending=1, overflow="drop",
+        )
+        writer.write("indicators", {"value": 1.0}, {"type": "a"}, 1)
+        self.assertFalse(writer.write("indicators", {"value": 2.0}, {"type": "a"}, 2))
+        writer.close()
+        self.assertEqual(sink.lines, ["indicators,type=a value=1 1"])
+
+    def test_close_flushes_and_rejects_later_writes(self):
+        sink = MemorySink()
+        writer = BatchedInfluxWriter(sink, batch_size=100, flush_interval=60)
+        writer.write("trades", {"price": 10.123}, {"type": "sell"}, 5)
+        writer.close()
+        self.assertEqual(sink.lines, ["trades,type=sell price=10.12 5"])
+        self.assertFalse(writer.write("trades", {"price": 1.0}))
+
+    def test_sink_errors_are_counted(self):
+        def failing(points):
+            raise ConnectionError("influx down")
+
+        writer = BatchedInfluxWriter(failing, batch_size=1, flush_interval=60)
+        writer.write("trades", {"price": 1.0})
+        writer.close()
+        self.assertEqual(writer.stats["errors"], 1)
+
+
+class _WriteHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).requests.append((self.path, body.decode()))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestInfluxSink(unittest.TestCase):
+    def test_batch_is_sent_in_one_http_request(self):
+        server = HTTPServer(("127.0.0.1", 0), _WriteHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}"
+            with InfluxDBClient(url=url, token="token", org="org") as influx:
+                writer = BatchedInfluxWriter(
+                    influx_sink(influx, "bucket"), batch_size=10, flush_interval=60,
+                )
+                writer.write("trades", {"price": 1.0}, {"type": "buy"}, 1)
+                writer.write("trades", {"price": 2.0}, {"type": "sell"}, 2)
+                writer.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(len(_WriteHandler.requests), 1)
+        path, body = _WriteHandler.requests[0]
+        self.assertIn("bucket=bucket", path)
+        self.assertEqual(body.splitlines(), [
+            "trades,type=buy price=1 1", "trades,type=sell price=2 2",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
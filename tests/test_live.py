@@ -0,0 +1,227 @@
+"""Tests for the live scheduler."""
+
+import asyncio
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import Settings
+from src.core.enums import TimeFrame
+from src.data.provider import DataProvider
+from src.indicators.engine import IndicatorEngine
+from src.live.cycle import TradingCycle
+from src.core.timeframes import candle_open, next_close
+from src.core.tracing import tracer
+from src.live.scheduler import LiveScheduler
+
+
+class FakeClock:
+    """Virtual time: sleepers wake up when the test advances the clock."""
+
+    def __init__(self, start: str):
+        self.now = pd.Timestamp(start)
+        self._sleepers: list[tuple[pd.Timestamp, asyncio.Future]] = []
+
+    def __call__(self) -> pd.Timestamp:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._sleepers.append((self.now + pd.Timedelta(seconds=seconds), future))
+        await future
+
+    def advance(self) -> None:
+        """Jump to the earliest wake-up time and release those sleepers."""
+        if not self._sleepers:
+            return
+        self.now = min(wake for wake, _ in self._sleepers)
+        for wake, future in list(self._sleepers):
+            if wake <= self.now:
+                self._sleepers.remove((wake, future))
+                future.set_result(None)
+
+
+class TestTimeframes(unittest.TestCase):
+    def test_candle_boundaries(self):
+        ts = pd.Timestamp("2024-05-15 13:47:10")  # a Wednesday
+        self.assertEqual(candle_open(ts, TimeFrame.SCALPING), pd.Timestamp("2024-05-15 13:45"))
+        self.assertEqual(next_close(ts, TimeFrame.INTRADAY), pd.Timestamp("2024-05-15 14:00"))
+        self.assertEqual(next_close(ts, TimeFrame.DAILY), pd.Timestamp("2024-05-16"))
+        self.assertEqual(candle_open(ts, TimeFrame.WEEKLY), pd.Timestamp("2024-05-13"))
+        self.assertEqual(next_close(ts, TimeFrame.MONTHLY), pd.Timestamp("2024-06-01"))
+
+    def test_next_close_is_strictly_after(self):
+        ts = pd.Timestamp("2024-05-15 14:00")
+        self.assertEqual(next_close(ts, TimeFrame.INTRADAY), pd.Timestamp("2024-05-15 15:00"))
+
+
+class TestLiveScheduler(unittest.TestCase):
+    def _run(self, scheduler: LiveScheduler, clock: FakeClock, until: str) -> None:
+        async def main():
+            task = asyncio.create_task(scheduler.run())
+            while True:
+                for _ in range(200):
+                    await asyncio.sleep(0)
+                if clock.now >= pd.Timestamp(until):
+                    break
+                clock.advance()
+            scheduler.stop()
+            await task
+        asyncio.run(main())
+
+    def test_jobs_fire_on_candle_close_only(self):
+        clock = FakeClock("2024-01-01 00:05")
+        scheduler = LiveScheduler(settle_delay=0, clock=clock, sleep=clock.sleep)
+        calls = []
+
+        async def job(pair, timeframe, close):
+            calls.append((pair, timeframe, close, clock()))
+
+        scheduler.add_job("BTCUSDT", TimeFrame.SCALPING, job)
+        scheduler.add_job("BTCUSDT", TimeFrame.INTRADAY, job)
+        self._run(scheduler, clock, "2024-01-01 02:10")
+
+        scalping = [c for c in calls if c[1] == TimeFrame.SCALPING]
+        intraday = [c for c in calls if c[1] == TimeFrame.INTRADAY]
+        self.assertEqual(scalping[0][2], pd.Timestamp("2024-01-01 00:15"))
+        self.assertEqual([c[2] for c in intraday][:2], [
+            pd.Timestamp("2024-01-01 01:00"), pd.Timestamp("2024-01-01 02:00"),
+        ])
+        for _, _, close, fired_at in calls:
+            self.assertEqual(close, fired_at)
+
+    def test_early_wake_up_does_not_refire_a_close(self):
+        clock = FakeClock("2024-01-01 00:05")
+        sleep = clock.sleep
+
+        async def early(seconds):
+            # The loop clock wakes up a little before the wall clock
+            await sleep(seconds - 0.001 if seconds > 1 else seconds)
+
+        scheduler = LiveScheduler(settle_delay=0, clock=clock, sleep=early)
+        closes = []
+
+        async def job(pair, timeframe, close):
+            closes.append(close)
+
+        scheduler.add_job("BTCUSDT", TimeFrame.SCALPING, job)
+        self._run(scheduler, clock, "2024-01-01 01:10")
+
+        expected = pd.date_range("2024-01-01 00:15", periods=len(closes), freq="15min")
+        self.assertGreaterEqual(len(closes), 4)
+        self.assertEqual(closes, list(expected))
+
+    def test_concurrency_is_bounded(self):
+        clock = FakeClock("2024-01-01 00:14")
+        scheduler = LiveScheduler(
+            max_concurrency=3, settle_delay=0, clock=clock, sleep=clock.sleep,
+        )
+        active, peak = 0, 0
+
+        async def job(pair, timeframe, close):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            for _ in range(5):
+                await asyncio.sleep(0)
+            active -= 1
+
+        for i in range(12):
+            scheduler.add_job(f"PAIR{i}", TimeFrame.SCALPING, job)
+        self._run(scheduler, clock, "2024-01-01 00:15")
+
+        self.assertEqual(peak, 3)
+        self.assertTrue(all(m.runs == 1 for m in scheduler.metrics()))
+
+    def test_overruns_and_failures_are_recorded(self):
+        clock = FakeClock("2024-01-01 00:14")
+        scheduler = LiveScheduler(settle_delay=0, clock=clock, sleep=clock.sleep)
+
+        async def slow(pair, timeframe, close):
+            await clock.sleep(40 * 60)  # longer than two scalping candles
+
+        def broken(pair, timeframe, close):
+            raise RuntimeError("exchange down")
+
+        scheduler.add_job("BTCUSDT", TimeFrame.SCALPING, slow)
+        scheduler.add_job("ETHUSDT", TimeFrame.SCALPING, broken)
+        self._run(scheduler, clock, "2024-01-01 00:50")
+
+        metrics = {m.pair: m for m in scheduler.metrics()}
+        self.assertGreaterEqual(metrics["BTCUSDT"].overruns, 1)
+        self.assertGreaterEqual(metrics["BTCUSDT"].max_latency, 40 * 60)
+        self.assertGreaterEqual(metrics["ETHUSDT"].failures, 1)
+        snapshot = scheduler.snapshot()
+        self.assertEqual(set(snapshot["pair"]), {"BTCUSDT", "ETHUSDT"})
+
+        text = scheduler.prometheus_text()
+        btc = '{pair="BTCUSDT",timeframe="scalping"}'
+        self.assertIn("# TYPE trading_job_overruns_total counter", text)
+        self.assertIn(f"trading_job_overruns_total{btc} {metrics['BTCUSDT'].overruns}", text)
+        self.assertIn(f"trading_job_latency_seconds_count{btc} {metrics['BTCUSDT'].runs}", text)
+        self.assertIn(
+            f'trading_job_failures_total{{pair="ETHUSDT",timeframe="scalping"}} '
+            f"{metrics['ETHUSDT'].failures}",
+            text,
+        )
+        self.assertIn(f"trading_job_start_delay_seconds{btc} 0.0", text)
+
+
+class StaticProvider(DataProvider):
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe, start="1 Jan, 2020"):
+        self.calls += 1
+        return self.df.copy()
+
+    def get_balance(self, coin):
+        return 0.0
+
+
+class TestTradingCycle(unittest.TestCase):
+    def test_cycle_runs_full_stack(self):
+        n = 300
+        base = np.linspace(100, 200, n)
+        df = pd.DataFrame({
+            "open": base, "high": base + 2, "low": base - 2, "close": base,
+            "volume": np.full(n, 500.0),
+        }, index=pd.date_range("2023-01-01", periods=n, freq="D"))
+        provider = StaticProvider(df)
+        setups = []
+        cycle = TradingCycle(
+            Settings(), provider, IndicatorEngine.fast(),
+            on_setup=lambda setup, portfolio: setups.append(setup),
+        )
+
+        setup = cycle("BTCUSDT", TimeFrame.DAILY)
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(cycle.portfolio("BTCUSDT", TimeFrame.DAILY).current_price, 200.0)
+        self.assertEqual(setups, [setup] if setup else [])
+
+    def test_cycle_stages_are_traced(self):
+        df = pd.DataFrame({
+            "open": np.full(300, 100.0), "high": 101.0, "low": 99.0, "close": 100.0,
+            "volume": 500.0,
+        }, index=pd.date_range("2023-01-01", periods=300, freq="D"))
+        tracer.enable()
+        self.addCleanup(tracer.reset)
+        self.addCleanup(tracer.disable)
+        TradingCycle(Settings(), StaticProvider(df), IndicatorEngine.fast())(
+            "BTCUSDT", TimeFrame.DAILY,
+        )
+
+        spans = {name for name, _ in tracer.stats()}
+        self.assertTrue({
+            "cycle", "cycle.fetch", "cycle.indicators", "cycle.regime",
+            "cycle.decision", "cycle.strategy", "indicator.compute",
+            "indicator.analyze",
+        } <= spans)
+        labels = dict(next(lbl for name, lbl in tracer.stats() if name == "cycle"))
+        self.assertEqual(labels, {"pair": "BTCUSDT", "timeframe": "daily"})
+
+
+if __name__ == "__main__":
+    unittest.main()
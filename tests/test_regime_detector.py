@@ -1,11 +1,13 @@
 """Tests for Market Regime Detector."""
 
 import unittest
+from unittest import mock
 
 import numpy as np
 import pandas as pd
 
 from src.core.enums import MarketRegime
+from src.indicators.engine import IndicatorEngine
 from src.market.regime_detector import MarketRegimeDetector
 
 
@@ -71,6 +73,39 @@ class TestMarketRegimeDetector(unittest.TestCase):
         self.assertGreaterEqual(confidence, 0.0)
         self.assertLessEqual(confidence, 1.0)
 
+    def test_detect_series_matches_detect(self):
+        for df in (_make_ranging_data(300), _make_trending_data(300, "down")):
+            regimes, confidences = self.detector.detect_series(df)
+            self.assertEqual(len(regimes), len(df))
+            for i in range(30, 300, 15):
+                regime, confidence = self.detector.detect(df.iloc[:i + 1].copy())
+                self.assertEqual(regimes[i], regime)
+                self.assertAlmostEqual(confidences[i], confidence)
+
+    def test_detect_reuses_cached_columns(self):
+        df = _make_trending_data(300, "up")
+        expected = self.detector.detect(df.copy())
+        self.detector.detect_series(df)  # computes the columns on df
+
+        with mock.patch.object(self.detector._adx, "compute") as adx_compute:
+            self.assertEqual(self.detector.detect(df), expected)
+            adx_compute.assert_not_called()
+
+    def test_detect_reuses_engine_columns(self):
+        df = IndicatorEngine.default().compute_all(_make_trending_data(300, "down"))
+        patches = [
+            mock.patch.object(indicator, "compute")
+            for indicator in (self.detector._adx, self.detector._chop,
+                              self.detector._ema, self.detector._bollinger)
+        ]
+        mocks = [p.start() for p in patches]
+        for p in patches:
+            self.addCleanup(p.stop)
+
+        self.detector.detect(df)
+        for compute in mocks:
+            compute.assert_not_called()
+
     def test_multi_timeframe_detection(self):
         data_by_tf = {
             "daily": _make_trending_data(300, "up"),
@@ -25,6 +25,8 @@ import trading.influx_utils as idb
 from datetime import datetime, timedelta
 from pytrends.request import TrendReq
 
+from src.data.signal_cache import external_signals
+
 ###################### Analyse des indicateurs techniques ######################
 def analyse_adi(adi, prev_adi):
     if adi is None or prev_adi is None:
@@ -431,13 +433,22 @@ def calculate_fibonacci_retracement(data):
     return retracement_levels, extension_levels
 
 
-def define_googletrend(crypto_term):
+def fetch_googletrend(crypto_term):
     # Initialiser Pytrends
     pytrends = TrendReq(hl='en-US', tz=360)
 
     # Obtenir les données de Google Trends
     pytrends.build_payload([crypto_term], timeframe='today 3-m', geo='', gprop='')
-    trend_data = pytrends.interest_over_time()
+    return pytrends.interest_over_time()
+
+# Données quotidiennes sur 3 mois : TTL de 6h, rafraîchies en arrière-plan
+external_signals.register("google_trends", lambda term: fetch_googletrend(term), ttl=6 * 3600)
+
+def define_googletrend(crypto_term):
+    # Données mises en cache par terme (pas d'appel réseau à chaque analyse)
+    trend_data = external_signals.get("google_trends", crypto_term)
+    if trend_data is None:
+        trend_data = pd.DataFrame()
 
     # Vérifie si les données existent
     if not trend_data.empty:
@@ -1,6 +1,10 @@
 # __all__ liste les fonctions que vous souhaitez exposer
 __all__ = [
     'round_fields',
+    'BatchedInfluxWriter',
+    'influx_sink',
+    'get_writer',
+    'close_writer',
     'write_to_influx',
     'get_influx_data',
     'get_historical_compare_data',
@@ -12,10 +16,12 @@ __all__ = [
     'write_indicator_to_influx'
 ]
 
+import atexit
 import datetime
 import logging
 import os
 import pandas as pd
+import threading
 import time
 import urllib3
 
@@ -46,30 +52,191 @@ def round_fields(fields, decimals=2):
             fields[key] = round(value, decimals)
     return fields
 
-def write_to_influx(measurement, fields, tags=None, timestamp=None):
-    fields = round_fields(fields)  # Arrondir les valeurs des champs
-    # write_api = client.write_api(write_options=WriteOptions(batch_size=1000, flush_interval=10_000))
-    write_api = client.write_api(write_options=SYNCHRONOUS)
-    # Convert timestamp from pandas Timestamp to nanoseconds
-    if isinstance(timestamp, pd.Timestamp):
-        timestamp_ns = int(timestamp.timestamp() * 1e9)
-    else:
-        timestamp_ns = int(pd.to_datetime(timestamp).timestamp() * 1e9)
+def to_timestamp_ns(timestamp):
+    """
+    Convertit un timestamp (pandas, datetime, int en ns) en nanosecondes.
+    Sans timestamp, l'heure courante est utilisée.
+    """
+    if timestamp is None:
+        return time.time_ns()
+    return int(pd.Timestamp(timestamp).value)
 
+def make_point(measurement, fields, tags=None, timestamp_ns=None):
     point = Point(measurement)
     if tags:
         for key, value in tags.items():
             point = point.tag(key, value)
     for key, value in fields.items():
         point = point.field(key, value)
-    if timestamp:
+    if timestamp_ns is not None:
         point = point.time(timestamp_ns)
-    # logging.info(f"Writing to InfluxDB: {point}")
-    try:
-        write_api.write(bucket=bucket, record=point)
-        # logging.info("Write successful")
-    except Exception as e:
-        logging.error(f"Error writing to InfluxDB: {e}")
+    return point
+
+def influx_sink(write_client=None, bucket_name=None):
+    """
+    Retourne une fonction qui écrit une liste de points en une seule requête.
+    Le write_api SYNCHRONOUS est créé une seule fois (et non à chaque point).
+    """
+    write_api = (write_client or client).write_api(write_options=SYNCHRONOUS)
+    target_bucket = bucket_name or bucket
+
+    def sink(points):
+        write_api.write(bucket=target_bucket, record=points)
+
+    return sink
+
+class BatchedInfluxWriter:
+    """
+    Écrivain InfluxDB par lots, non bloquant pour le chemin d'analyse.
+
+    - write() ajoute le point dans une file bornée et rend la main aussitôt
+    - un thread d'arrière-plan vide la file par lots de `batch_size` points,
+      ou toutes les `flush_interval` secondes
+    - file pleine : overflow="coalesce" remplace le point en attente de la
+      même série (measurement + tags) par le plus récent, sinon le point est
+      abandonné ; overflow="drop" abandonne toujours le nouveau point
+    - close() vide la file avant de s'arrêter (appelé aussi à la sortie)
+
+    `sink` reçoit une liste de Point ; une liste en mémoire suffit en test.
+    """
+
+    def __init__(self, sink=None, batch_size=500, flush_interval=1.0,
+                 max_pending=10_000, overflow="coalesce"):
+        if overflow not in ("coalesce", "drop"):
+            raise ValueError("overflow doit valoir 'coalesce' ou 'drop'")
+        self._sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.overflow = overflow
+
+        self._pending = []  # [measurement, fields, tags, timestamp_ns]
+        self._series = {}   # clé de série -> index du dernier point en attente
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread = None
+        self._cond = threading.Condition()
+        self.stats = {"written": 0, "dropped": 0, "coalesced": 0, "errors": 0, "batches": 0}
+
+    def write(self, measurement, fields, tags=None, timestamp=None):
+        """Met un point en file. Retourne False s'il a été abandonné."""
+        record = [measurement, round_fields(dict(fields)), tags, to_timestamp_ns(timestamp)]
+        key = (measurement, tuple(sorted((tags or {}).items())))
+        with self._cond:
+            if self._closed:
+                self.stats["dropped"] += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                index = self._series.get(key)
+                if self.overflow == "coalesce" and index is not None:
+                    self._pending[index] = record
+                    self.stats["coalesced"] += 1
+                    return True
+                self.stats["dropped"] += 1
+                return False
+            self._series[key] = len(self._pending)
+            self._pending.append(record)
+            self._start()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout=None):
+        """Bloque jusqu'à ce que tous les points en file soient écrits."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                if self._thread is None or not self._thread.is_alive():
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return not self._pending
+
+    def close(self, timeout=5.0):
+        """Vide la file puis arrête le thread d'arrière-plan."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+    def _start(self):
+        # Appelé sous verrou : démarre le thread au premier point
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="influx-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while (len(self._pending) < self.batch_size and not self._flush_requested
+                       and not self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending
+                self._pending, self._series = [], {}
+                self._flush_requested = False
+                self._in_flight = len(batch)
+                closing = self._closed
+            for start in range(0, len(batch), self.batch_size):
+                self._send(batch[start:start + self.batch_size])
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+                if closing and not self._pending:
+                    return
+
+    def _send(self, records):
+        points = [make_point(m, f, t, ts) for m, f, t, ts in records]
+        try:
+            sink = self._sink or influx_sink()
+            self._sink = sink
+            sink(points)
+            self.stats["written"] += len(points)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logging.error(f"Error writing to InfluxDB: {e}")
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_writer():
+    """Écrivain partagé par tout le bot (créé au premier appel)."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BatchedInfluxWriter()
+            atexit.register(close_writer)
+        return _writer
+
+def close_writer(timeout=5.0):
+    """Vide et arrête l'écrivain partagé (arrêt propre du bot)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout)
+
+def write_to_influx(measurement, fields, tags=None, timestamp=None):
+    # Non bloquant : le point part dans le prochain lot de l'écrivain partagé
+    get_writer().write(measurement, fields, tags, timestamp)
 
 def get_influx_data(database, measurement, start_time, end_time):
     # Connect to InfluxDB
@@ -22,15 +22,25 @@ from bs4 import BeautifulSoup
 
 import trading.indicators as indic
 
-def get_bitcoin_fear_and_greed_index():
+from src.data.signal_cache import external_signals
+
+def fetch_bitcoin_fear_and_greed_index():
     url = "https://alternative.me/crypto/fear-and-greed-index/"
-    response = requests.get(url)
+    response = requests.get(url, timeout=10)
     soup = BeautifulSoup(response.content, "html.parser")
 
     # Trouver la section qui contient l'indice
     index_value = soup.find("div", class_="fng-circle").text.strip()
     return index_value
 
+# L'indice change une fois par jour : TTL d'une heure, rafraîchi en arrière-plan
+external_signals.register(
+    "bitcoin_fear_and_greed", lambda: fetch_bitcoin_fear_and_greed_index(), ttl=3600)
+
+def get_bitcoin_fear_and_greed_index():
+    # Valeur en cache : plus d'appel réseau dans chaque run_analysis
+    return external_signals.get("bitcoin_fear_and_greed")
+
 def prepare_data(df):
     """
     Prépare les données en calculant les indicateurs techniques.